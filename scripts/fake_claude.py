@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Stand-in for the ``claude`` CLI used by the load test and benchmarks.
+
+Accepts the flags the bridge passes (``--print``, ``--max-turns``,
+``--output-format``, ``--prompt PROMPT``), sleeps, then prints a reply of a given
+size. Behaviour is taken from the environment and can be overridden per call
+by ``key=value`` words in the prompt (e.g. ``"latency=0.2 bytes=5000"``):
+
+    FAKE_CLAUDE_LATENCY   seconds to sleep before answering (default 0.1)
+    FAKE_CLAUDE_JITTER    uniform +/- jitter on the latency (default 0)
+    FAKE_CLAUDE_BYTES     size of the reply text (default 200)
+    FAKE_CLAUDE_EXIT      exit code (default 0)
+
+With ``--output-format stream-json`` the reply is emitted as a few
+assistant events followed by a ``result`` event, spread over the latency.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import time
+
+
+def options(prompt: str) -> dict[str, float]:
+    opts = {
+        "latency": float(os.environ.get("FAKE_CLAUDE_LATENCY", "0.1")),
+        "jitter": float(os.environ.get("FAKE_CLAUDE_JITTER", "0")),
+        "bytes": float(os.environ.get("FAKE_CLAUDE_BYTES", "200")),
+        "exit": float(os.environ.get("FAKE_CLAUDE_EXIT", "0")),
+    }
+    for word in prompt.split():
+        key, sep, value = word.partition("=")
+        if sep and key in opts:
+            try:
+                opts[key] = float(value)
+            except ValueError:
+                pass
+    return opts
+
+
+def reply(size: int) -> str:
+    line = "lorem ipsum dolor sit amet consectetur adipiscing elit\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def flag(argv: list[str], *names: str, default: str = "") -> str:
+    for i, arg in enumerate(argv[:-1]):
+        if arg in names:
+            return argv[i + 1]
+    return default
+
+
+def main(argv: list[str]) -> int:
+    prompt = flag(argv, "-p", "--prompt")
+    fmt = flag(argv, "--output-format", default="text")
+    opts = options(prompt)
+    delay = max(0.0, opts["latency"] + random.uniform(-opts["jitter"], opts["jitter"]))
+    text = reply(int(opts["bytes"]))
+
+    if fmt == "stream-json":
+        turns = 3
+        for turn in range(turns):
+            time.sleep(delay / turns)
+            event = {
+                "type": "assistant",
+                "message": {"content": [{"type": "text", "text": f"turn {turn + 1}"}]},
+            }
+            print(json.dumps(event), flush=True)
+        print(json.dumps({
+            "type": "result",
+            "subtype": "success",
+            "result": text,
+            "num_turns": turns,
+            "duration_ms": int(delay * 1000),
+            "total_cost_usd": 0.0,
+        }), flush=True)
+    else:
+        time.sleep(delay)
+        if fmt == "json":
+            print(json.dumps({"type": "result", "result": text, "num_turns": 1}))
+        else:
+            sys.stdout.write(text)
+    return int(opts["exit"])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""End-to-end load test for the MCP bridge.
+
+Boots ``create_app()`` in-process behind uvicorn, points ``claude_cli_path``
+at ``scripts/fake_claude.py`` and drives the streamable HTTP endpoint with
+N concurrent MCP clients, each with its own bearer token so that per-client
+limits apply as in production. Every client loops over a weighted tool mix
+until the duration is up.
+
+Reports throughput, p50/p99 latency (overall and per tool), the share of
+calls rejected by rate/concurrency limits or quotas, other errors, and the
+peak RSS of the bridge process and of the subprocesses it spawned. The
+client side runs in the same process, so RSS and throughput include its
+overhead too; compare runs with each other, not with production.
+
+Usage:
+    python scripts/loadtest.py [--clients 50] [--duration 20]
+                               [--mix claude_execute=1,run_command=2,file_read=2]
+                               [--latency 0.2] [--jitter 0.05] [--output-bytes 2000]
+                               [--max-concurrent 5] [--rate-limit 10000]
+                               [--save baseline.json] [--baseline baseline.json]
+                               [--tolerance 0.15]
+
+Exits non-zero when ``--baseline`` is given and a metric regressed by more
+than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import resource
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+FAKE_CLAUDE = Path(__file__).with_name("fake_claude.py")
+
+DEFAULT_MIX = "claude_execute=1,run_command=2,file_read=2,system_info=1"
+TOOLS = ("claude_execute", "claude_stream", "run_command", "file_read", "system_info")
+
+# Limit and quota errors, as opposed to failures of the call itself
+REJECTED = re.compile(r"rate limit|limit reached|quota exhausted|draining", re.IGNORECASE)
+
+# (metric, higher_is_better, absolute slack); rates are compared absolutely
+METRICS = (
+    ("throughput_rps", True, 0.0),
+    ("p50_ms", False, 0.0),
+    ("p99_ms", False, 0.0),
+    ("rejection_rate", False, 0.02),
+    ("error_rate", False, 0.02),
+    ("peak_rss_mb", False, 0.0),
+)
+
+
+@dataclass
+class Sample:
+    tool: str
+    latency: float
+    outcome: str  # ok | rejected | error
+
+
+@dataclass
+class LoadConfig:
+    clients: int = 50
+    duration: float = 20.0
+    mix: dict[str, float] = field(default_factory=dict)
+    latency: float = 0.2
+    jitter: float = 0.05
+    output_bytes: int = 2000
+    max_concurrent: int = 5
+    rate_limit: int = 10000
+    seed: int = 0
+
+
+def parse_mix(raw: str) -> dict[str, float]:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in TOOLS:
+            raise ValueError(f"Unknown tool in mix: {name!r} (choose from {', '.join(TOOLS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def configure_env(cfg: LoadConfig, workdir: Path, log_dir: Path) -> None:
+    """Settings are read from the environment by ``create_app``."""
+    os.environ.update(
+        BEARER_TOKEN="loadtest",
+        ALLOWED_DIRS_RAW=str(workdir),
+        LOG_DIR=str(log_dir),
+        LOG_LEVEL="WARNING",
+        CLAUDE_CLI_PATH=str(FAKE_CLAUDE),
+        MAX_CONCURRENT_CLAUDE=str(cfg.max_concurrent),
+        MAX_REQUESTS_PER_MINUTE=str(cfg.rate_limit),
+        CONFIG_RELOAD_INTERVAL="0",
+        FAKE_CLAUDE_LATENCY=str(cfg.latency),
+        FAKE_CLAUDE_JITTER=str(cfg.jitter),
+        FAKE_CLAUDE_BYTES=str(cfg.output_bytes),
+    )
+    os.environ.pop("PUBLIC_URL", None)
+    os.environ.pop("WORKERS", None)
+
+
+def tool_call(tool: str, workdir: Path) -> tuple[str, dict[str, Any]]:
+    if tool == "claude_execute":
+        return tool, {"prompt": "load test", "working_directory": str(workdir), "cache": False}
+    if tool == "claude_stream":
+        return "claude_execute", {
+            "prompt": "load test",
+            "working_directory": str(workdir),
+            "output_format": "stream",
+            "cache": False,
+        }
+    if tool == "run_command":
+        return tool, {"command": "echo ok", "working_directory": str(workdir)}
+    if tool == "file_read":
+        return tool, {"path": str(workdir / "sample.txt")}
+    return tool, {}
+
+
+async def client_loop(
+    url: str, index: int, cfg: LoadConfig, workdir: Path,
+    start: asyncio.Event, deadline: list[float], samples: list[Sample],
+) -> None:
+    import httpx
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamable_http_client
+    from mcp.shared._httpx_utils import create_mcp_http_client
+
+    rng = random.Random(cfg.seed * 1000 + index)
+    tools, weights = zip(*cfg.mix.items())
+    http = create_mcp_http_client(
+        headers={"Authorization": f"Bearer loadtest-client-{index}"},
+        timeout=httpx.Timeout(600.0),
+    )
+    async with http, streamable_http_client(url, http_client=http) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await start.wait()
+            while time.perf_counter() < deadline[0]:
+                tool = rng.choices(tools, weights)[0]
+                name, arguments = tool_call(tool, workdir)
+                t0 = time.perf_counter()
+                try:
+                    result = await session.call_tool(name, arguments)
+                except Exception:
+                    outcome = "error"
+                else:
+                    text = "".join(getattr(c, "text", "") for c in result.content)
+                    if result.isError or text.startswith("ERROR"):
+                        outcome = "rejected" if REJECTED.search(text) else "error"
+                    else:
+                        outcome = "ok"
+                samples.append(Sample(tool, time.perf_counter() - t0, outcome))
+
+
+async def run_load(cfg: LoadConfig) -> dict[str, Any]:
+    import uvicorn
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp) / "work"
+        workdir.mkdir()
+        (workdir / "sample.txt").write_text("".join(f"line {i}\n" for i in range(200)))
+        configure_env(cfg, workdir, Path(tmp) / "logs")
+
+        import mcp_bridge.config as config
+        from mcp_bridge.server import create_app
+
+        config._settings = None
+        app, _ = create_app()
+        port = _free_port()
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        serve = asyncio.create_task(server.serve())
+        while not server.started:
+            if serve.done():
+                serve.result()
+            await asyncio.sleep(0.01)
+
+        url = f"http://127.0.0.1:{port}/mcp"
+        samples: list[Sample] = []
+        start = asyncio.Event()
+        deadline = [float("inf")]
+        peak_rss = rss_mb()
+
+        async def sample_rss() -> None:
+            nonlocal peak_rss
+            while True:
+                peak_rss = max(peak_rss, rss_mb())
+                await asyncio.sleep(0.25)
+
+        try:
+            clients = [
+                asyncio.create_task(
+                    client_loop(url, i, cfg, workdir, start, deadline, samples)
+                )
+                for i in range(cfg.clients)
+            ]
+            # Let every client connect and initialize before the clock starts
+            await asyncio.sleep(0.5)
+            sampler = asyncio.create_task(sample_rss())
+            t0 = time.perf_counter()
+            deadline[0] = t0 + cfg.duration
+            start.set()
+            await asyncio.gather(*clients)
+            elapsed = time.perf_counter() - t0
+            sampler.cancel()
+        finally:
+            server.should_exit = True
+            await serve
+
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return summarize(cfg, samples, elapsed, peak_rss, children_rss)
+
+
+def summarize(
+    cfg: LoadConfig, samples: list[Sample], elapsed: float,
+    peak_rss: float, children_rss: float,
+) -> dict[str, Any]:
+    calls = len(samples)
+    latencies = [s.latency * 1000 for s in samples if s.outcome == "ok"]
+    per_tool: dict[str, dict[str, Any]] = {}
+    by_tool: dict[str, list[Sample]] = defaultdict(list)
+    for s in samples:
+        by_tool[s.tool].append(s)
+    for tool, group in sorted(by_tool.items()):
+        ok = [s.latency * 1000 for s in group if s.outcome == "ok"]
+        per_tool[tool] = {
+            "calls": len(group),
+            "p50_ms": round(percentile(ok, 50), 2),
+            "p99_ms": round(percentile(ok, 99), 2),
+            "rejected": sum(s.outcome == "rejected" for s in group),
+            "errors": sum(s.outcome == "error" for s in group),
+        }
+    return {
+        "config": {**cfg.__dict__, "python": sys.version.split()[0]},
+        "calls": calls,
+        "duration_s": round(elapsed, 2),
+        "throughput_rps": round(calls / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "rejection_rate": round(sum(s.outcome == "rejected" for s in samples) / calls, 4) if calls else 0.0,
+        "error_rate": round(sum(s.outcome == "error" for s in samples) / calls, 4) if calls else 0.0,
+        "peak_rss_mb": round(peak_rss, 1),
+        "children_peak_rss_mb": round(children_rss, 1),
+        "per_tool": per_tool,
+    }
+
+
+def compare(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Names of metrics that are worse than ``baseline`` beyond tolerance."""
+    regressions = []
+    for name, higher_is_better, slack in METRICS:
+        new, old = result.get(name), baseline.get(name)
+        if new is None or old is None:
+            continue
+        if slack:
+            worse = (old - new if higher_is_better else new - old) > slack
+        elif higher_is_better:
+            worse = new < old * (1 - tolerance)
+        else:
+            worse = new > old * (1 + tolerance)
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def print_report(result: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    cfg = result["config"]
+    print(
+        f"=== {cfg['clients']} clients for {cfg['duration']:g}s, "
+        f"fake claude {cfg['latency']:g}s +/- {cfg['jitter']:g}s, "
+        f"{cfg['output_bytes']} bytes ==="
+    )
+    for name, _, _ in METRICS + (("children_peak_rss_mb", False, 0.0), ("calls", True, 0.0)):
+        line = f"  {name:<22} {result[name]:>12g}"
+        if baseline and name in baseline:
+            line += f"   baseline {baseline[name]:>12g}"
+        print(line)
+    print(f"\n  {'tool':<16} {'calls':>7} {'p50_ms':>9} {'p99_ms':>9} {'rejected':>9} {'errors':>7}")
+    for tool, t in result["per_tool"].items():
+        print(
+            f"  {tool:<16} {t['calls']:>7} {t['p50_ms']:>9.1f} {t['p99_ms']:>9.1f} "
+            f"{t['rejected']:>9} {t['errors']:>7}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="tool=weight,...")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake claude seconds")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--output-bytes", type=int, default=2000)
+    parser.add_argument("--max-concurrent", type=int, default=5)
+    parser.add_argument("--rate-limit", type=int, default=10000, help="per client and tool")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with saved results")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    cfg = LoadConfig(
+        clients=args.clients,
+        duration=args.duration,
+        mix=parse_mix(args.mix),
+        latency=args.latency,
+        jitter=args.jitter,
+        output_bytes=args.output_bytes,
+        max_concurrent=args.max_concurrent,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    result = asyncio.run(run_load(cfg))
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(result, baseline)
+    if args.save:
+        args.save.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\nSaved results to {args.save}")
+    if baseline is None:
+        return 0
+    regressions = compare(result, baseline, args.tolerance)
+    print(f"\nRegressions (tolerance {args.tolerance:.0%}): {', '.join(regressions) or 'none'}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Microbenchmarks for the per-request hot paths of the MCP bridge.
+
+Times the primitives every tool call goes through, at production-like
+scales: ``RateLimiter.check`` across many clients and with a busy window,
+``ConcurrencyLimiter`` acquire/release, ``sandbox.validate_path`` through a
+deep chain of symlinks, ``sandbox.validate_command`` against hundreds of
+blocked patterns, ``InMemoryOAuthProvider.load_access_token`` with thousands
+of issued tokens, and ``audit.truncate_for_log``.
+
+Each benchmark is calibrated to run for at least ``--min-time`` seconds per
+repeat; the best repeat is reported as ns/op (the median is shown for
+context).
+
+Usage:
+    python scripts/microbench.py [--repeat 5] [--min-time 0.2] [--quick]
+                                 [--filter validate] [--save bench.json]
+                                 [--baseline bench.json] [--tolerance 0.25]
+
+Exits non-zero when ``--baseline`` is given and any benchmark got slower by
+more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+# The default BLOCKED_COMMANDS_RAW from .env.example
+DEFAULT_BLOCKED = (
+    r"rm\s+-rf\s+/|shutdown|reboot|mkfs|dd\s+if=|chmod\s+777\s+/|:\(\)\{|passwd|userdel|groupdel"
+)
+COMMAND = "cd src && git log --oneline -n 20 | head -50 && python -m pytest -q tests/ -k 'not slow' 2>&1 | tail -20"
+
+Runner = Callable[[int], None]
+
+
+@dataclass(frozen=True)
+class Scale:
+    clients: int = 1000
+    window: int = 5000
+    patterns: int = 300
+    depth: int = 40
+    allowed_dirs: int = 20
+    tokens: int = 5000
+    log_bytes: int = 1 << 20
+
+
+QUICK = Scale(clients=100, window=500, patterns=50, depth=10, allowed_dirs=5,
+              tokens=300, log_bytes=1 << 16)
+
+
+def _async(loop: asyncio.AbstractEventLoop, op: Callable[[int], object]) -> Runner:
+    """Wrap a per-iteration coroutine factory into a runner on ``loop``."""
+
+    async def many(n: int) -> None:
+        for i in range(n):
+            await op(i)  # type: ignore[misc]
+
+    return lambda n: loop.run_until_complete(many(n))
+
+
+def bench_rate_limiter(scale: Scale, loop: asyncio.AbstractEventLoop) -> Iterator[tuple[str, Runner]]:
+    from mcp_bridge.rate_limiter import RateLimiter, rate_key
+
+    spread = RateLimiter(max_per_minute=10**9)
+    clients = [f"client-{i}" for i in range(scale.clients)]
+    yield (
+        f"rate_limiter.check ({scale.clients} clients)",
+        _async(loop, lambda i: spread.check("run_command", clients[i % len(clients)])),
+    )
+
+    busy = RateLimiter(max_per_minute=10**9)
+    key = rate_key("run_command", "busy")
+    now = time.monotonic()
+    window = [now - 30.0 + 30.0 * k / scale.window for k in range(scale.window)]
+
+    def busy_runner(n: int) -> None:
+        busy._calls[key] = list(window)
+        _async(loop, lambda i: busy.check("run_command", "busy"))(n)
+
+    yield f"rate_limiter.check ({scale.window} calls in window)", busy_runner
+
+
+def bench_concurrency_limiter(scale: Scale, loop: asyncio.AbstractEventLoop) -> Iterator[tuple[str, Runner]]:
+    from mcp_bridge.rate_limiter import ConcurrencyLimiter
+
+    limiter = ConcurrencyLimiter(max_concurrent=3)
+
+    async def cycle(i: int) -> None:
+        await limiter.acquire()
+        limiter.release()
+
+    yield "concurrency_limiter.acquire+release", _async(loop, cycle)
+
+
+def bench_sandbox(scale: Scale, root: Path) -> Iterator[tuple[str, Runner]]:
+    from mcp_bridge.sandbox import validate_command, validate_path
+
+    # root/a0/a1/.../aN/file.txt, reached as root/a0/n/n/.../n/file.txt where
+    # every ``n`` is a symlink to the next level
+    level = root / "a0"
+    level.mkdir()
+    for i in range(1, scale.depth + 1):
+        nxt = level / f"a{i}"
+        nxt.mkdir()
+        (level / "n").symlink_to(f"a{i}")
+        level = nxt
+    (level / "file.txt").write_text("x")
+    linked = str(root / "a0" / Path(*["n"] * scale.depth) / "file.txt")
+
+    others = []
+    for i in range(scale.allowed_dirs - 1):
+        other = root.parent / f"{root.name}-other{i}"
+        other.mkdir(exist_ok=True)
+        others.append(other.resolve())
+    allowed = [*others, root.resolve()]
+
+    def path_runner(n: int) -> None:
+        for _ in range(n):
+            validate_path(linked, allowed)
+
+    yield f"validate_path (depth {scale.depth} symlinks, {len(allowed)} dirs)", path_runner
+
+    outside = "/etc/hostname"
+
+    def rejected_runner(n: int) -> None:
+        for _ in range(n):
+            try:
+                validate_path(outside, allowed)
+            except ValueError:
+                pass
+
+    yield f"validate_path (rejected, {len(allowed)} dirs)", rejected_runner
+
+    patterns = [re.compile(p) for p in DEFAULT_BLOCKED.split("|")]
+    patterns += [
+        re.compile(rf"\bforbidden{i}\b|--danger-{i}=\S+")
+        for i in range(scale.patterns - len(patterns))
+    ]
+
+    def command_runner(n: int) -> None:
+        for _ in range(n):
+            validate_command(COMMAND, patterns)
+
+    yield f"validate_command ({len(patterns)} patterns, allowed)", command_runner
+
+
+def bench_oauth(scale: Scale, loop: asyncio.AbstractEventLoop) -> Iterator[tuple[str, Runner]]:
+    from mcp.shared.auth import OAuthClientInformationFull
+    from pydantic import AnyUrl
+
+    from mcp_bridge.oauth_provider import InMemoryOAuthProvider
+
+    provider = InMemoryOAuthProvider(max_clients=10)
+    client = OAuthClientInformationFull(
+        client_id="placeholder",
+        redirect_uris=[AnyUrl("http://localhost/callback")],
+        grant_types=["authorization_code", "refresh_token"],
+        response_types=["code"],
+        token_endpoint_auth_method="client_secret_post",
+    )
+    loop.run_until_complete(provider.register_client(client))
+    tokens = [
+        loop.run_until_complete(provider._issue_tokens(client, ["mcp:tools"])).access_token
+        for _ in range(scale.tokens)
+    ]
+
+    hot = tokens[0]
+    yield (
+        f"load_access_token (cached, {scale.tokens} tokens)",
+        _async(loop, lambda i: provider.load_access_token(hot)),
+    )
+    # Rotating through more tokens than the cache holds misses every time
+    yield (
+        f"load_access_token (uncached, {scale.tokens} tokens)",
+        _async(loop, lambda i: provider.load_access_token(tokens[i % len(tokens)])),
+    )
+    yield (
+        "load_access_token (unknown token)",
+        _async(loop, lambda i: provider.load_access_token("not-a-token")),
+    )
+
+
+def bench_audit(scale: Scale) -> Iterator[tuple[str, Runner]]:
+    from mcp_bridge.audit import truncate_for_log
+
+    short = "x" * 200
+    big = "y" * scale.log_bytes
+
+    def short_runner(n: int) -> None:
+        for _ in range(n):
+            truncate_for_log(short)
+
+    def big_runner(n: int) -> None:
+        for _ in range(n):
+            truncate_for_log(big)
+
+    yield "truncate_for_log (200 chars)", short_runner
+    yield f"truncate_for_log ({scale.log_bytes} chars)", big_runner
+
+
+def time_runner(run: Runner, repeat: int, min_time: float) -> tuple[float, float]:
+    """(best, median) seconds per op, with ``n`` doubled until a repeat
+    takes at least ``min_time``."""
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        run(n)
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            break
+        n *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    samples = [elapsed / n]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        run(n)
+        samples.append((time.perf_counter() - t0) / n)
+    return min(samples), statistics.median(samples)
+
+
+def run_benchmarks(
+    scale: Scale, repeat: int = 5, min_time: float = 0.2, name_filter: str = ""
+) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    loop = asyncio.new_event_loop()
+    with ExitStack() as stack:
+        root = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        sandbox_root = root / "sandbox"
+        sandbox_root.mkdir()
+        stack.callback(loop.close)
+        benches = [
+            bench_rate_limiter(scale, loop),
+            bench_concurrency_limiter(scale, loop),
+            bench_sandbox(scale, sandbox_root),
+            bench_oauth(scale, loop),
+            bench_audit(scale),
+        ]
+        for group in benches:
+            for name, run in group:
+                if name_filter and name_filter not in name:
+                    continue
+                best, median = time_runner(run, repeat, min_time)
+                results[name] = {"ns_per_op": round(best * 1e9, 1),
+                                 "median_ns": round(median * 1e9, 1)}
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Names of benchmarks slower than ``baseline`` beyond tolerance."""
+    return [
+        name for name, r in results.items()
+        if name in baseline and r["ns_per_op"] > baseline[name]["ns_per_op"] * (1 + tolerance)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--quick", action="store_true", help="smaller scales")
+    parser.add_argument("--filter", default="", help="only names containing this")
+    parser.add_argument("--save", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with saved results")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        QUICK if args.quick else Scale(), args.repeat, args.min_time, args.filter
+    )
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else {}
+
+    print(f"  {'benchmark':<58} {'ns/op':>12} {'median':>12} {'baseline':>12}")
+    for name, r in results.items():
+        base = f"{baseline[name]['ns_per_op']:>12.1f}" if name in baseline else ""
+        print(f"  {name:<58} {r['ns_per_op']:>12.1f} {r['median_ns']:>12.1f} {base}")
+
+    if args.save:
+        payload = {"python": sys.version.split()[0], "quick": args.quick, "results": results}
+        args.save.write_text(json.dumps(payload, indent=2) + "\n")
+        print(f"\nSaved results to {args.save}")
+    if not args.baseline:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"\nRegressions (tolerance {args.tolerance:.0%}): {', '.join(regressions) or 'none'}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Startup benchmark for the MCP bridge.
+
+Runs ``create_app()`` in fresh interpreters under ``python -X importtime``
+and prints the slowest imports grouped by top-level package, the time spent
+in each startup phase, and (with ``--serve``) the time until ``/health``
+answers on a real server process.
+
+Usage:
+    python scripts/profile_startup.py [--runs 5] [--top 15] [--serve]
+                                      [--budget 3.0]
+
+Exits non-zero when the median ``create_app`` cold start exceeds the budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+
+STARTUP_BUDGET_SECONDS = 3.0
+
+# The SDK import is timed on its own since mcp_bridge.server needs it anyway;
+# create_app includes registering every tool
+PHASES_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+import mcp.server.fastmcp
+t1 = time.perf_counter()
+from mcp_bridge.server import create_app
+t2 = time.perf_counter()
+create_app()
+t3 = time.perf_counter()
+print(json.dumps({"import_mcp_sdk": t1 - t0, "import_server": t2 - t1,
+                  "create_app": t3 - t2, "total": t3 - t0}))
+"""
+
+
+def _env(log_dir: str) -> dict[str, str]:
+    env = os.environ.copy()
+    env.setdefault("BEARER_TOKEN", "profile-startup")
+    env.setdefault("ALLOWED_DIRS_RAW", tempfile.gettempdir())
+    env["LOG_DIR"] = log_dir
+    env["LOG_LEVEL"] = "WARNING"
+    return env
+
+
+def measure_phases(runs: int, env: dict[str, str]) -> list[dict[str, float]]:
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PHASES_SNIPPET],
+            env=env, capture_output=True, text=True, check=True,
+        )
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def import_breakdown(env: dict[str, str]) -> dict[str, float]:
+    """Self import time (seconds) summed per top-level package."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_bridge.server"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    totals: dict[str, float] = defaultdict(float)
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us = parts[0].strip()
+        if len(parts) != 3 or not self_us.isdigit():
+            continue  # header line
+        totals[parts[2].strip().split(".")[0]] += int(self_us) / 1e6
+    return dict(totals)
+
+
+def time_to_health(env: dict[str, str], timeout: float = 30.0) -> float:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(env, HOST="127.0.0.1", PORT=str(port))
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "mcp_bridge.server"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"/health did not answer within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true", help="also time /health")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        env = _env(log_dir)
+
+        print("=== Import time by package (self time, single run) ===")
+        breakdown = import_breakdown(env)
+        for name, secs in sorted(breakdown.items(), key=lambda kv: -kv[1])[: args.top]:
+            print(f"  {name:<30} {secs * 1000:8.1f} ms")
+
+        print(f"\n=== Startup phases (median of {args.runs} runs) ===")
+        samples = measure_phases(args.runs, env)
+        for phase in samples[0]:
+            median = statistics.median(s[phase] for s in samples)
+            print(f"  {phase:<30} {median * 1000:8.1f} ms")
+        total = statistics.median(s["total"] for s in samples)
+
+        if args.serve:
+            print(f"\n  {'time to /health':<30} {time_to_health(env) * 1000:8.1f} ms")
+
+    print(f"\nBudget: {args.budget * 1000:.0f} ms — {'OK' if total <= args.budget else 'EXCEEDED'}")
+    return 0 if total <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Concurrency limiter whose capacity follows host load (AIMD).
+
+Every ``interval`` seconds the limiter looks at the 1-minute load average
+per CPU, the fraction of memory still available, and how long recent runs
+took compared with the long-run average. If any of them shows pressure,
+the limit is cut multiplicatively. If there is no pressure and callers
+were turned away or every slot was busy, the limit grows by one. The
+limit always stays within ``[min_limit, max_limit]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from mcp_bridge.audit import get_logger
+from mcp_bridge.rate_limiter import ConcurrencyLimiter
+
+
+def read_pressure() -> tuple[float, float]:
+    """(1-minute load per CPU, fraction of memory available)."""
+    load_per_cpu = os.getloadavg()[0] / (os.cpu_count() or 1)
+    total = available = 0
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key == "MemTotal":
+                total = int(rest.split()[0])
+            elif key == "MemAvailable":
+                available = int(rest.split()[0])
+    return load_per_cpu, available / total if total else 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class LimitChange:
+    at: float
+    old: int
+    new: int
+    reason: str
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    """Fail-fast limiter with an AIMD-adjusted capacity."""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        load_high: float = 1.0,
+        mem_low: float = 0.1,
+        latency_tolerance: float = 2.0,
+        decrease_factor: float = 0.7,
+        sensor: Callable[[], tuple[float, float]] = read_pressure,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        # Without an explicit max, allow one run per CPU but never start
+        # below the configured initial value
+        self.max_limit = max(
+            self.min_limit, max_limit or max(initial, os.cpu_count() or 1)
+        )
+        super().__init__(
+            max_concurrent=min(max(initial, self.min_limit), self.max_limit)
+        )
+        self.load_high = load_high
+        self.mem_low = mem_low
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self._sensor = sensor
+        self._peak = 0  # most slots held at once since the last adjustment
+        self._rejected = 0
+        self._rejected_total = 0
+        self._recent: list[float] = []
+        self._baseline: float | None = None  # slow EWMA of run latency
+        self.changes: deque[LimitChange] = deque(maxlen=50)
+        self.last_load = 0.0
+        self.last_mem_available = 1.0
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    async def acquire(self, reserve: int = 0) -> None:
+        try:
+            await super().acquire(reserve)
+        except RuntimeError:
+            self._rejected += 1
+            self._rejected_total += 1
+            raise
+        self._peak = max(self._peak, self._in_use)
+
+    def resize(self, max_concurrent: int) -> None:
+        """Treat a new configured value as a starting point within bounds."""
+        self._max = min(max(max_concurrent, self.min_limit), self.max_limit)
+        self._wake()
+
+    def set_bounds(self, min_limit: int, max_limit: int | None) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(
+            self.min_limit, max_limit or max(self._max, os.cpu_count() or 1)
+        )
+        self._max = min(max(self._max, self.min_limit), self.max_limit)
+        self._wake()
+
+    def observe(self, latency: float) -> None:
+        self._recent.append(latency)
+
+    def adjust(self, now: float | None = None) -> LimitChange | None:
+        """Apply one AIMD step; returns the change, if any."""
+        now = time.time() if now is None else now
+        load, mem = self._sensor()
+        self.last_load, self.last_mem_available = load, mem
+
+        # Latency gradient: recent mean against the slow-moving baseline
+        slow = False
+        if self._recent:
+            recent = sum(self._recent) / len(self._recent)
+            if self._baseline is None:
+                self._baseline = recent
+            slow = recent > self._baseline * self.latency_tolerance
+            self._baseline += 0.1 * (recent - self._baseline)
+            self._recent.clear()
+
+        old = self._max
+        reason = ""
+        if load > self.load_high:
+            reason = f"load {load:.2f}/cpu"
+        elif mem < self.mem_low:
+            reason = f"memory {mem:.0%} available"
+        elif slow:
+            reason = "latency"
+        if reason:
+            new = max(self.min_limit, min(old - 1, math.floor(old * self.decrease_factor)))
+        elif self._rejected or self._peak >= old:
+            new = min(self.max_limit, old + 1)
+            reason = "saturated"
+        else:
+            new = old
+        self._rejected = 0
+        self._peak = self._in_use
+
+        if new == old:
+            return None
+        self._max = new
+        self._wake()
+        change = LimitChange(at=now, old=old, new=new, reason=reason)
+        self.changes.append(change)
+        get_logger("adaptive_limiter").info(
+            "concurrency_limit_changed", old=old, new=new, reason=reason
+        )
+        return change
+
+    async def run(self, interval: float) -> None:
+        """Background task: adjust every ``interval`` seconds until cancelled."""
+        logger = get_logger("adaptive_limiter")
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.adjust()
+            except Exception as exc:
+                logger.warning("concurrency_adjust_failed", error=str(exc))
+
+    def metrics(self) -> dict[str, object]:
+        return {
+            "limit": self._max,
+            "in_use": self._in_use,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "rejected_total": self._rejected_total,
+            "load_per_cpu": round(self.last_load, 3),
+            "mem_available": round(self.last_mem_available, 3),
+            "latency_baseline_s": (
+                round(self._baseline, 2) if self._baseline is not None else None
+            ),
+            "changes": [asdict(c) for c in self.changes],
+        }
@@ -0,0 +1,139 @@
+"""Operator-only HTTP routes, authenticated with the static bearer token.
+
+Custom routes bypass the MCP OAuth middleware, so every handler here must
+call ``require_admin`` first.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+from typing import TYPE_CHECKING
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from mcp_bridge.diagnostics import MemoryTracer, sample_profile, task_dump
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.adaptive_limiter import AdaptiveConcurrencyLimiter
+    from mcp_bridge.config import Settings
+    from mcp_bridge.lifecycle import ProcessTracker
+
+
+def require_admin(request: Request, settings: Settings) -> JSONResponse | None:
+    """Return a 401 response unless the request carries the admin token."""
+    header = request.headers.get("authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.bearer_token.encode()
+    ):
+        return JSONResponse({"error": "unauthorized"}, status_code=401)
+    return None
+
+
+def register_admin_routes(
+    mcp: FastMCP,
+    settings: Settings,
+    tracker: ProcessTracker,
+    limiter: AdaptiveConcurrencyLimiter | None = None,
+) -> None:
+
+    @mcp.custom_route("/admin/drain", methods=["POST"])
+    async def admin_drain(request: Request) -> JSONResponse:
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        try:
+            timeout = float(request.query_params.get("timeout", settings.drain_timeout))
+        except ValueError:
+            return JSONResponse({"error": "timeout must be a number"}, 400)
+        if not 0 <= timeout < float("inf"):  # also rejects nan
+            return JSONResponse({"error": "timeout must be a non-negative number"}, 400)
+        tracker.start_drain(timeout)
+        return JSONResponse(
+            {"draining": True, "in_flight": len(tracker), "timeout": timeout},
+            status_code=202,
+        )
+
+    @mcp.custom_route("/admin/metrics", methods=["GET"])
+    async def admin_metrics(request: Request) -> JSONResponse:
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        return JSONResponse({
+            "in_flight": len(tracker),
+            "draining": tracker.draining,
+            "concurrency": limiter.metrics() if limiter is not None else None,
+        })
+
+    # One profile at a time: concurrent samplers would skew each other
+    profiling = asyncio.Lock()
+
+    @mcp.custom_route("/admin/profile", methods=["GET"])
+    async def admin_profile(request: Request) -> PlainTextResponse | JSONResponse:
+        """Sample all threads for ?seconds=N (max 120) at ?interval=S and
+        return collapsed stacks for flamegraph.pl or speedscope."""
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        try:
+            seconds = float(request.query_params.get("seconds", 10))
+            interval = float(request.query_params.get("interval", 0.01))
+        except ValueError:
+            return JSONResponse({"error": "seconds and interval must be numbers"}, 400)
+        # nan would slip through min/max, inf overflows the sampler's sleep
+        if not (0 < seconds < float("inf") and 0 < interval < float("inf")):
+            return JSONResponse(
+                {"error": "seconds and interval must be positive numbers"}, 400
+            )
+        seconds = min(seconds, 120.0)
+        interval = max(interval, 0.001)
+        if profiling.locked():
+            return JSONResponse({"error": "a profile is already running"}, 409)
+        async with profiling:
+            stacks = await asyncio.to_thread(sample_profile, seconds, interval)
+        return PlainTextResponse(
+            stacks,
+            headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'},
+        )
+
+    tracer = MemoryTracer()
+
+    @mcp.custom_route("/admin/memory/snapshot", methods=["POST"])
+    async def admin_memory_snapshot(request: Request) -> JSONResponse:
+        """Start tracemalloc if needed (?frames=N) and set the diff baseline."""
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        try:
+            frames = min(max(int(request.query_params.get("frames", 1)), 1), 100)
+            limit = max(int(request.query_params.get("limit", 20)), 1)
+        except ValueError:
+            return JSONResponse({"error": "frames and limit must be integers"}, 400)
+        return JSONResponse(await asyncio.to_thread(tracer.snapshot, frames, limit))
+
+    @mcp.custom_route("/admin/memory/diff", methods=["GET"])
+    async def admin_memory_diff(request: Request) -> JSONResponse:
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        try:
+            limit = max(int(request.query_params.get("limit", 20)), 1)
+        except ValueError:
+            return JSONResponse({"error": "limit must be an integer"}, 400)
+        try:
+            return JSONResponse(await asyncio.to_thread(tracer.diff, limit))
+        except RuntimeError as e:
+            return JSONResponse({"error": str(e)}, 409)
+
+    @mcp.custom_route("/admin/memory", methods=["DELETE"])
+    async def admin_memory_stop(request: Request) -> JSONResponse:
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        return JSONResponse({"stopped": tracer.stop()})
+
+    @mcp.custom_route("/admin/tasks", methods=["GET"])
+    async def admin_tasks(request: Request) -> JSONResponse:
+        """asyncio tasks with their await chains and tool subprocesses."""
+        if (denied := require_admin(request, settings)) is not None:
+            return denied
+        tasks = task_dump(tracker)
+        return JSONResponse({"count": len(tasks), "tasks": tasks})
@@ -0,0 +1,242 @@
+"""Streaming tar/zip archives of directory trees, and safe extraction.
+
+``list_tree`` yields the files of a directory one at a time. Inside a git
+work tree it reads them from ``git ls-files --cached --others
+--exclude-standard -z``, which honours every ``.gitignore`` level plus
+``.git/info/exclude`` and the global excludes file. Elsewhere it walks the
+tree. ``ArchiveWriter`` adds files in small batches from a worker thread.
+Tar formats are written in stream mode (``w|``), so memory use does not
+grow with the size of the tree. Zip keeps only its central directory, a
+small entry per file.
+
+``extract_archive`` reads tar archives in stream mode as well. Members go
+through tarfile's ``data`` filter, which rejects absolute paths, ``..``,
+links pointing outside the destination and device files. The filter API
+needs Python 3.11.4+; use 3.11.13 / 3.12.11 or later, which carry the
+2025 fixes for filter bypasses (CVE-2025-4517 and related). Zip members
+get the same path checks. Both enforce a limit on the total unpacked size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import shutil
+import stat
+import tarfile
+import zipfile
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import IO, Any
+
+FORMATS = ("tar.gz", "tar.zst", "zip")
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_COPY_BUFFER = 1024 * 1024
+
+
+class ArchiveLimitError(ValueError):
+    """The archive would exceed the configured size limit."""
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(
+            "tar.zst needs the optional zstandard module "
+            "(pip install claude-mcp-bridge[zstd])"
+        ) from None
+    return zstandard
+
+
+async def _git_files(root: Path) -> AsyncGenerator[str, None] | None:
+    probe = await asyncio.create_subprocess_exec(
+        "git", "rev-parse", "--is-inside-work-tree",
+        cwd=str(root),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    if await probe.wait() != 0:
+        return None
+
+    async def names() -> AsyncGenerator[str, None]:
+        proc = await asyncio.create_subprocess_exec(
+            "git", "ls-files", "--cached", "--others", "--exclude-standard", "-z",
+            cwd=str(root),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        assert proc.stdout is not None
+        previous = None
+        try:
+            while True:
+                try:
+                    raw = await proc.stdout.readuntil(b"\0")
+                except asyncio.IncompleteReadError:
+                    break
+                name = os.fsdecode(raw[:-1])
+                if name != previous:  # unmerged paths are listed once per stage
+                    yield name
+                previous = name
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
+    return names()
+
+
+async def list_tree(
+    root: Path, respect_gitignore: bool = True
+) -> AsyncGenerator[str, None]:
+    """Relative paths of the files (and symlinks) under ``root``, without ``.git``."""
+    names = await _git_files(root) if respect_gitignore else None
+    if names is not None:
+        async with contextlib.aclosing(names):  # stops git if we stop early
+            async for name in names:
+                yield name
+        return
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != ".git")
+        base = Path(dirpath).relative_to(root)
+        for name in sorted(filenames):
+            if name != ".git":  # a submodule's gitfile
+                yield str(base / name)
+        for name in dirnames:
+            if os.path.islink(os.path.join(dirpath, name)):
+                yield str(base / name)  # walk does not follow it; keep the link
+
+
+class ArchiveWriter:
+    """Write files under ``root`` into ``out`` as tar.gz, tar.zst or zip."""
+
+    def __init__(self, root: Path, out: Path, fmt: str, max_bytes: int) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.files = 0
+        self.bytes_in = 0
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        self._stream: IO[bytes] | None = None
+        if fmt == "zip":
+            self._zip = zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED)
+        elif fmt == "tar.gz":
+            self._tar = tarfile.open(str(out), "w|gz")
+        else:
+            zstandard = _zstandard()
+            raw = open(out, "wb")  # noqa: SIM115 - closed through the compressor
+            self._stream = zstandard.ZstdCompressor().stream_writer(raw)
+            self._tar = tarfile.open(fileobj=self._stream, mode="w|")
+
+    def add_many(self, names: list[str]) -> None:
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> None:
+        path = self.root / name
+        try:
+            st = path.lstat()
+        except FileNotFoundError:
+            return  # tracked but deleted in the work tree, or gone meanwhile
+        if not (stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode)):
+            return  # submodules, sockets, fifos
+        size = st.st_size if stat.S_ISREG(st.st_mode) else 0
+        if self.bytes_in + size > self.max_bytes:
+            raise ArchiveLimitError(
+                f"the files exceed the {self.max_bytes} byte limit at {name}"
+            )
+        if self._zip is not None:
+            if stat.S_ISLNK(st.st_mode):
+                return  # zip has no portable symlinks
+            self._zip.write(path, name)
+        else:
+            assert self._tar is not None
+            self._tar.add(path, arcname=name, recursive=False)
+        self.files += 1
+        self.bytes_in += size
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+        if self._stream is not None:
+            self._stream.close()
+
+
+def _open_tar(f: IO[bytes]) -> tarfile.TarFile:
+    if f.read(4) == _ZSTD_MAGIC:
+        f.seek(0)
+        reader = _zstandard().ZstdDecompressor().stream_reader(f)
+        return tarfile.open(fileobj=reader, mode="r|")
+    f.seek(0)
+    return tarfile.open(fileobj=f, mode="r|*")
+
+
+def _within(dest: Path, target: Path) -> bool:
+    return target == dest or dest in target.parents
+
+
+def extract_archive(
+    archive: Path, dest: Path, max_bytes: int, overwrite: bool = False
+) -> tuple[int, int, int]:
+    """Unpack ``archive`` into ``dest``; returns (files, bytes, skipped).
+
+    Existing files are skipped unless ``overwrite``. Raises ValueError for
+    unsafe members, unknown formats and ArchiveLimitError past ``max_bytes``.
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    dest = dest.resolve()
+    files = total = skipped = 0
+
+    def account(name: str, size: int) -> None:
+        nonlocal total
+        total += size
+        if total > max_bytes:
+            raise ArchiveLimitError(f"unpacked size exceeds {max_bytes} bytes at {name}")
+
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                target = Path(os.path.realpath(dest / info.filename))
+                if os.path.isabs(info.filename) or not _within(dest, target):
+                    raise ValueError(f"unsafe path in archive: {info.filename}")
+                if info.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                if target.exists() and not overwrite:
+                    skipped += 1
+                    continue
+                account(info.filename, info.file_size)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with zf.open(info) as src, open(target, "wb") as out:
+                    shutil.copyfileobj(src, out, _COPY_BUFFER)
+                files += 1
+        return files, total, skipped
+
+    if not hasattr(tarfile, "data_filter"):  # Python < 3.11.4
+        raise ValueError("extracting tar archives needs Python 3.11.4 or later")
+    with open(archive, "rb") as f:
+        try:
+            tar = _open_tar(f)
+        except tarfile.ReadError:
+            raise ValueError("not a zip or tar archive (gz, bz2, xz or zst)") from None
+        with tar:
+            for member in tar:
+                try:
+                    member = tarfile.data_filter(member, str(dest))
+                except tarfile.FilterError as e:
+                    raise ValueError(f"unsafe member in archive: {e}") from None
+                if member.isdir():
+                    tar.extract(member, dest, filter="fully_trusted")
+                    continue
+                if os.path.lexists(dest / member.name) and not overwrite:
+                    skipped += 1
+                    continue
+                account(member.name, member.size)
+                tar.extract(member, dest, filter="fully_trusted")  # filtered above
+                files += 1
+    return files, total, skipped
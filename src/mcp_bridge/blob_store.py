@@ -0,0 +1,150 @@
+"""Content-addressed on-disk store for large tool outputs.
+
+Blobs are keyed by the SHA-256 of their content, so storing the same output
+twice costs nothing. Files live under ``root/<first two hex chars>/<hash>``
+(``.zst`` when compressed with the optional ``zstandard`` module, installed
+by ``pip install claude-mcp-bridge[zstd]``). When the total size on disk
+exceeds the quota, the least recently used blobs are deleted; file mtimes
+record use, so the order survives restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from mcp_bridge.audit import get_logger
+
+_HANDLE_RE = re.compile(r"[0-9a-f]{64}")
+
+
+class BlobStore:
+    """LRU, quota-bounded blob store keyed by content hash."""
+
+    def __init__(self, root: Path, quota_bytes: int, compress: bool = False) -> None:
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self._zstd = None
+        if compress:
+            try:
+                import zstandard
+
+                self._zstd = zstandard
+            except ImportError:
+                get_logger("blob_store").info("zstd_unavailable")
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[Path, int]] = OrderedDict()
+        self._total = 0
+        root.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        found: list[tuple[float, str, Path, int]] = []
+        for path in self.root.glob("??/*"):
+            handle = path.name.removesuffix(".zst")
+            if not _HANDLE_RE.fullmatch(handle):
+                continue
+            st = path.stat()
+            found.append((st.st_mtime, handle, path, st.st_size))
+        for _, handle, path, size in sorted(found):
+            self._entries[handle] = (path, size)
+            self._total += size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` and return its handle (hex SHA-256)."""
+        handle = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if handle in self._entries:
+                self._touch(handle)
+                return handle
+        payload = data
+        suffix = ""
+        if self._zstd is not None:
+            payload = self._zstd.ZstdCompressor().compress(data)
+            suffix = ".zst"
+        path = self.root / handle[:2] / (handle + suffix)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+        with self._lock:
+            if handle not in self._entries:
+                self._entries[handle] = (path, len(payload))
+                self._total += len(payload)
+            self._evict(keep=handle)
+        return handle
+
+    def read(self, handle: str, offset: int = 0, length: int = -1) -> tuple[bytes, int]:
+        """Return ``length`` bytes from ``offset`` (all if negative) and the
+        blob's full size. Raises KeyError for unknown or evicted handles."""
+        if not _HANDLE_RE.fullmatch(handle):
+            raise KeyError(handle)
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                entry = self._find(handle)  # written by another worker
+            self._touch(handle)
+        path = entry[0]
+        try:
+            if path.suffix == ".zst":
+                if self._zstd is None:
+                    import zstandard
+
+                    self._zstd = zstandard
+                data = self._zstd.ZstdDecompressor().decompressobj().decompress(
+                    path.read_bytes()
+                )
+                end = len(data) if length < 0 else offset + length
+                return data[offset:end], len(data)
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                f.seek(offset)
+                return f.read(length), size
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(handle)
+            raise KeyError(handle) from None
+
+    def _find(self, handle: str) -> tuple[Path, int]:
+        for suffix in ("", ".zst"):
+            path = self.root / handle[:2] / (handle + suffix)
+            if path.exists():
+                entry = self._entries[handle] = (path, path.stat().st_size)
+                self._total += entry[1]
+                return entry
+        raise KeyError(handle)
+
+    def _touch(self, handle: str) -> None:
+        self._entries.move_to_end(handle)
+        try:
+            os.utime(self._entries[handle][0])
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, handle: str) -> None:
+        entry = self._entries.pop(handle, None)
+        if entry is not None:
+            self._total -= entry[1]
+
+    def _evict(self, keep: str) -> None:
+        while self._total > self.quota_bytes and len(self._entries) > 1:
+            handle = next(iter(self._entries))
+            if handle == keep:
+                self._entries.move_to_end(handle)
+                continue
+            path, _ = self._entries[handle]
+            self._forget(handle)
+            path.unlink(missing_ok=True)
@@ -0,0 +1,153 @@
+"""Incremental parser for the Claude CLI's ``--output-format stream-json``.
+
+The CLI writes one JSON event per line: a ``system`` init event, then
+``assistant`` messages (text and tool_use blocks) interleaved with ``user``
+messages carrying tool results, and a final ``result`` event with the
+answer, cost, turn count and token usage. ``StreamParser`` consumes lines
+as they arrive and keeps only what the compact summary needs, noting when
+each assistant turn started.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class Turn:
+    index: int
+    started_at: float  # seconds since the parser was created
+    tools: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class StreamSummary:
+    result: str = ""
+    subtype: str = ""
+    is_error: bool = False
+    model: str = ""
+    session_id: str = ""
+    num_turns: int = 0
+    duration_ms: int = 0
+    duration_api_ms: int = 0
+    cost_usd: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_counts: Counter[str] = field(default_factory=Counter)
+    tool_errors: int = 0
+    turns: list[Turn] = field(default_factory=list)
+    events: int = 0
+    malformed: int = 0
+
+    def render(self) -> str:
+        """Final answer followed by a short run summary."""
+        status = self.subtype or ("error" if self.is_error else "incomplete")
+        lines = [
+            self.result.rstrip(),
+            "",
+            f"--- claude: {status} | {self.num_turns} turns"
+            f" | {self.duration_ms / 1000:.1f}s (api {self.duration_api_ms / 1000:.1f}s)"
+            f" | ${self.cost_usd:.4f}"
+            f" | tokens in {self.input_tokens} / out {self.output_tokens} ---",
+        ]
+        if self.tool_counts:
+            tools = ", ".join(f"{n} x{c}" for n, c in self.tool_counts.most_common())
+            if self.tool_errors:
+                tools += f" ({self.tool_errors} failed)"
+            lines.append(f"Tools: {tools}")
+        return "\n".join(lines)
+
+    def turn_timings(self) -> list[dict[str, object]]:
+        """Per-turn start offsets and tools, for the audit log."""
+        return [
+            {"turn": t.index, "at_s": round(t.started_at, 2), "tools": t.tools}
+            for t in self.turns
+        ]
+
+
+class StreamParser:
+    """Feed stream-json lines in arrival order; read ``summary`` at the end."""
+
+    def __init__(self) -> None:
+        self.summary = StreamSummary()
+        self._start = time.monotonic()
+        self._message_ids: dict[str, Turn] = {}
+        self._last_text = ""
+
+    def feed(self, line: bytes | str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            event = json.loads(line)
+        except ValueError:
+            self.summary.malformed += 1
+            return
+        if not isinstance(event, dict):
+            self.summary.malformed += 1
+            return
+        self.summary.events += 1
+        kind = event.get("type")
+        if kind == "system":
+            self.summary.model = event.get("model", self.summary.model)
+            self.summary.session_id = event.get("session_id", self.summary.session_id)
+        elif kind == "assistant":
+            self._assistant(event.get("message") or {})
+        elif kind == "user":
+            for block in (event.get("message") or {}).get("content") or []:
+                if isinstance(block, dict) and block.get("type") == "tool_result":
+                    self.summary.tool_errors += bool(block.get("is_error"))
+        elif kind == "result":
+            self._result(event)
+
+    def _assistant(self, message: dict) -> None:
+        # One API turn may arrive as several events sharing a message id
+        msg_id = message.get("id") or f"_{len(self._message_ids)}"
+        turn = self._message_ids.get(msg_id)
+        if turn is None:
+            turn = Turn(
+                index=len(self.summary.turns) + 1,
+                started_at=time.monotonic() - self._start,
+            )
+            self._message_ids[msg_id] = turn
+            self.summary.turns.append(turn)
+        for block in message.get("content") or []:
+            if not isinstance(block, dict):
+                continue
+            if block.get("type") == "text" and block.get("text"):
+                self._last_text = block["text"]
+            elif block.get("type") == "tool_use":
+                name = block.get("name", "?")
+                turn.tools.append(name)
+                self.summary.tool_counts[name] += 1
+
+    def _result(self, event: dict) -> None:
+        s = self.summary
+        s.result = event.get("result") or ""
+        s.subtype = event.get("subtype", "")
+        s.is_error = bool(event.get("is_error"))
+        # Fields may be present but null, so ``or 0`` rather than a default
+        s.num_turns = event.get("num_turns") or 0
+        s.duration_ms = event.get("duration_ms") or 0
+        s.duration_api_ms = event.get("duration_api_ms") or 0
+        s.cost_usd = event.get("total_cost_usd", event.get("cost_usd", 0.0)) or 0.0
+        usage = event.get("usage") or {}
+        s.input_tokens = (
+            (usage.get("input_tokens") or 0)
+            + (usage.get("cache_creation_input_tokens") or 0)
+            + (usage.get("cache_read_input_tokens") or 0)
+        )
+        s.output_tokens = usage.get("output_tokens") or 0
+
+    def finish(self) -> StreamSummary:
+        """Summary so far; falls back to the last assistant text if the run
+        ended without a result event (e.g. it was killed)."""
+        s = self.summary
+        if not s.result and self._last_text:
+            s.result = self._last_text
+        if not s.num_turns:
+            s.num_turns = len(s.turns)
+        return s
@@ -0,0 +1,32 @@
+"""Identify the client behind the tool call being handled.
+
+The MCP server sets a per-message request context that carries the
+Starlette request; after OAuth authentication its ``user`` holds the access
+token and therefore the ``client_id``. Without OAuth, callers are told
+apart by a hash of their bearer token, and fall back to ``anonymous``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+ANONYMOUS = "anonymous"
+
+
+def current_client_id() -> str:
+    from mcp.server.auth.middleware.bearer_auth import AuthenticatedUser
+    from mcp.server.lowlevel.server import request_ctx
+
+    try:
+        request = request_ctx.get().request
+    except LookupError:
+        return ANONYMOUS  # called outside a request, e.g. from tests
+    if request is None:
+        return ANONYMOUS
+    user = request.scope.get("user")
+    if isinstance(user, AuthenticatedUser):
+        return user.access_token.client_id
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return "token:" + hashlib.sha256(token.encode()).hexdigest()[:12]
+    return ANONYMOUS
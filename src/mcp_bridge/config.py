@@ -17,6 +17,16 @@ class Settings(BaseSettings):
     # Auth
     bearer_token: str
 
+    # OAuth state — persisted to SQLite when a path is set, in-memory otherwise
+    oauth_db_path: Path | None = None
+    oauth_max_clients: int = 100
+    oauth_refresh_token_ttl: int = 3600 * 24 * 30
+    oauth_sweep_interval: int = 300
+    oauth_token_cache_size: int = 256
+    # Seconds a validated access token is trusted without a lookup; unset
+    # means 30 with one worker and 0 with several, so revocations apply at once
+    oauth_token_cache_ttl: float | None = None
+
     # Sandbox — stored as raw strings, parsed in model_post_init
     allowed_dirs_raw: str = str(Path.home() / "projects")
     blocked_commands_raw: str = ""
@@ -28,28 +38,132 @@ class Settings(BaseSettings):
     # Rate limits
     max_requests_per_minute: int = 10
     max_concurrent_claude: int = 3
+    # Adaptive concurrency: the claude_execute limit starts at
+    # max_concurrent_claude and moves between min and max with host load
+    # (max 0 = CPU count, at least max_concurrent_claude); single-worker only
+    claude_concurrency_adaptive: bool = False
+    claude_concurrency_min: int = 1
+    claude_concurrency_max: int = 0
+    claude_concurrency_interval: float = 10.0
+    claude_concurrency_load_high: float = 1.0
+    claude_concurrency_mem_low: float = 0.1
+
+    # Per-client fairness: claude_execute callers wait up to
+    # claude_queue_timeout seconds for a slot, served in weighted fair order
+    # (weights as "client_id=weight,..."); 0 keeps fail-fast behaviour
+    claude_queue_timeout: float = 0.0
+    client_weights_raw: str = ""
+    client_weights: dict[str, float] = {}
+    # Daily per-client quotas for claude_execute + run_command (0 = unlimited)
+    client_daily_runtime_seconds: float = 0.0
+    client_daily_cpu_seconds: float = 0.0
+
+    # GPU telemetry (NVML sampler; interval 0 disables it)
+    gpu_sample_interval: float = 5.0
+    gpu_history_size: int = 720
+
+    # Host metrics history (interval 0 disables the sampler)
+    host_sample_interval: float = 1.0
+
+    # Result shaping: default max chars per tool result, with per-tool
+    # overrides as "tool=chars,..." (0 disables truncation)
+    result_max_chars: int = 100_000
+    result_head_fraction: float = 0.3
+    result_limits_raw: str = ""
+    result_limits: dict[str, int] = {}
+
+    # Full copies of truncated outputs, paged back with blob_read
+    # (blob_dir defaults to log_dir/blobs; quota 0 disables the store)
+    blob_dir: Path | None = None
+    blob_quota_mb: int = 1024
+    blob_compress: bool = False
+
+    # file_watch: longest wait, and the scan interval used where inotify
+    # is unavailable
+    file_watch_max_timeout: int = 600
+    file_watch_poll_interval: float = 0.5
+
+    # file_download/file_upload: largest chunk in bytes (before base64)
+    transfer_max_chunk: int = 4 * 1024 * 1024
+    # Archives made by archive_create, fetched by handle with file_download
+    # (transfer_dir defaults to log_dir/transfers; deleted after transfer_ttl)
+    transfer_dir: Path | None = None
+    transfer_ttl: int = 3600
+    # Largest total size of the files going into or out of an archive
+    archive_max_mb: int = 2048
+
+    # Persistent run_command shell sessions (max 0 disables them)
+    shell_session_max: int = 8
+    shell_session_idle_timeout: int = 900
+
+    # Response compression (gzip; SSE streams are never compressed, set
+    # json_response to get compressible JSON tool responses)
+    gzip_minimum_size: int = 1024
+    json_response: bool = False
 
     # Claude CLI
     claude_cli_path: str = "claude"
     claude_default_max_turns: int = 5
     claude_max_timeout: int = 600
+    claude_batch_max_jobs: int = 50
+    # Memoized claude_execute results per repo state (ttl 0 disables)
+    claude_cache_ttl: int = 0
+    claude_cache_size: int = 128
 
     # Server
     host: str = "127.0.0.1"
     port: int = 8787
     log_level: str = "INFO"
     public_url: str = ""  # e.g. https://nativedev.tail7d3518.ts.net:10000
+    workers: int = 1
+    # Seconds to let running tool subprocesses finish on shutdown/drain
+    drain_timeout: int = 30
+    # Limiter/token state shared by workers; defaults to log_dir/state.db
+    # when workers > 1
+    shared_state_path: Path | None = None
+
+    # Re-read .env when it changes (or on SIGHUP); 0 disables the watcher
+    config_reload_interval: float = 5.0
 
     # Audit
     log_dir: Path = Path.home() / ".local/share/mcp-bridge"
     max_log_size_mb: int = 50
 
+    @field_validator(
+        "oauth_db_path", "shared_state_path", "blob_dir", "transfer_dir", mode="before"
+    )
+    @classmethod
+    def _empty_path_is_none(cls, v: object) -> object:
+        return None if v == "" else v
+
     def model_post_init(self, __context: object) -> None:
         if self.allowed_dirs_raw and not self.allowed_dirs:
             self.allowed_dirs = [
                 Path(p.strip()).expanduser().resolve()
                 for p in self.allowed_dirs_raw.split(",")
             ]
+        if self.result_limits_raw and not self.result_limits:
+            self.result_limits = {
+                tool.strip(): int(limit)
+                for tool, _, limit in (
+                    item.partition("=") for item in self.result_limits_raw.split(",")
+                )
+                if tool.strip()
+            }
+        if self.client_weights_raw and not self.client_weights:
+            self.client_weights = {
+                client.strip(): float(weight)
+                for client, _, weight in (
+                    item.partition("=") for item in self.client_weights_raw.split(",")
+                )
+                if client.strip()
+            }
+        if self.blob_dir is None:
+            self.blob_dir = self.log_dir / "blobs"
+        if self.transfer_dir is None:
+            self.transfer_dir = self.log_dir / "transfers"
+        if self.workers > 1 and self.shared_state_path is None:
+            self.shared_state_path = self.log_dir / "state.db"
         if self.blocked_commands_raw and not self.blocked_commands:
             self.blocked_commands = [
                 re.compile(p.strip())
@@ -0,0 +1,226 @@
+"""Reload settings from ``.env`` without restarting the server.
+
+Tools and routes hold a ``LiveSettings`` proxy instead of a ``Settings``
+instance. ``ConfigWatcher`` re-reads the env file when its mtime changes or
+on SIGHUP. The new ``Settings`` (with its resolved directories and compiled
+command patterns) is built in a worker thread, off the request path. It is
+then swapped into the proxy in a single assignment, and the reload hooks
+resize limiters in place. An invalid file is logged and ignored, so the
+previous snapshot stays in effect.
+
+Fields that are only read at startup (host, port, workers, storage paths,
+and so on) are reported in the log when they change but need a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from dotenv import dotenv_values
+from pydantic import ValidationError
+from pydantic_settings import BaseSettings, PydanticBaseSettingsSource
+
+from mcp_bridge import config
+from mcp_bridge.audit import get_logger
+from mcp_bridge.config import Settings
+
+# Applied by reload hooks; changes to anything else need a restart
+LIVE_FIELDS = frozenset({
+    "bearer_token",
+    "allowed_dirs_raw",
+    "blocked_commands_raw",
+    "max_requests_per_minute",
+    "max_concurrent_claude",
+    "claude_concurrency_min",
+    "claude_concurrency_max",
+    "claude_concurrency_load_high",
+    "claude_concurrency_mem_low",
+    "claude_queue_timeout",
+    "client_weights_raw",
+    "client_daily_runtime_seconds",
+    "client_daily_cpu_seconds",
+    "claude_cli_path",
+    "claude_default_max_turns",
+    "claude_max_timeout",
+    "claude_batch_max_jobs",
+    "result_max_chars",
+    "result_head_fraction",
+    "result_limits_raw",
+    "shell_session_max",
+    "shell_session_idle_timeout",
+    "transfer_max_chunk",
+    "archive_max_mb",
+    "log_level",
+})
+# Derived in model_post_init from a *_raw field
+_PARSED_FIELDS = frozenset({
+    "allowed_dirs", "blocked_commands", "result_limits", "client_weights",
+})
+
+ReloadHook = Callable[[Settings, Settings], None]
+
+
+class _ExplicitSettings(Settings):
+    """``Settings`` validated from the given values only, not os.environ."""
+
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (init_settings,)
+
+
+class LiveSettings:
+    """Read-through proxy to the current ``Settings`` snapshot."""
+
+    def __init__(self, snapshot: Settings) -> None:
+        object.__setattr__(self, "_snapshot", snapshot)
+
+    @property
+    def snapshot(self) -> Settings:
+        return self._snapshot
+
+    def swap(self, snapshot: Settings) -> None:
+        object.__setattr__(self, "_snapshot", snapshot)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._snapshot, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("LiveSettings is read-only; edit the env file instead")
+
+
+class ConfigWatcher:
+    """Watch the env file and swap re-validated settings into ``live``."""
+
+    def __init__(
+        self,
+        live: LiveSettings,
+        env_file: Path,
+        hooks: list[ReloadHook],
+        interval: float = 5.0,
+    ) -> None:
+        self.live = live
+        self.env_file = env_file
+        self.hooks = hooks
+        self.interval = interval
+        self._mtime = self._stat()
+        self._reload_requested = asyncio.Event()
+        # Variables set in the real environment win over the file, as they
+        # did at startup; everything else follows the file
+        file_values = self._read_file()
+        self._external = {
+            k for k, v in os.environ.items()
+            if k in file_values and file_values[k] != v
+        }
+        self._managed = set(file_values) - self._external
+
+    def _stat(self) -> float | None:
+        try:
+            return self.env_file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _read_file(self) -> dict[str, str]:
+        if not self.env_file.exists():
+            return {}
+        return {k: v for k, v in dotenv_values(self.env_file).items() if v is not None}
+
+    def _load(self) -> tuple[Settings, dict[str, str]]:
+        """Build a validated snapshot from the environment and the env file.
+
+        Runs in a worker thread: path resolution and regex compilation
+        happen here, not in request handlers. The environment is not
+        touched; ``_apply_environ`` does that once the snapshot is accepted.
+        """
+        values = self._read_file()
+        merged = {k: v for k, v in os.environ.items() if k not in self._managed}
+        merged.update((k, v) for k, v in values.items() if k not in self._external)
+        fields = {
+            key.lower(): value
+            for key, value in merged.items()
+            if key.lower() in Settings.model_fields and key.lower() not in _PARSED_FIELDS
+        }
+        return _ExplicitSettings(**fields), values  # type: ignore[arg-type]
+
+    def _apply_environ(self, values: dict[str, str]) -> None:
+        """Mirror the accepted env file into os.environ, for child processes."""
+        for key in self._managed - set(values):
+            os.environ.pop(key, None)
+        for key, value in values.items():
+            if key not in self._external:
+                os.environ[key] = value
+        self._managed = set(values) - self._external
+
+    async def reload(self) -> bool:
+        """Reload now; returns False if the new configuration is invalid."""
+        logger = get_logger("config")
+        try:
+            new, values = await asyncio.to_thread(self._load)
+        except (ValidationError, ValueError, OSError) as exc:
+            logger.error("config_reload_failed", error=str(exc))
+            return False
+        self._apply_environ(values)
+
+        old = self.live.snapshot
+        changed = sorted(
+            name
+            for name in Settings.model_fields
+            if name not in _PARSED_FIELDS and getattr(old, name) != getattr(new, name)
+        )
+        if not changed:
+            return True
+        self.live.swap(new)
+        config._settings = new
+        for hook in self.hooks:
+            try:
+                hook(old, new)
+            except Exception as exc:  # one broken hook must not stop the others
+                logger.error("config_reload_hook_failed", hook=repr(hook), error=str(exc))
+        restart = [name for name in changed if name not in LIVE_FIELDS]
+        logger.info(
+            "config_reloaded",
+            changed=changed,
+            **({"needs_restart": restart} if restart else {}),
+        )
+        return True
+
+    def request_reload(self) -> None:
+        self._reload_requested.set()
+
+    async def run(self) -> None:
+        """Background task: reload on SIGHUP or when the file changes."""
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, self.request_reload)
+        except (RuntimeError, ValueError, NotImplementedError):
+            pass  # not the main thread; mtime polling still works
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._reload_requested.wait(), timeout=self.interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                forced = self._reload_requested.is_set()
+                self._reload_requested.clear()
+                mtime = self._stat()
+                if forced or mtime != self._mtime:
+                    self._mtime = mtime
+                    await self.reload()
+        finally:
+            try:
+                loop.remove_signal_handler(signal.SIGHUP)
+            except (RuntimeError, ValueError, NotImplementedError):
+                pass
@@ -0,0 +1,193 @@
+"""In-process diagnostics for the admin routes.
+
+``sample_profile`` is a wall-clock sampling profiler: a thread reads every
+other thread's stack through ``sys._current_frames()`` at a fixed interval
+and counts identical stacks. The result uses the collapsed format
+(``frame;frame;frame count`` per line) read by flamegraph.pl, speedscope
+and inferno. The event loop thread is sampled like any other, so time spent
+in blocking calls on the loop shows up under the tool that made them.
+
+``MemoryTracer`` wraps ``tracemalloc``: a snapshot starts tracing if needed
+and becomes the baseline that later diffs compare against. Tracing slows
+every allocation, so it stays off until asked for and can be stopped again.
+
+``task_dump`` lists asyncio tasks with the chain of coroutines each one is
+suspended in, plus the tool subprocesses it is waiting on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mcp_bridge.lifecycle import ProcessTracker
+
+_TOOLS_DIR = str(Path(__file__).parent / "tools")
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    return f"{path.parent.name}/{path.name}:{code.co_name}"
+
+
+def sample_profile(seconds: float, interval: float = 0.01) -> str:
+    """Sample all threads for ``seconds`` and return collapsed stacks.
+
+    Blocks the calling thread; run it with ``asyncio.to_thread``.
+    """
+    me = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            frames: list[str] = []
+            f: FrameType | None = frame
+            while f is not None:
+                frames.append(_frame_name(f))
+                f = f.f_back
+            frames.append(names.get(ident, str(ident)))
+            stacks[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class MemoryTracer:
+    """tracemalloc snapshots with a baseline for diffs."""
+
+    def __init__(self) -> None:
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    @staticmethod
+    def _stat(stat: tracemalloc.Statistic | tracemalloc.StatisticDiff) -> dict[str, Any]:
+        frame = stat.traceback[0]
+        entry = {
+            "where": f"{frame.filename}:{frame.lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        if isinstance(stat, tracemalloc.StatisticDiff):
+            entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+            entry["count_diff"] = stat.count_diff
+        return entry
+
+    def snapshot(self, frames: int = 1, limit: int = 20) -> dict[str, Any]:
+        """Start tracing if needed, store a new baseline and summarize it."""
+        with self._lock:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(frames)
+            snap = self._take()
+            self._baseline = snap
+            stats = snap.statistics("lineno")
+            current, peak = tracemalloc.get_traced_memory()
+            return {
+                "started_tracing": started,
+                "traced_kb": round(current / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top": [self._stat(s) for s in stats[:limit]],
+            }
+
+    def diff(self, limit: int = 20) -> dict[str, Any]:
+        """Compare a fresh snapshot with the baseline.
+
+        Raises RuntimeError if no snapshot has been taken yet.
+        """
+        with self._lock:
+            if self._baseline is None or not tracemalloc.is_tracing():
+                raise RuntimeError("No baseline; take a snapshot first")
+            stats = self._take().compare_to(self._baseline, "lineno")
+            current, peak = tracemalloc.get_traced_memory()
+            return {
+                "traced_kb": round(current / 1024, 1),
+                "peak_kb": round(peak / 1024, 1),
+                "top": [self._stat(s) for s in stats[:limit]],
+            }
+
+    def stop(self) -> bool:
+        with self._lock:
+            self._baseline = None
+            if not tracemalloc.is_tracing():
+                return False
+            tracemalloc.stop()
+            return True
+
+
+def _await_chain(task: asyncio.Task[Any]) -> list[FrameType]:
+    """Frames of the coroutines ``task`` is suspended in, outermost first.
+
+    ``Task.get_stack`` only returns the outermost coroutine, so follow
+    ``cr_await`` (and its generator equivalents) down to the leaf.
+    """
+    frames = []
+    obj: Any = task.get_coro()
+    while obj is not None:
+        frame = getattr(obj, "cr_frame", None) or getattr(obj, "ag_frame", None) \
+            or getattr(obj, "gi_frame", None)
+        if frame is not None:
+            frames.append(frame)
+        obj = getattr(obj, "cr_await", None) or getattr(obj, "ag_await", None) \
+            or getattr(obj, "gi_yieldfrom", None)
+    return frames
+
+
+def _cmdline(pid: int, max_len: int = 200) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            raw = f.read()
+    except OSError:
+        return ""
+    text = raw.replace(b"\0", b" ").decode(errors="replace").strip()
+    return text if len(text) <= max_len else text[:max_len] + "..."
+
+
+def task_dump(tracker: ProcessTracker | None = None) -> list[dict[str, Any]]:
+    """Describe every asyncio task on the running loop, slowest tools first."""
+    owners = tracker.owners() if tracker is not None else {}
+    tasks = []
+    for task in asyncio.all_tasks():
+        frames = _await_chain(task)
+        tool = next(
+            (f.f_code.co_name for f in frames if f.f_code.co_filename.startswith(_TOOLS_DIR)),
+            None,
+        )
+        entry: dict[str, Any] = {
+            "name": task.get_name(),
+            "state": "cancelling" if task.cancelling() else "pending",
+            "tool": tool,
+            "awaiting": [f"{_frame_name(f)}:{f.f_lineno}" for f in frames],
+        }
+        if task in owners:
+            entry["subprocesses"] = [
+                {"pid": pid, "running_s": round(secs, 1), "cmdline": _cmdline(pid)}
+                for pid, secs in owners[task]
+            ]
+        tasks.append(entry)
+    tasks.sort(key=lambda t: (
+        t["tool"] is None,
+        -max((p["running_s"] for p in t.get("subprocesses", [])), default=0),
+    ))
+    return tasks
@@ -0,0 +1,173 @@
+"""Weighted fair queuing of concurrency slots between clients.
+
+``FairConcurrencyLimiter`` wraps another limiter. When all slots are taken,
+callers wait in a queue ordered by virtual finish time instead of failing
+at once. Each request is tagged ``max(V, client's last tag) + 1 / weight``,
+where ``V`` is the tag of the last request granted. So under contention a
+client with weight 2 gets twice the slots of a client with weight 1, and a
+client that floods the queue only delays itself. A client whose last tag
+falls behind ``V`` is forgotten, so the per-client state stays bounded.
+Waiters give up after ``queue_timeout`` seconds with the usual limit
+error. Requests that keep slots in reserve (batch jobs) stay out of the
+fair order and only take a slot when nobody is queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+
+from mcp_bridge.clients import current_client_id
+from mcp_bridge.rate_limiter import ConcurrencyLimiter
+
+_PRUNE_MIN = 256  # clients tracked before the first sweep of idle ones
+
+
+class FairConcurrencyLimiter(ConcurrencyLimiter):
+    """Queue slot requests per client and grant them in weighted fair order."""
+
+    def __init__(
+        self,
+        inner: ConcurrencyLimiter,
+        weights: dict[str, float] | None = None,
+        queue_timeout: float = 30.0,
+        poll: float = 0.25,
+    ) -> None:
+        self._inner = inner
+        self._weights = weights or {}
+        self.queue_timeout = queue_timeout
+        self._poll = poll
+        self._vtime = 0.0
+        self._last_tag: dict[str, float] = {}
+        self._prune_at = _PRUNE_MIN
+        self._waiters: list[list] = []  # heap of [tag, seq, client]
+        self._seq = itertools.count()
+        self._freed = asyncio.Event()
+        self.granted: Counter[str] = Counter()
+
+    @property
+    def capacity(self) -> int:
+        return self._inner.capacity
+
+    def weight(self, client_id: str) -> float:
+        return self._weights.get(client_id, 1.0)
+
+    def queued(self) -> Counter[str]:
+        return Counter(entry[2] for entry in self._waiters)
+
+    def _wake(self) -> None:
+        # Waiters hold a reference to the old event, so swapping wakes them all
+        self._freed.set()
+        self._freed = asyncio.Event()
+
+    def _grant(self, client_id: str, tag: float) -> None:
+        self._vtime = max(self._vtime, tag)
+        self.granted[client_id] += 1
+        if len(self._last_tag) > self._prune_at:
+            self._prune()
+
+    def _prune(self) -> None:
+        # A tag at or behind the virtual clock gives the same next tag as no
+        # entry at all, so idle clients can be forgotten. Sweeping only when
+        # the map has doubled keeps the cost per request constant.
+        self._last_tag = {c: t for c, t in self._last_tag.items() if t > self._vtime}
+        self._prune_at = max(_PRUNE_MIN, 2 * len(self._last_tag))
+
+    async def acquire(self, reserve: int = 0) -> None:
+        await self._acquire(self.queue_timeout, reserve)
+
+    async def acquire_within(self, timeout: float, reserve: int = 0) -> None:
+        await self._acquire(timeout, reserve)
+
+    async def _acquire(self, timeout: float, reserve: int = 0) -> None:
+        client = current_client_id()
+        if reserve:
+            await self._acquire_spare(client, timeout, reserve)
+            return
+        tag = max(self._vtime, self._last_tag.get(client, 0.0)) + 1 / self.weight(client)
+        self._last_tag[client] = tag
+
+        if not self._waiters:
+            try:
+                await self._inner.acquire()
+            except RuntimeError:
+                if timeout <= 0:
+                    raise
+            else:
+                self._grant(client, tag)
+                return
+
+        entry = [tag, next(self._seq), client]
+        heapq.heappush(self._waiters, entry)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                freed = self._freed
+                if self._waiters[0] is entry:
+                    try:
+                        await self._inner.acquire()
+                    except RuntimeError:
+                        pass
+                    else:
+                        heapq.heappop(self._waiters)
+                        self._grant(client, tag)
+                        self._wake()  # the next in line may fit too
+                        return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"Max concurrent claude_execute limit reached "
+                        f"({self.capacity}); waited {timeout:.0f}s in queue"
+                    )
+                try:
+                    # Poll as well: slots freed by other workers do not wake us
+                    await asyncio.wait_for(freed.wait(), min(remaining, self._poll))
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._wake()
+            raise
+
+    async def _acquire_spare(self, client: str, timeout: float, reserve: int) -> None:
+        """Yield to queued callers and take a slot only while ``reserve`` stay free."""
+        deadline = time.monotonic() + timeout
+        while True:
+            freed = self._freed
+            if not self._waiters:
+                try:
+                    await self._inner.acquire(reserve)
+                except RuntimeError:
+                    pass
+                else:
+                    self.granted[client] += 1
+                    return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError(
+                    f"Max concurrent claude_execute limit reached ({self.capacity})"
+                )
+            try:
+                await asyncio.wait_for(freed.wait(), min(remaining, self._poll))
+            except asyncio.TimeoutError:
+                pass
+
+    def release(self) -> None:
+        self._inner.release()
+        self._wake()
+
+    def resize(self, max_concurrent: int) -> None:
+        self._inner.resize(max_concurrent)
+        self._wake()  # a bigger limit may admit waiters right away
+
+    def configure(self, weights: dict[str, float], queue_timeout: float) -> None:
+        self._weights = weights
+        self.queue_timeout = queue_timeout
+
+    def observe(self, latency: float) -> None:
+        self._inner.observe(latency)
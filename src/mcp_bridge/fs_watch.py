@@ -0,0 +1,256 @@
+"""Directory watches shared between concurrent ``file_watch`` calls.
+
+On Linux, ``Inotify`` talks to the kernel through libc via ctypes. One
+inotify descriptor serves the whole process and is read from the event
+loop, so waiting costs neither a thread nor a subprocess. Where inotify is
+unavailable (other platforms, or ``fs.inotify.max_user_instances``
+exhausted), each watched directory is polled by comparing ``scandir``
+snapshots every ``poll_interval`` seconds instead.
+
+``WatchHub`` keeps one watch per directory, however many callers are
+waiting on it. Every subscriber gets its own queue of ``FsEvent`` objects,
+and the watch is removed when the last subscriber leaves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import os
+import struct
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from mcp_bridge.audit import get_logger
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+EVENT_KINDS = ("create", "modify", "delete")
+GONE = "gone"  # the watched directory itself was deleted or moved
+
+
+@dataclass(frozen=True, slots=True)
+class FsEvent:
+    kind: str  # create | modify | delete | gone
+    name: str
+    is_dir: bool = False
+
+
+def _kind(mask: int) -> str | None:
+    if mask & (IN_CREATE | IN_MOVED_TO):
+        return "create"
+    if mask & (IN_MODIFY | IN_CLOSE_WRITE):
+        return "modify"
+    if mask & (IN_DELETE | IN_MOVED_FROM):
+        return "delete"
+    if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+        return GONE
+    return None
+
+
+class Inotify:
+    """Minimal non-blocking inotify binding."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+
+    def add_watch(self, path: Path, mask: int = WATCH_MASK) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)  # fails harmlessly if already gone
+
+    def read(self) -> list[tuple[int, int, str]]:
+        """Pending (wd, mask, name) events; empty if there are none."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def load_inotify() -> Inotify | None:
+    try:
+        return Inotify()
+    except (OSError, AttributeError) as e:
+        get_logger("fs_watch").info("inotify_unavailable", error=str(e))
+        return None
+
+
+def _snapshot(directory: Path) -> dict[str, tuple[int, int, bool]]:
+    entries = {}
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            entries[entry.name] = (st.st_mtime_ns, st.st_size, entry.is_dir())
+    return entries
+
+
+@dataclass
+class _Watch:
+    directory: Path
+    subscribers: set[asyncio.Queue[FsEvent]] = field(default_factory=set)
+    wd: int | None = None
+    poller: asyncio.Task[None] | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self.wd is not None or (self.poller is not None and not self.poller.done())
+
+    def publish(self, event: FsEvent) -> None:
+        for queue in self.subscribers:
+            queue.put_nowait(event)
+
+
+class WatchHub:
+    """One watch per directory, fanned out to every subscriber."""
+
+    def __init__(self, use_inotify: bool = True, poll_interval: float = 0.5) -> None:
+        self._use_inotify = use_inotify
+        self._inotify: Inotify | None = None
+        self._poll_interval = poll_interval
+        self._watches: dict[Path, _Watch] = {}
+        self._by_wd: dict[int, _Watch] = {}
+
+    def watched(self) -> dict[Path, int]:
+        """Directory -> number of subscribers."""
+        return {d: len(w.subscribers) for d, w in self._watches.items()}
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _start(self, directory: Path) -> _Watch:
+        watch = _Watch(directory)
+        if self._use_inotify and self._inotify is None:
+            self._inotify = load_inotify()
+            if self._inotify is None:
+                self._use_inotify = False
+            else:
+                asyncio.get_running_loop().add_reader(self._inotify.fd, self._dispatch)
+        if self._inotify is not None:
+            try:
+                watch.wd = self._inotify.add_watch(directory)
+            except OSError as e:
+                # e.g. fs.inotify.max_user_watches reached: poll this one
+                get_logger("fs_watch").warning(
+                    "inotify_watch_failed", path=str(directory), error=str(e)
+                )
+            else:
+                self._by_wd[watch.wd] = watch
+                return watch
+        watch.poller = asyncio.create_task(self._poll(watch, _snapshot(directory)))
+        return watch
+
+    def _stop(self, watch: _Watch) -> None:
+        if watch.poller is not None:
+            watch.poller.cancel()
+        if watch.wd is not None and self._inotify is not None:
+            self._by_wd.pop(watch.wd, None)
+            self._inotify.rm_watch(watch.wd)
+
+    def _dispatch(self) -> None:
+        assert self._inotify is not None
+        for wd, mask, name in self._inotify.read():
+            watch = self._by_wd.get(wd)
+            kind = _kind(mask)
+            if watch is None or kind is None:
+                continue
+            if kind == GONE:
+                self._by_wd.pop(wd, None)
+                watch.wd = None
+            watch.publish(FsEvent(kind, name, bool(mask & IN_ISDIR)))
+
+    async def _poll(self, watch: _Watch, before: dict[str, tuple[int, int, bool]]) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                after = _snapshot(watch.directory)
+            except (FileNotFoundError, NotADirectoryError):
+                watch.publish(FsEvent(GONE, ""))
+                return
+            for name, state in after.items():
+                old = before.get(name)
+                if old is None:
+                    watch.publish(FsEvent("create", name, state[2]))
+                elif old != state:
+                    watch.publish(FsEvent("modify", name, state[2]))
+            for name in before.keys() - after.keys():
+                watch.publish(FsEvent("delete", name, before[name][2]))
+            before = after
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, directory: Path) -> AsyncIterator[asyncio.Queue[FsEvent]]:
+        """Receive events for ``directory`` until the block exits.
+
+        Raises OSError if the directory cannot be watched.
+        """
+        watch = self._watches.get(directory)
+        if watch is None or not watch.alive:
+            # A watch whose directory went away is replaced, not reused
+            watch = self._watches[directory] = self._start(directory)
+        queue: asyncio.Queue[FsEvent] = asyncio.Queue()
+        watch.subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            watch.subscribers.discard(queue)
+            if not watch.subscribers and self._watches.get(directory) is watch:
+                del self._watches[directory]
+                self._stop(watch)
+
+    def close(self) -> None:
+        for watch in self._watches.values():
+            self._stop(watch)
+        self._watches.clear()
+        if self._inotify is not None:
+            with contextlib.suppress(RuntimeError):
+                asyncio.get_running_loop().remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
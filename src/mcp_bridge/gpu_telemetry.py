@@ -0,0 +1,192 @@
+"""GPU telemetry through NVML with a background sampler.
+
+``NvmlBackend`` talks to the driver through the optional ``pynvml`` module
+(``pip install claude-mcp-bridge[gpu]``). Any object with the same
+``sample``/``processes``/``close`` methods can stand in for it, which is how
+the sampler is tested without a GPU. When NVML is unavailable, or its
+reads start failing, the ``gpu_status`` tool falls back to parsing
+``nvidia-smi`` output. Samples are stamped with ``time.monotonic()`` so the
+trailing windows survive wall-clock steps.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+from mcp_bridge.audit import get_logger
+from mcp_bridge.ring_buffer import FieldStats, TimeSeriesRing
+
+GPU_FIELDS = ("util_gpu", "util_mem", "mem_used_mb", "temperature_c")
+
+
+@dataclass(frozen=True, slots=True)
+class GpuSample:
+    index: int
+    name: str
+    bus_id: str
+    mem_total_mb: float
+    mem_used_mb: float
+    mem_free_mb: float
+    temperature_c: float
+    util_gpu: float
+    util_mem: float
+
+
+@dataclass(frozen=True, slots=True)
+class GpuProcess:
+    pid: int
+    name: str
+    used_mb: float | None
+
+
+class GpuBackend(Protocol):
+    def sample(self) -> list[GpuSample]:
+        ...
+
+    def processes(self) -> list[GpuProcess]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def _process_name(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return "?"
+
+
+class NvmlBackend:
+    """Reads GPU state directly from the NVIDIA driver via pynvml."""
+
+    def __init__(self) -> None:
+        import pynvml
+
+        pynvml.nvmlInit()
+        self._nvml = pynvml
+        self._handles = [
+            pynvml.nvmlDeviceGetHandleByIndex(i)
+            for i in range(pynvml.nvmlDeviceGetCount())
+        ]
+        self._static = [
+            (self._text(pynvml.nvmlDeviceGetName(h)),
+             self._text(pynvml.nvmlDeviceGetPciInfo(h).busId))
+            for h in self._handles
+        ]
+
+    @staticmethod
+    def _text(value: str | bytes) -> str:
+        # Older pynvml releases return bytes
+        return value.decode() if isinstance(value, bytes) else value
+
+    def sample(self) -> list[GpuSample]:
+        nvml = self._nvml
+        samples: list[GpuSample] = []
+        for i, handle in enumerate(self._handles):
+            mem = nvml.nvmlDeviceGetMemoryInfo(handle)
+            util = nvml.nvmlDeviceGetUtilizationRates(handle)
+            temp = nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU)
+            name, bus_id = self._static[i]
+            samples.append(GpuSample(
+                index=i,
+                name=name,
+                bus_id=bus_id,
+                mem_total_mb=mem.total / 2**20,
+                mem_used_mb=mem.used / 2**20,
+                mem_free_mb=mem.free / 2**20,
+                temperature_c=float(temp),
+                util_gpu=float(util.gpu),
+                util_mem=float(util.memory),
+            ))
+        return samples
+
+    def processes(self) -> list[GpuProcess]:
+        procs: list[GpuProcess] = []
+        for handle in self._handles:
+            for p in self._nvml.nvmlDeviceGetComputeRunningProcesses(handle):
+                used = p.usedGpuMemory
+                procs.append(GpuProcess(
+                    pid=p.pid,
+                    name=_process_name(p.pid),
+                    used_mb=used / 2**20 if used is not None else None,
+                ))
+        return procs
+
+    def close(self) -> None:
+        self._nvml.nvmlShutdown()
+
+
+def load_nvml_backend() -> NvmlBackend | None:
+    """Return an NVML backend, or None if pynvml or the driver is missing."""
+    try:
+        return NvmlBackend()
+    except Exception as exc:  # ImportError or pynvml.NVMLError
+        get_logger("gpu_telemetry").info("nvml_unavailable", error=str(exc))
+        return None
+
+
+class GpuSampler:
+    """Samples every GPU at a fixed interval into per-device ring buffers."""
+
+    def __init__(
+        self, backend: GpuBackend, interval: float = 5.0, capacity: int = 720
+    ) -> None:
+        self.backend = backend
+        self.interval = interval
+        self._capacity = capacity
+        self._history: dict[int, TimeSeriesRing] = {}
+        # False while NVML reads fail (driver reset, GPU lost); gpu_status
+        # then falls back to nvidia-smi until a sample succeeds again
+        self.available = True
+
+    def record(self, samples: list[GpuSample], ts: float | None = None) -> None:
+        ts = time.monotonic() if ts is None else ts
+        for s in samples:
+            ring = self._history.get(s.index)
+            if ring is None:
+                ring = self._history[s.index] = TimeSeriesRing(self._capacity, GPU_FIELDS)
+            ring.append(ts, {f: getattr(s, f) for f in GPU_FIELDS})
+
+    async def sample_now(self) -> list[GpuSample]:
+        samples = await self.read_now()
+        self.record(samples)
+        return samples
+
+    async def read_now(self) -> list[GpuSample]:
+        """A fresh reading that is not recorded, so the rings keep their interval."""
+        return await asyncio.to_thread(self.backend.sample)
+
+    async def run(self) -> None:
+        """Background task: sample until cancelled."""
+        logger = get_logger("gpu_telemetry")
+        while True:
+            try:
+                await self.sample_now()
+            except Exception as exc:  # pynvml.NVMLError
+                if self.available:
+                    logger.warning("gpu_sample_failed", error=str(exc))
+                self.available = False
+            else:
+                if not self.available:
+                    logger.info("gpu_sample_recovered")
+                self.available = True
+            await asyncio.sleep(self.interval)
+
+    def window_stats(
+        self, index: int, window_seconds: float, now: float | None = None
+    ) -> tuple[int, dict[str, FieldStats]]:
+        """Sample count and min/avg/max per field over the trailing window."""
+        ring = self._history.get(index)
+        if ring is None:
+            return 0, {}
+        now = time.monotonic() if now is None else now
+        since = now - window_seconds
+        return ring.count(since), ring.stats(since)
+
+    def close(self) -> None:
+        self.backend.close()
@@ -0,0 +1,234 @@
+"""Background host metrics sampler with multi-resolution history.
+
+Metrics are read straight from ``/proc`` and ``statvfs`` (no subprocesses)
+every ``interval`` seconds into a fine ring buffer, and averaged into
+1-minute and 15-minute rings as each bucket closes. Top processes are
+scanned once per minute, with CPU% computed from the jiffies consumed
+since the previous scan. Timestamps come from ``time.monotonic()`` so a
+wall-clock step cannot reorder the rings; ``wall_clock`` converts them for
+display.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from mcp_bridge.audit import get_logger
+from mcp_bridge.ring_buffer import TimeSeriesRing
+
+HOST_FIELDS = (
+    "load1",
+    "load5",
+    "load15",
+    "mem_used_mb",
+    "mem_available_mb",
+    "swap_used_mb",
+    "disk_used_pct",
+)
+
+# Raw samples cover this many seconds, whatever the sampling interval
+_RAW_WINDOW_SECONDS = 900  # 15 minutes
+# Averaged rings: (name, bucket seconds, capacity)
+ROLLUPS = (
+    ("1m", 60, 1440),     # 24 hours
+    ("15m", 900, 672),    # 7 days
+)
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+@dataclass(frozen=True, slots=True)
+class ProcessUsage:
+    pid: int
+    name: str
+    cpu_percent: float
+    rss_mb: float
+
+
+def resolutions(interval: float) -> tuple[tuple[str, float, int], ...]:
+    """(name, seconds, capacity) per ring, finest first, for ``interval``."""
+    raw = (f"{interval:g}s", interval, max(1, math.ceil(_RAW_WINDOW_SECONDS / interval)))
+    return (raw, *(r for r in ROLLUPS if r[1] > interval))
+
+
+def wall_clock(ts: float) -> float:
+    """Wall-clock time for a ``time.monotonic()`` timestamp, for display."""
+    return ts + time.time() - time.monotonic()
+
+
+def read_host_sample(disk_path: str = "/") -> dict[str, float]:
+    with open("/proc/loadavg") as f:
+        load1, load5, load15 = (float(x) for x in f.read().split()[:3])
+
+    meminfo: dict[str, int] = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            meminfo[key] = int(rest.split()[0])  # kB
+    total = meminfo.get("MemTotal", 0)
+    available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+    swap_used = meminfo.get("SwapTotal", 0) - meminfo.get("SwapFree", 0)
+
+    st = os.statvfs(disk_path)
+    disk_total = st.f_blocks * st.f_frsize
+    disk_free = st.f_bavail * st.f_frsize
+    disk_used_pct = 100.0 * (1 - disk_free / disk_total) if disk_total else 0.0
+
+    return {
+        "load1": load1,
+        "load5": load5,
+        "load15": load15,
+        "mem_used_mb": (total - available) / 1024,
+        "mem_available_mb": available / 1024,
+        "swap_used_mb": swap_used / 1024,
+        "disk_used_pct": disk_used_pct,
+    }
+
+
+def _read_process_times() -> dict[int, tuple[str, int, float]]:
+    """pid -> (name, utime+stime jiffies, rss MB) for every visible process."""
+    page_mb = os.sysconf("SC_PAGE_SIZE") / 2**20
+    result: dict[int, tuple[str, int, float]] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat") as f:
+                raw = f.read()
+        except OSError:
+            continue  # process exited
+        # comm may contain spaces/parens; fields resume after the last ')'
+        name = raw[raw.index("(") + 1 : raw.rindex(")")]
+        fields = raw[raw.rindex(")") + 2 :].split()
+        result[int(entry.name)] = (
+            name,
+            int(fields[11]) + int(fields[12]),
+            int(fields[21]) * page_mb,
+        )
+    return result
+
+
+class _Bucket:
+    """Running mean of samples that fall into one coarse time bucket."""
+
+    def __init__(self) -> None:
+        self.start: float | None = None
+        self.count = 0
+        self.sums: dict[str, float] = {}
+
+    def add(self, values: dict[str, float]) -> None:
+        self.count += 1
+        for k, v in values.items():
+            self.sums[k] = self.sums.get(k, 0.0) + v
+
+    def mean(self) -> dict[str, float]:
+        return {k: v / self.count for k, v in self.sums.items()}
+
+
+class HostSampler:
+    """Samples host metrics into raw (every ``interval``) / 1m / 15m ring buffers."""
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        process_interval: float = 60.0,
+        top_n: int = 5,
+        disk_path: str = "/",
+    ) -> None:
+        self.interval = interval
+        self.process_interval = process_interval
+        self.top_n = top_n
+        self.disk_path = disk_path
+        self.resolutions = resolutions(interval)
+        self.rings = {
+            name: TimeSeriesRing(capacity, HOST_FIELDS)
+            for name, _, capacity in self.resolutions
+        }
+        self._buckets = {name: _Bucket() for name, _, _ in self.resolutions[1:]}
+        self.top_processes: deque[tuple[float, list[ProcessUsage]]] = deque(maxlen=60)
+        self._prev_proc: tuple[float, dict[int, tuple[str, int, float]]] | None = None
+
+    def record(self, ts: float, values: dict[str, float]) -> None:
+        """Append a raw sample and roll closed buckets into coarser rings."""
+        name, _, _ = self.resolutions[0]
+        self.rings[name].append(ts, values)
+        in_ts, pending = ts, values
+        for name, seconds, _ in self.resolutions[1:]:
+            bucket = self._buckets[name]
+            start = in_ts - in_ts % seconds
+            closed: tuple[float, dict[str, float]] | None = None
+            if bucket.count and start != bucket.start:
+                closed = (bucket.start or start, bucket.mean())
+                self.rings[name].append(*closed)
+                bucket = self._buckets[name] = _Bucket()
+            bucket.start = start
+            bucket.add(pending)
+            if closed is None:
+                break
+            # The closed bucket feeds the next coarser resolution
+            in_ts, pending = closed
+
+    def scan_processes(self, now: float) -> None:
+        current = _read_process_times()
+        if self._prev_proc is not None:
+            prev_ts, prev = self._prev_proc
+            elapsed = max(now - prev_ts, 1e-6)
+            usage = [
+                ProcessUsage(
+                    pid=pid,
+                    name=name,
+                    cpu_percent=100.0 * (ticks - prev[pid][1]) / _CLK_TCK / elapsed,
+                    rss_mb=rss,
+                )
+                for pid, (name, ticks, rss) in current.items()
+                if pid in prev
+            ]
+            usage.sort(key=lambda p: p.cpu_percent, reverse=True)
+            self.top_processes.append((now, usage[: self.top_n]))
+        self._prev_proc = (now, current)
+
+    async def run(self) -> None:
+        """Background task: sample until cancelled."""
+        logger = get_logger("host_metrics")
+        next_scan = 0.0
+        while True:
+            now = time.monotonic()
+            try:
+                self.record(now, read_host_sample(self.disk_path))
+                if now >= next_scan:
+                    await asyncio.to_thread(self.scan_processes, now)
+                    next_scan = now + self.process_interval
+            except Exception as exc:
+                logger.warning("host_sample_failed", error=str(exc))
+            await asyncio.sleep(self.interval)
+
+    def history(
+        self, window_seconds: float, points: int, now: float | None = None
+    ) -> tuple[str, list[float], dict[str, list[float]]]:
+        """Series covering the window at the finest resolution that spans it,
+        averaged down to at most ``points`` entries.
+        """
+        now = time.monotonic() if now is None else now
+        since = now - window_seconds
+        for name, seconds, capacity in self.resolutions:
+            if seconds * capacity >= window_seconds or name == self.resolutions[-1][0]:
+                break
+        ts, series = self.rings[name].series(since)
+        if points <= 0 or len(ts) <= points:
+            return name, ts, series
+
+        step = len(ts) / points
+        out_ts: list[float] = []
+        out: dict[str, list[float]] = {f: [] for f in series}
+        for p in range(points):
+            lo, hi = int(p * step), max(int((p + 1) * step), int(p * step) + 1)
+            out_ts.append(ts[lo])
+            for f, values in series.items():
+                chunk = values[lo:hi]
+                out[f].append(sum(chunk) / len(chunk))
+        return name, out_ts, out
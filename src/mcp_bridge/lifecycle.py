@@ -0,0 +1,181 @@
+"""Graceful shutdown: track tool subprocesses and drain them before exit.
+
+Long-running children (``claude_execute``, ``run_command``) are started in
+their own session so that each one leads a process group. On drain the
+server stops accepting new MCP requests, waits up to a deadline for the
+tracked children to finish, then terminates and finally kills their whole
+process groups so no grandchildren are orphaned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import signal
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import TYPE_CHECKING, Any
+
+from starlette.responses import JSONResponse
+
+from mcp_bridge.audit import get_logger
+
+if TYPE_CHECKING:
+    from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ProcessTracker:
+    """Registry of in-flight tool subprocesses plus the server's drain state."""
+
+    def __init__(self) -> None:
+        # proc -> (task that started it, monotonic start time)
+        self._procs: dict[
+            asyncio.subprocess.Process, tuple[asyncio.Task[Any] | None, float]
+        ] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._drain_task: asyncio.Task[None] | None = None
+        self.draining = False
+
+    def __len__(self) -> int:
+        return len(self._procs)
+
+    @contextlib.contextmanager
+    def track(self, proc: asyncio.subprocess.Process) -> Iterator[None]:
+        self._procs[proc] = (asyncio.current_task(), time.monotonic())
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._procs.pop(proc, None)
+            if not self._procs:
+                self._idle.set()
+
+    def owners(self) -> dict[asyncio.Task[Any], list[tuple[int, float]]]:
+        """Task -> [(pid, seconds running)] of the subprocesses it awaits."""
+        now = time.monotonic()
+        owned: dict[asyncio.Task[Any], list[tuple[int, float]]] = {}
+        for proc, (task, started) in self._procs.items():
+            if task is not None:
+                owned.setdefault(task, []).append((proc.pid, now - started))
+        return owned
+
+    @staticmethod
+    def signal_group(proc: asyncio.subprocess.Process, sig: int) -> None:
+        """Send ``sig`` to the process group led by ``proc``."""
+        if proc.returncode is not None:
+            return
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.killpg(proc.pid, sig)
+
+    def kill(self, proc: asyncio.subprocess.Process) -> None:
+        self.signal_group(proc, signal.SIGKILL)
+
+    async def _wait_idle(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def drain(self, timeout: float, grace: float = 5.0) -> None:
+        """Refuse new work, wait for children, then kill what is left."""
+        logger = get_logger("lifecycle")
+        self.draining = True
+        logger.info("drain_started", in_flight=len(self), timeout=timeout)
+        start = time.monotonic()
+
+        if not await self._wait_idle(timeout):
+            logger.warning("drain_deadline_reached", remaining=len(self))
+            for proc in list(self._procs):
+                self.signal_group(proc, signal.SIGTERM)
+            if not await self._wait_idle(grace):
+                for proc in list(self._procs):
+                    self.kill(proc)
+
+        logger.info("drain_completed", elapsed_seconds=round(time.monotonic() - start, 2))
+
+    def start_drain(self, timeout: float) -> asyncio.Task[None]:
+        """Start draining in the background; repeated calls share one task."""
+        self.draining = True
+        if self._drain_task is None:
+            self._drain_task = asyncio.create_task(self.drain(timeout))
+        return self._drain_task
+
+
+class DrainMiddleware:
+    """Reject new MCP requests with 503 once the server is draining."""
+
+    def __init__(self, app: ASGIApp, path: str, tracker: ProcessTracker) -> None:
+        self.app = app
+        self.path = path
+        self.tracker = tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            self.tracker.draining
+            and scope["type"] == "http"
+            and scope["path"].startswith(self.path)
+        ):
+            response = JSONResponse(
+                {"error": "Server is draining; not accepting new tool calls"},
+                status_code=503,
+                headers={"Retry-After": "5"},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def install_sigterm_drain(
+    tracker: ProcessTracker, timeout: float
+) -> Callable[[], None]:
+    """Drain on SIGTERM before handing the signal to the previous handler.
+
+    uvicorn installs its own SIGTERM handler to begin shutdown; this wraps
+    it so that running tool calls get up to ``timeout`` seconds first.
+    Only possible from the main thread (not e.g. under a test client).
+    Returns a callable that restores the previous handler.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+    loop = asyncio.get_running_loop()
+    previous = signal.getsignal(signal.SIGTERM)
+    pending: set[asyncio.Future[None]] = set()
+
+    async def drain_then_exit(frame: Any) -> None:
+        await tracker.start_drain(timeout)
+        if callable(previous):
+            previous(signal.SIGTERM, frame)
+        else:
+            signal.raise_signal(signal.SIGTERM)
+
+    def handler(signum: int, frame: Any) -> None:
+        # Restore first so a second SIGTERM skips the drain and exits now
+        signal.signal(signal.SIGTERM, previous)
+        loop.call_soon_threadsafe(
+            lambda: pending.add(asyncio.ensure_future(drain_then_exit(frame)))
+        )
+
+    signal.signal(signal.SIGTERM, handler)
+
+    def restore() -> None:
+        if signal.getsignal(signal.SIGTERM) is handler:
+            signal.signal(signal.SIGTERM, previous)
+
+    return restore
+
+
+@contextlib.asynccontextmanager
+async def graceful_shutdown(
+    tracker: ProcessTracker, timeout: float
+) -> AsyncIterator[None]:
+    """Lifespan hook: drain on SIGTERM, and always drain before exiting."""
+    restore = install_sigterm_drain(tracker, timeout)
+    try:
+        yield
+    finally:
+        restore()
+        await tracker.start_drain(timeout)
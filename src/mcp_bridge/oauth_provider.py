@@ -1,20 +1,32 @@
-"""In-memory OAuth 2.0 provider for single-user MCP server.
+"""OAuth 2.0 provider for single-user MCP server.
 
 Implements the MCP SDK's OAuthAuthorizationServerProvider protocol with:
-- Dynamic Client Registration (required by claude.ai)
+- Dynamic Client Registration (required by claude.ai), capped in count
 - Auto-approval (personal server, no consent screen needed)
-- In-memory token storage (tokens survive until server restart)
+- In-memory index with write-through to a pluggable TokenStore, so state
+  survives restarts when a persistent store is configured
+- Codes and tokens kept only as SHA-256 digests, with a small LRU cache of
+  recently validated access tokens for the per-request auth check
+- Shared mode for multi-worker deployments, where lookups go to the store
+  so every worker sees registrations and revocations made by the others;
+  store calls then run in a worker thread, since a sibling's write lock
+  can hold them for up to the busy timeout
+- Expiry-ordered sweeping of codes and tokens (refresh tokens expire too)
 - PKCE support (required by MCP auth spec)
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import secrets
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, TypeVar
 from urllib.parse import urlencode
 
-from pydantic import AnyUrl
+from pydantic import AnyUrl, BaseModel
 
 from mcp.server.auth.provider import (
     AccessToken,
@@ -23,32 +35,210 @@ from mcp.server.auth.provider import (
     AuthorizeError,
     OAuthAuthorizationServerProvider,
     RefreshToken,
+    RegistrationError,
     construct_redirect_uri,
 )
 from mcp.shared.auth import OAuthClientInformationFull, OAuthToken
 
+from mcp_bridge.token_store import (
+    ACCESS_TOKEN,
+    AUTH_CODE,
+    CLIENT,
+    REFRESH_TOKEN,
+    ExpiryHeap,
+    MemoryTokenStore,
+    TokenStore,
+)
+
+ACCESS_TOKEN_TTL = 3600 * 24  # 24 hours
+AUTH_CODE_TTL = 300  # 5 minutes
+DEFAULT_TOKEN_CACHE_TTL = 30.0  # single-worker mode
+
+_T = TypeVar("_T")
+
+_MODELS: dict[str, type[BaseModel]] = {
+    CLIENT: OAuthClientInformationFull,
+    AUTH_CODE: AuthorizationCode,
+    ACCESS_TOKEN: AccessToken,
+    REFRESH_TOKEN: RefreshToken,
+}
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 hex digest used as the at-rest key for codes and tokens."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
 
 class InMemoryOAuthProvider:
-    """Single-user OAuth provider with auto-approval and in-memory storage."""
+    """Single-user OAuth provider with auto-approval and an in-memory index."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        store: TokenStore | None = None,
+        max_clients: int = 100,
+        refresh_token_ttl: int = 3600 * 24 * 30,
+        cache_size: int = 256,
+        cache_ttl: float | None = None,
+        shared: bool = False,
+    ) -> None:
+        self._store: TokenStore = store or MemoryTokenStore()
+        self._shared = shared
+        self._max_clients = max_clients
+        self._refresh_token_ttl = refresh_token_ttl
+        self._cache_size = cache_size
+        # A cached token stays valid on this worker after another worker
+        # revokes it, so shared mode does not cache unless asked to
+        if cache_ttl is None:
+            cache_ttl = 0.0 if shared else DEFAULT_TOKEN_CACHE_TTL
+        self._cache_ttl = cache_ttl
+        # digest -> (token, monotonic deadline until which it is trusted)
+        self._validated: OrderedDict[str, tuple[AccessToken, float]] = OrderedDict()
+        self._expiry = ExpiryHeap()
         self._clients: dict[str, OAuthClientInformationFull] = {}
         self._auth_codes: dict[str, AuthorizationCode] = {}
         self._access_tokens: dict[str, AccessToken] = {}
         self._refresh_tokens: dict[str, RefreshToken] = {}
+        self._restore()
+
+    # -- persistence helpers -------------------------------------------------
+
+    def _tables(self) -> dict[str, dict]:
+        return {
+            CLIENT: self._clients,
+            AUTH_CODE: self._auth_codes,
+            ACCESS_TOKEN: self._access_tokens,
+            REFRESH_TOKEN: self._refresh_tokens,
+        }
+
+    async def _store_call(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """Run a store method, off the event loop when the store is shared."""
+        if self._shared:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _load_all(self) -> dict[str, list[tuple[str, str]]]:
+        return {kind: self._store.load(kind) for kind in _MODELS}
+
+    def _restore(self, rows: dict[str, list[tuple[str, str]]] | None = None) -> None:
+        if rows is None:
+            rows = self._load_all()
+        tables = self._tables()
+        self._expiry.clear()
+        for kind, model in _MODELS.items():
+            tables[kind].clear()
+            for key, data in rows[kind]:
+                record = model.model_validate_json(data)
+                tables[kind][key] = record
+                expires_at = getattr(record, "expires_at", None)
+                if expires_at is not None:
+                    self._expiry.push(expires_at, kind, key)
+
+    async def _get(self, kind: str, key: str) -> Any:
+        """Look up a record, reading through to the store in shared mode."""
+        table = self._tables()[kind]
+        if not self._shared:
+            return table.get(key)
+        data = await self._store_call(self._store.get, kind, key)
+        if data is None:
+            table.pop(key, None)
+            return None
+        record = _MODELS[kind].model_validate_json(data)
+        table[key] = record
+        return record
+
+    async def _put(self, kind: str, key: str, record: BaseModel) -> None:
+        self._tables()[kind][key] = record
+        expires_at = getattr(record, "expires_at", None)
+        if expires_at is not None:
+            self._expiry.push(expires_at, kind, key)
+        await self._store_call(
+            self._store.put, kind, key, record.model_dump_json(), expires_at
+        )
+
+    async def _drop(self, kind: str, key: str) -> None:
+        if kind == ACCESS_TOKEN:
+            self._validated.pop(key, None)
+        removed = self._tables()[kind].pop(key, None) is not None
+        if removed or self._shared:
+            await self._store_call(self._store.delete, kind, key)
+
+    async def _evict_idle_client(self) -> bool:
+        """Drop the oldest registered client that holds no live tokens."""
+        active = {t.client_id for t in self._access_tokens.values()}
+        active.update(t.client_id for t in self._refresh_tokens.values())
+        idle = [c for c in self._clients.values() if c.client_id not in active]
+        if not idle:
+            return False
+        oldest = min(idle, key=lambda c: c.client_id_issued_at or 0)
+        for key, code in list(self._auth_codes.items()):
+            if code.client_id == oldest.client_id:
+                await self._drop(AUTH_CODE, key)
+        await self._drop(CLIENT, oldest.client_id)  # type: ignore[arg-type]
+        return True
+
+    def sweep(self, now: float | None = None) -> int:
+        """Remove every code and token whose expiry has passed."""
+        now = time.time() if now is None else now
+        removed = self._sweep_index(now)
+        self._store.purge_expired(now)
+        return removed
+
+    def _sweep_index(self, now: float) -> int:
+        tables = self._tables()
+        removed = 0
+        for expires_at, kind, key in self._expiry.pop_expired(now):
+            record = tables[kind].get(key)
+            # Skip stale heap entries for records already removed or replaced
+            if record is not None and record.expires_at == expires_at:
+                del tables[kind][key]
+                self._validated.pop(key, None)
+                removed += 1
+        return removed
+
+    async def run_sweeper(self, interval: float) -> None:
+        """Background task: sweep expired entries every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+            self._sweep_index(now)
+            await self._store_call(self._store.purge_expired, now)
+
+    def close(self) -> None:
+        self._store.close()
+
+    # -- OAuthAuthorizationServerProvider ------------------------------------
 
     async def get_client(self, client_id: str) -> OAuthClientInformationFull | None:
-        return self._clients.get(client_id)
+        return await self._get(CLIENT, client_id)
 
     async def register_client(
         self, client_info: OAuthClientInformationFull
     ) -> None:
+        if self._shared:
+            # Other workers may have registered or evicted clients since startup
+            rows = await self._store_call(self._store.load, CLIENT)
+            self._clients.clear()
+            for key, data in rows:
+                self._clients[key] = OAuthClientInformationFull.model_validate_json(data)
+            if len(self._clients) >= self._max_clients:
+                # Eviction needs every worker's live tokens
+                self._restore(await self._store_call(self._load_all))
+        if (
+            len(self._clients) >= self._max_clients
+            and not await self._evict_idle_client()
+        ):
+            raise RegistrationError(
+                error="invalid_client_metadata",
+                error_description=(
+                    f"Client registration limit reached ({self._max_clients})"
+                ),
+            )
         client_id = secrets.token_urlsafe(24)
         client_secret = secrets.token_urlsafe(48)
         client_info.client_id = client_id
         client_info.client_secret = client_secret
         client_info.client_id_issued_at = int(time.time())
-        self._clients[client_id] = client_info
+        await self._put(CLIENT, client_id, client_info)
 
     async def authorize(
         self,
@@ -58,16 +248,16 @@ class InMemoryOAuthProvider:
         """Auto-approve and redirect back with authorization code."""
         code = secrets.token_urlsafe(32)
         auth_code = AuthorizationCode(
-            code=code,
+            code=hash_token(code),
             scopes=params.scopes or [],
-            expires_at=time.time() + 300,  # 5 min expiry
+            expires_at=time.time() + AUTH_CODE_TTL,
             client_id=client.client_id,
             code_challenge=params.code_challenge,
             redirect_uri=params.redirect_uri,
             redirect_uri_provided_explicitly=params.redirect_uri_provided_explicitly,
             resource=params.resource,
         )
-        self._auth_codes[code] = auth_code
+        await self._put(AUTH_CODE, auth_code.code, auth_code)
 
         return construct_redirect_uri(
             str(params.redirect_uri),
@@ -80,57 +270,73 @@ class InMemoryOAuthProvider:
         client: OAuthClientInformationFull,
         authorization_code: str,
     ) -> AuthorizationCode | None:
-        code = self._auth_codes.get(authorization_code)
+        code = await self._get(AUTH_CODE, hash_token(authorization_code))
         if code is None:
             return None
         if code.client_id != client.client_id:
             return None
         if time.time() > code.expires_at:
-            del self._auth_codes[authorization_code]
+            await self._drop(AUTH_CODE, code.code)
             return None
         return code
 
-    async def exchange_authorization_code(
+    async def _issue_tokens(
         self,
         client: OAuthClientInformationFull,
-        authorization_code: AuthorizationCode,
+        scopes: list[str],
+        resource: str | None = None,
     ) -> OAuthToken:
-        # Remove used code (single-use)
-        self._auth_codes.pop(authorization_code.code, None)
-
         access = secrets.token_urlsafe(48)
         refresh = secrets.token_urlsafe(48)
-        expires_in = 3600 * 24  # 24 hours
+        access_digest = hash_token(access)
+        refresh_digest = hash_token(refresh)
+        now = int(time.time())
 
-        self._access_tokens[access] = AccessToken(
-            token=access,
+        # Only digests are stored; the raw tokens go back to the client once
+        await self._put(ACCESS_TOKEN, access_digest, AccessToken(
+            token=access_digest,
             client_id=client.client_id,
-            scopes=authorization_code.scopes,
-            expires_at=int(time.time()) + expires_in,
-            resource=authorization_code.resource,
-        )
-        self._refresh_tokens[refresh] = RefreshToken(
-            token=refresh,
+            scopes=scopes,
+            expires_at=now + ACCESS_TOKEN_TTL,
+            resource=resource,
+        ))
+        await self._put(REFRESH_TOKEN, refresh_digest, RefreshToken(
+            token=refresh_digest,
             client_id=client.client_id,
-            scopes=authorization_code.scopes,
-        )
+            scopes=scopes,
+            expires_at=now + self._refresh_token_ttl,
+        ))
 
         return OAuthToken(
             access_token=access,
             token_type="Bearer",
-            expires_in=expires_in,
+            expires_in=ACCESS_TOKEN_TTL,
             refresh_token=refresh,
         )
 
+    async def exchange_authorization_code(
+        self,
+        client: OAuthClientInformationFull,
+        authorization_code: AuthorizationCode,
+    ) -> OAuthToken:
+        # Remove used code (single-use)
+        await self._drop(AUTH_CODE, authorization_code.code)
+        return await self._issue_tokens(
+            client, authorization_code.scopes, authorization_code.resource
+        )
+
     async def load_refresh_token(
         self,
         client: OAuthClientInformationFull,
         refresh_token: str,
     ) -> RefreshToken | None:
-        token = self._refresh_tokens.get(refresh_token)
-        if token and token.client_id == client.client_id:
-            return token
-        return None
+        token = await self._get(REFRESH_TOKEN, hash_token(refresh_token))
+        if token is None or token.client_id != client.client_id:
+            return None
+        if token.expires_at and time.time() > token.expires_at:
+            await self._drop(REFRESH_TOKEN, token.token)
+            return None
+        return token
 
     async def exchange_refresh_token(
         self,
@@ -139,38 +345,35 @@ class InMemoryOAuthProvider:
         scopes: list[str],
     ) -> OAuthToken:
         # Revoke old refresh token
-        self._refresh_tokens.pop(refresh_token.token, None)
-
-        access = secrets.token_urlsafe(48)
-        new_refresh = secrets.token_urlsafe(48)
-        expires_in = 3600 * 24
+        await self._drop(REFRESH_TOKEN, refresh_token.token)
+        return await self._issue_tokens(client, scopes or refresh_token.scopes)
 
-        self._access_tokens[access] = AccessToken(
-            token=access,
-            client_id=client.client_id,
-            scopes=scopes or refresh_token.scopes,
-            expires_at=int(time.time()) + expires_in,
-        )
-        self._refresh_tokens[new_refresh] = RefreshToken(
-            token=new_refresh,
-            client_id=client.client_id,
-            scopes=scopes or refresh_token.scopes,
-        )
+    async def load_access_token(self, token: str) -> AccessToken | None:
+        digest = hash_token(token)
+        now = time.monotonic()
 
-        return OAuthToken(
-            access_token=access,
-            token_type="Bearer",
-            expires_in=expires_in,
-            refresh_token=new_refresh,
-        )
+        cached = self._validated.get(digest)
+        if cached is not None:
+            at, trusted_until = cached
+            if now < trusted_until:
+                self._validated.move_to_end(digest)
+                return at
+            del self._validated[digest]
 
-    async def load_access_token(self, token: str) -> AccessToken | None:
-        at = self._access_tokens.get(token)
+        at = await self._get(ACCESS_TOKEN, digest)
         if at is None:
             return None
-        if at.expires_at and time.time() > at.expires_at:
-            del self._access_tokens[token]
+        wall = time.time()
+        if at.expires_at and wall > at.expires_at:
+            await self._drop(ACCESS_TOKEN, digest)
             return None
+
+        ttl = self._cache_ttl
+        if at.expires_at:
+            ttl = min(ttl, at.expires_at - wall)
+        self._validated[digest] = (at, now + ttl)
+        if len(self._validated) > self._cache_size:
+            self._validated.popitem(last=False)
         return at
 
     async def revoke_token(
@@ -178,6 +381,6 @@ class InMemoryOAuthProvider:
         token: AccessToken | RefreshToken,
     ) -> None:
         if isinstance(token, AccessToken):
-            self._access_tokens.pop(token.token, None)
+            await self._drop(ACCESS_TOKEN, token.token)
         elif isinstance(token, RefreshToken):
-            self._refresh_tokens.pop(token.token, None)
+            await self._drop(REFRESH_TOKEN, token.token)
@@ -0,0 +1,137 @@
+"""Per-client daily usage accounting and quotas for subprocess tools.
+
+Each ``claude_execute`` and ``run_command`` run is charged to the calling
+client as wall-clock runtime and CPU seconds, in buckets per UTC day. Once
+a client's total for the day reaches a configured limit, further runs are
+refused until midnight UTC.
+
+CPU time is read from ``/proc/<pid>/stat`` (the process plus the children
+it has reaped) while the process runs. The last sample is taken at most
+``interval`` seconds before exit, so a short burst at the very end can be
+missed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+_CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+def utc_day(ts: float | None = None) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))
+
+
+@dataclass(slots=True)
+class Usage:
+    calls: int = 0
+    runtime_s: float = 0.0
+    cpu_s: float = 0.0
+
+    def add(self, other: Usage) -> None:
+        self.calls += other.calls
+        self.runtime_s += other.runtime_s
+        self.cpu_s += other.cpu_s
+
+
+class UsageLedger:
+    """In-memory usage per (day, client, tool) with optional daily limits
+    (0 means unlimited)."""
+
+    def __init__(
+        self, daily_runtime_seconds: float = 0.0, daily_cpu_seconds: float = 0.0
+    ) -> None:
+        self.daily_runtime_seconds = daily_runtime_seconds
+        self.daily_cpu_seconds = daily_cpu_seconds
+        self._usage: dict[str, dict[tuple[str, str], Usage]] = defaultdict(dict)
+
+    async def record(
+        self,
+        client_id: str,
+        tool: str,
+        runtime_s: float,
+        cpu_s: float,
+        day: str | None = None,
+    ) -> None:
+        day = day or utc_day()
+        usage = self._usage[day].setdefault((client_id, tool), Usage())
+        usage.add(Usage(1, runtime_s, cpu_s))
+        # Keep a week of history for usage_report
+        for old in sorted(self._usage)[:-7]:
+            del self._usage[old]
+
+    async def usage(self, day: str | None = None) -> dict[tuple[str, str], Usage]:
+        """(client, tool) -> usage for ``day`` (default today)."""
+        return dict(self._usage.get(day or utc_day(), {}))
+
+    async def client_total(self, client_id: str, day: str | None = None) -> Usage:
+        total = Usage()
+        for (client, _), usage in (await self.usage(day)).items():
+            if client == client_id:
+                total.add(usage)
+        return total
+
+    async def check(self, client_id: str) -> None:
+        """Raise RuntimeError if ``client_id`` has used up today's quota."""
+        total = await self.client_total(client_id)
+        if self.daily_runtime_seconds and total.runtime_s >= self.daily_runtime_seconds:
+            raise RuntimeError(
+                f"Daily runtime quota exhausted for {client_id}: "
+                f"{total.runtime_s:.0f}s of {self.daily_runtime_seconds:.0f}s used"
+            )
+        if self.daily_cpu_seconds and total.cpu_s >= self.daily_cpu_seconds:
+            raise RuntimeError(
+                f"Daily CPU quota exhausted for {client_id}: "
+                f"{total.cpu_s:.0f}s of {self.daily_cpu_seconds:.0f}s used"
+            )
+
+    def close(self) -> None:
+        pass
+
+
+def read_cpu_seconds(pid: int) -> float | None:
+    """utime + stime of ``pid`` and its reaped children, or None if gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            raw = f.read()
+    except OSError:
+        return None
+    fields = raw[raw.rindex(")") + 2 :].split()
+    return sum(int(x) for x in fields[11:15]) / _CLK_TCK
+
+
+class CpuMeter:
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.cpu_seconds = 0.0
+
+    def sample(self) -> None:
+        value = read_cpu_seconds(self.pid)
+        if value is not None:
+            self.cpu_seconds = max(self.cpu_seconds, value)
+
+
+@contextlib.asynccontextmanager
+async def cpu_meter(pid: int, interval: float = 0.5) -> AsyncIterator[CpuMeter]:
+    """Sample the CPU time of ``pid`` every ``interval`` seconds while the
+    block runs."""
+    meter = CpuMeter(pid)
+
+    async def poll() -> None:
+        while True:
+            meter.sample()
+            await asyncio.sleep(interval)
+
+    task = asyncio.create_task(poll())
+    try:
+        yield meter
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
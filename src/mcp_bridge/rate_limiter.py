@@ -5,42 +5,103 @@ import time
 from collections import defaultdict
 
 
+def rate_key(tool_name: str, client_id: str | None) -> str:
+    if client_id is None:
+        from mcp_bridge.clients import current_client_id
+
+        client_id = current_client_id()
+    return f"{client_id}/{tool_name}"
+
+
 class RateLimiter:
-    """Sliding-window rate limiter per tool name."""
+    """Sliding-window rate limiter per client and tool name.
+
+    The client defaults to the one making the current MCP request, so one
+    busy client cannot use up the budget of the others.
+    """
 
     def __init__(self, max_per_minute: int = 10) -> None:
         self._max_per_minute = max_per_minute
         self._calls: dict[str, list[float]] = defaultdict(list)
         self._lock = asyncio.Lock()
 
-    async def check(self, tool_name: str) -> None:
+    async def check(self, tool_name: str, client_id: str | None = None) -> None:
+        key = rate_key(tool_name, client_id)
         async with self._lock:
             now = time.monotonic()
             window = now - 60.0
-            self._calls[tool_name] = [
-                t for t in self._calls[tool_name] if t > window
-            ]
-            if len(self._calls[tool_name]) >= self._max_per_minute:
+            self._calls[key] = [t for t in self._calls[key] if t > window]
+            if len(self._calls[key]) >= self._max_per_minute:
                 raise RuntimeError(
                     f"Rate limit exceeded for {tool_name}: "
                     f"max {self._max_per_minute} requests/minute"
                 )
-            self._calls[tool_name].append(now)
+            self._calls[key].append(now)
+
+    def resize(self, max_per_minute: int) -> None:
+        self._max_per_minute = max_per_minute
 
 
 class ConcurrencyLimiter:
-    """Fail-fast concurrency limiter using asyncio.Semaphore."""
+    """Fail-fast concurrency limiter.
+
+    A plain counter rather than a semaphore, so the capacity can be resized
+    while slots are held; shrinking only turns away new callers. Callers
+    passing ``reserve=n`` only get a slot while ``n`` more stay free, which
+    keeps background work from taking the last slots.
+    """
+
+    # Seconds between re-checks in ``acquire_within``, for limiters whose
+    # slots can also be freed by other processes (which do not wake us)
+    recheck_interval: float | None = None
 
     def __init__(self, max_concurrent: int = 3) -> None:
-        self._semaphore = asyncio.Semaphore(max_concurrent)
         self._max = max_concurrent
+        self._in_use = 0
+        self._freed = asyncio.Event()
+
+    def _wake(self) -> None:
+        # Waiters hold a reference to the old event, so swapping wakes them all
+        self._freed.set()
+        self._freed = asyncio.Event()
 
-    async def acquire(self) -> None:
-        if self._semaphore._value == 0:
+    async def acquire(self, reserve: int = 0) -> None:
+        if self._in_use >= self._max - reserve:
             raise RuntimeError(
                 f"Max concurrent claude_execute limit reached ({self._max})"
             )
-        await self._semaphore.acquire()
+        self._in_use += 1
+
+    async def acquire_within(self, timeout: float, reserve: int = 0) -> None:
+        """Like ``acquire``, but wait up to ``timeout`` seconds for a free slot."""
+        deadline = time.monotonic() + timeout
+        while True:
+            freed = self._freed
+            try:
+                await self.acquire(reserve)
+                return
+            except RuntimeError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise
+            if self.recheck_interval is not None:
+                remaining = min(remaining, self.recheck_interval)
+            try:
+                await asyncio.wait_for(freed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    @property
+    def capacity(self) -> int:
+        return self._max
+
+    def observe(self, latency: float) -> None:
+        """Record how long a slot was held; used by adaptive subclasses."""
+
+    def resize(self, max_concurrent: int) -> None:
+        self._max = max_concurrent
+        self._wake()  # a bigger limit may admit waiters right away
 
     def release(self) -> None:
-        self._semaphore.release()
+        self._in_use -= 1
+        self._wake()
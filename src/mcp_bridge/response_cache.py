@@ -0,0 +1,94 @@
+"""Memoized claude_execute results, keyed on the request and repo state.
+
+A cache key combines the prompt, CLI options, working directory and a
+fingerprint of the git checkout: ``HEAD`` plus a hash of the uncommitted
+diff and of untracked files' names, sizes and mtimes. Directories that are
+not git checkouts have no fingerprint and are never cached. A result is
+only stored if the fingerprint is unchanged after the run, so runs that
+edit the tree are never replayed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+async def _git(cwd: Path, *args: str) -> bytes | None:
+    proc = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=15)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return None
+    return stdout if proc.returncode == 0 else None
+
+
+async def repo_fingerprint(cwd: Path) -> str | None:
+    """Fingerprint of the checkout at ``cwd``, or None if it is not a git repo."""
+    head, diff, untracked = await asyncio.gather(
+        _git(cwd, "rev-parse", "HEAD"),
+        _git(cwd, "diff", "HEAD", "--binary"),
+        _git(cwd, "ls-files", "--others", "--exclude-standard", "-z"),
+    )
+    if head is None or diff is None or untracked is None:
+        return None
+    h = hashlib.sha256(head)
+    h.update(diff)
+    for name in sorted(untracked.split(b"\0")):
+        if not name:
+            continue
+        try:
+            st = os.stat(cwd / os.fsdecode(name))
+        except OSError:
+            continue
+        h.update(b"%s\0%d\0%d\0" % (name, st.st_size, st.st_mtime_ns))
+    return h.hexdigest()
+
+
+def cache_key(fingerprint: str, cwd: Path, **request: object) -> str:
+    payload = json.dumps([fingerprint, str(cwd), request], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """LRU cache of tool results with a per-entry TTL."""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 3600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, now: float | None = None) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic() if now is None else now
+        result, expires_at = entry
+        if now >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: str, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._entries[key] = (result, now + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,165 @@
+"""Shape large tool results before they are sent back to the client.
+
+Command and CLI output is often dominated by noise: ANSI colour codes,
+progress bars redrawn with carriage returns, and long runs of identical
+lines. ``shape_output`` removes that noise and then, if the text is still
+over budget, keeps the head and tail and drops the middle. The returned
+``ShapedResult`` records both sizes so callers can report them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mcp_bridge.blob_store import BlobStore
+    from mcp_bridge.config import Settings
+
+_ANSI_RE = re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])")
+# A progress line has a bar (glyph run or |...|) and a percentage or n/m count,
+# e.g. "45%|████▌     | 9/20" or "[=====>   ] 52%". The amount is found
+# first and the bar looked for within a window next to it, which keeps the
+# check linear; longer lines are never progress lines.
+_BAR_RE = re.compile(r"[█▏▎▍▌▋▊▉#=>]{3,}|\|[\s█▏▎▍▌▋▊▉#=>-]*\|")
+_AMOUNT_RE = re.compile(r"\d{1,3}(?:\.\d+)?%|\d+/\d+")
+_PROGRESS_MAX_LINE = 200
+_PROGRESS_WINDOW = 80
+
+
+@dataclass(frozen=True, slots=True)
+class ShapePolicy:
+    max_chars: int = 100_000
+    head_fraction: float = 0.3
+    strip_ansi: bool = True
+    collapse_progress: bool = True
+    dedupe: bool = True
+
+
+def policy_for(settings: Settings, tool: str, verbatim: bool = False) -> ShapePolicy:
+    """Policy for ``tool`` from settings; ``verbatim`` only enforces size
+    (for file contents, which must not be rewritten)."""
+    return ShapePolicy(
+        max_chars=settings.result_limits.get(tool, settings.result_max_chars),
+        head_fraction=settings.result_head_fraction,
+        strip_ansi=not verbatim,
+        collapse_progress=not verbatim,
+        dedupe=not verbatim,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ShapedResult:
+    text: str
+    original_size: int
+    shipped_size: int
+    truncated: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return self.original_size != self.shipped_size
+
+    def footer(self) -> str:
+        return (
+            f"\n[output shaped: {self.original_size} -> {self.shipped_size} chars]"
+            if self.changed
+            else ""
+        )
+
+
+def strip_ansi(text: str) -> str:
+    return _ANSI_RE.sub("", text)
+
+
+def is_progress_line(line: str) -> bool:
+    if len(line) > _PROGRESS_MAX_LINE:
+        return False
+    for amount in _AMOUNT_RE.finditer(line):
+        start, end = amount.span()
+        if _BAR_RE.search(line, max(0, start - _PROGRESS_WINDOW), start) or _BAR_RE.search(
+            line, end, end + _PROGRESS_WINDOW
+        ):
+            return True
+    return False
+
+
+def collapse_progress(text: str) -> str:
+    """Keep only the final redraw of ``\\r``-updated lines, and only the last
+    line of any consecutive run of progress-bar lines."""
+    lines = [line.rstrip("\r").rsplit("\r", 1)[-1] for line in text.split("\n")]
+    out: list[str] = []
+    in_run = False
+    for line in lines:
+        is_progress = is_progress_line(line)
+        if is_progress and in_run:
+            out[-1] = line
+        else:
+            out.append(line)
+        in_run = is_progress
+    return "\n".join(out)
+
+
+def dedupe_lines(text: str, min_run: int = 3) -> str:
+    """Collapse runs of ``min_run`` or more identical consecutive lines."""
+    out: list[str] = []
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines):
+        j = i
+        while j + 1 < len(lines) and lines[j + 1] == lines[i]:
+            j += 1
+        run = j - i + 1
+        out.append(lines[i])
+        if run >= min_run:
+            out.append(f"[... previous line repeated {run - 1} more times]")
+        else:
+            out.extend(lines[i + 1 : j + 1])
+        i = j + 1
+    return "\n".join(out)
+
+
+def head_tail(text: str, max_chars: int, head_fraction: float = 0.3) -> str:
+    """Keep the first and last parts of ``text``, cut on line boundaries."""
+    if len(text) <= max_chars:
+        return text
+    head_budget = int(max_chars * head_fraction)
+    tail_budget = max_chars - head_budget
+    head = text[:head_budget]
+    if "\n" in head:
+        head = head[: head.rindex("\n") + 1]
+    tail = text[-tail_budget:] if tail_budget else ""
+    if "\n" in tail:
+        tail = tail[tail.index("\n") + 1 :]
+    omitted = len(text) - len(head) - len(tail)
+    return f"{head}\n[... {omitted} chars omitted ...]\n{tail}"
+
+
+def shape_output(text: str, policy: ShapePolicy) -> ShapedResult:
+    original = len(text)
+    if policy.strip_ansi:
+        text = strip_ansi(text)
+    if policy.collapse_progress:
+        text = collapse_progress(text)
+    if policy.dedupe:
+        text = dedupe_lines(text)
+    truncated = 0 < policy.max_chars < len(text)
+    if truncated:
+        text = head_tail(text, policy.max_chars, policy.head_fraction)
+    return ShapedResult(
+        text=text, original_size=original, shipped_size=len(text), truncated=truncated
+    )
+
+
+async def keep_full_output(
+    shaped: ShapedResult, raw: str, blobs: BlobStore | None
+) -> str:
+    """Footer for ``shaped``; if it was truncated, also stash ``raw`` in the
+    blob store and point the client at ``blob_read``."""
+    footer = shaped.footer()
+    if blobs is None or not shaped.truncated:
+        return footer
+    data = raw.encode("utf-8", errors="replace")
+    handle = await asyncio.to_thread(blobs.put, data)
+    return footer + f"\n[full output: blob {handle}, {len(data)} bytes; page with blob_read]"
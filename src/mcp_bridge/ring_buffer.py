@@ -0,0 +1,88 @@
+"""Fixed-size, array-backed ring buffers for sampled time series.
+
+Each field is stored in its own ``array('d')`` preallocated to capacity,
+so appending a sample never allocates and memory use is bounded at
+``8 * capacity * (fields + 1)`` bytes per buffer.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class FieldStats:
+    min: float
+    avg: float
+    max: float
+
+
+class TimeSeriesRing:
+    """Ring buffer of timestamped samples with a fixed set of float fields."""
+
+    def __init__(self, capacity: int, fields: tuple[str, ...]) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.fields = fields
+        self._ts = array("d", bytes(8 * capacity))
+        self._cols = {f: array("d", bytes(8 * capacity)) for f in fields}
+        self._head = 0  # next write position
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ts: float, values: dict[str, float]) -> None:
+        i = self._head
+        self._ts[i] = ts
+        for field, col in self._cols.items():
+            col[i] = values[field]
+        self._head = (i + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _indices(self, since: float | None = None) -> list[int]:
+        """Buffer positions oldest-first, optionally only those at or after ``since``."""
+        start = (self._head - self._count) % self.capacity
+        idx = [(start + k) % self.capacity for k in range(self._count)]
+        if since is not None:
+            # Timestamps are monotonic, so skip the prefix that is too old
+            lo, hi = 0, len(idx)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._ts[idx[mid]] < since:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            idx = idx[lo:]
+        return idx
+
+    def count(self, since: float | None = None) -> int:
+        return len(self._indices(since))
+
+    def latest(self) -> tuple[float, dict[str, float]] | None:
+        if not self._count:
+            return None
+        i = (self._head - 1) % self.capacity
+        return self._ts[i], {f: col[i] for f, col in self._cols.items()}
+
+    def series(self, since: float | None = None) -> tuple[list[float], dict[str, list[float]]]:
+        """Timestamps and per-field values, oldest first."""
+        idx = self._indices(since)
+        return (
+            [self._ts[i] for i in idx],
+            {f: [col[i] for i in idx] for f, col in self._cols.items()},
+        )
+
+    def stats(self, since: float | None = None) -> dict[str, FieldStats]:
+        idx = self._indices(since)
+        if not idx:
+            return {}
+        result: dict[str, FieldStats] = {}
+        for field, col in self._cols.items():
+            values = [col[i] for i in idx]
+            result[field] = FieldStats(
+                min=min(values), avg=sum(values) / len(values), max=max(values)
+            )
+        return result
@@ -1,9 +1,22 @@
-"""Claude MCP Bridge Server — Entry Point."""
+"""Claude MCP Bridge Server — Entry Point.
+
+Optional backends (SQLite token store, shared limiter state) are only
+imported when configured. Most of the cold start is importing the MCP SDK
+itself; use ``scripts/profile_startup.py`` to see where the time goes.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
 import uvicorn
 from dotenv import load_dotenv
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
@@ -11,24 +24,86 @@ from mcp.server.auth.settings import AuthSettings, ClientRegistrationOptions, Re
 from mcp.server.fastmcp import FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 
+from mcp_bridge.admin import register_admin_routes
 from mcp_bridge.audit import get_logger, setup_logging
-from mcp_bridge.config import get_settings
+from mcp_bridge.config import Settings, get_settings
+from mcp_bridge.config_reload import ConfigWatcher, LiveSettings
+from mcp_bridge.lifecycle import DrainMiddleware, ProcessTracker, graceful_shutdown
 from mcp_bridge.oauth_provider import InMemoryOAuthProvider
+from mcp_bridge.quotas import UsageLedger
 from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+from mcp_bridge.token_store import MemoryTokenStore, TokenStore
 from mcp_bridge.tools import register_all_tools
 
+if TYPE_CHECKING:
+    from starlette.applications import Starlette
+
+
+def attach_lifespan(
+    app: Starlette,
+    background: list[Callable[[], Coroutine[Any, Any, None]]],
+    cleanup: list[Callable[[], None]],
+    contexts: list[Callable[[], AbstractAsyncContextManager[Any]]] | None = None,
+) -> None:
+    """Run background tasks alongside the app's own lifespan.
+
+    Once the MCP session manager is up, ``contexts`` are entered and tasks
+    are started. On shutdown tasks are cancelled, contexts exit in reverse
+    order (while sessions are still alive), then cleanup callbacks run.
+    """
+    inner = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with inner(app):
+            try:
+                async with contextlib.AsyncExitStack() as stack:
+                    for ctx in contexts or []:
+                        await stack.enter_async_context(ctx())
+                    tasks = [asyncio.create_task(fn()) for fn in background]
+                    try:
+                        yield
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                for fn in cleanup:
+                    fn()
+
+    app.router.lifespan_context = lifespan
+
 
 def create_app() -> tuple:
     """Create and configure the MCP server application."""
     load_dotenv()
-    settings = get_settings()
+    live = LiveSettings(get_settings())
+    # Tools and routes read settings through the proxy, so reloads reach them
+    settings = cast(Settings, live)
 
     setup_logging(settings.log_dir, settings.log_level, settings.max_log_size_mb)
     logger = get_logger("server")
     logger.info("server_starting", host=settings.host, port=settings.port)
 
+    # With several workers, OAuth and limiter state must live in a shared
+    # backend so that every worker sees the same tokens and limits
+    shared = settings.workers > 1
+    oauth_db_path = settings.oauth_db_path or settings.shared_state_path
+
     # OAuth provider and auth settings
-    oauth_provider = InMemoryOAuthProvider()
+    token_store: TokenStore = MemoryTokenStore()
+    if oauth_db_path:
+        from mcp_bridge.token_store import SQLiteTokenStore
+
+        token_store = SQLiteTokenStore(oauth_db_path)
+    oauth_provider = InMemoryOAuthProvider(
+        store=token_store,
+        max_clients=settings.oauth_max_clients,
+        refresh_token_ttl=settings.oauth_refresh_token_ttl,
+        cache_size=settings.oauth_token_cache_size,
+        cache_ttl=settings.oauth_token_cache_ttl,
+        shared=shared,
+    )
 
     auth_settings = None
     if settings.public_url:
@@ -54,6 +129,9 @@ def create_app() -> tuple:
         ),
         host=settings.host,
         port=settings.port,
+        # Any worker may receive any request, so sessions cannot be pinned
+        stateless_http=shared,
+        json_response=settings.json_response,
         auth_server_provider=oauth_provider if auth_settings else None,
         auth=auth_settings,
         transport_security=TransportSecuritySettings(
@@ -70,35 +148,272 @@ def create_app() -> tuple:
             "version": "0.1.0",
         })
 
+    # Readiness is separate from liveness: false until the lifespan has
+    # started the MCP session manager and again once a drain has started,
+    # so load balancers route elsewhere
+    tracker = ProcessTracker()
+    serving = asyncio.Event()
+
+    @contextlib.asynccontextmanager
+    async def mark_serving() -> AsyncIterator[None]:
+        serving.set()
+        try:
+            yield
+        finally:
+            serving.clear()
+
+    @mcp.custom_route("/ready", methods=["GET"])
+    async def readiness_check(request: Request) -> JSONResponse:
+        ready = serving.is_set() and not tracker.draining
+        return JSONResponse(
+            {
+                "ready": ready,
+                "draining": tracker.draining,
+                "in_flight": len(tracker),
+            },
+            status_code=200 if ready else 503,
+        )
+
     # Rate limiter and concurrency control
-    rate_limiter = RateLimiter(max_per_minute=settings.max_requests_per_minute)
-    concurrency_limiter = ConcurrencyLimiter(
-        max_concurrent=settings.max_concurrent_claude
-    )
+    cleanup: list[Callable[[], None]] = [oauth_provider.close]
+    rate_limiter: RateLimiter
+    concurrency_limiter: ConcurrencyLimiter
+    if shared and settings.shared_state_path:
+        from mcp_bridge.shared_state import (
+            SQLiteConcurrencyLimiter,
+            SQLiteRateLimiter,
+        )
+
+        rate_limiter = SQLiteRateLimiter(
+            settings.shared_state_path,
+            max_per_minute=settings.max_requests_per_minute,
+        )
+        concurrency_limiter = SQLiteConcurrencyLimiter(
+            settings.shared_state_path,
+            max_concurrent=settings.max_concurrent_claude,
+        )
+        cleanup += [rate_limiter.close, concurrency_limiter.close]
+    else:
+        rate_limiter = RateLimiter(max_per_minute=settings.max_requests_per_minute)
+        concurrency_limiter = ConcurrencyLimiter(
+            max_concurrent=settings.max_concurrent_claude
+        )
+
+    # Adaptive claude_execute capacity follows host load; slots held in
+    # SQLite by other workers cannot be resized, so single-worker only
+    adaptive_limiter = None
+    if settings.claude_concurrency_adaptive and not shared:
+        from mcp_bridge.adaptive_limiter import AdaptiveConcurrencyLimiter
+
+        adaptive_limiter = concurrency_limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.max_concurrent_claude,
+            min_limit=settings.claude_concurrency_min,
+            max_limit=settings.claude_concurrency_max or None,
+            load_high=settings.claude_concurrency_load_high,
+            mem_low=settings.claude_concurrency_mem_low,
+        )
+
+    # Queue claude_execute callers fairly between clients instead of
+    # failing fast when every slot is busy
+    fair_limiter = None
+    if settings.claude_queue_timeout > 0:
+        from mcp_bridge.fair_queue import FairConcurrencyLimiter
+
+        fair_limiter = concurrency_limiter = FairConcurrencyLimiter(
+            concurrency_limiter,
+            weights=settings.client_weights,
+            queue_timeout=settings.claude_queue_timeout,
+        )
+
+    # Per-client daily usage, shared by workers like the limiters
+    usage_ledger: UsageLedger
+    if shared and settings.shared_state_path:
+        from mcp_bridge.shared_state import SQLiteUsageLedger
+
+        usage_ledger = SQLiteUsageLedger(
+            settings.shared_state_path,
+            daily_runtime_seconds=settings.client_daily_runtime_seconds,
+            daily_cpu_seconds=settings.client_daily_cpu_seconds,
+        )
+        cleanup.append(usage_ledger.close)
+    else:
+        usage_ledger = UsageLedger(
+            daily_runtime_seconds=settings.client_daily_runtime_seconds,
+            daily_cpu_seconds=settings.client_daily_cpu_seconds,
+        )
+
+    register_admin_routes(mcp, settings, tracker, adaptive_limiter)
+
+    # GPU telemetry via NVML when available; gpu_status falls back to
+    # nvidia-smi otherwise
+    background: list[Callable[[], Coroutine[Any, Any, None]]] = []
+    if adaptive_limiter is not None:
+        background.append(
+            lambda: adaptive_limiter.run(settings.claude_concurrency_interval)
+        )
+    gpu_sampler = None
+    if settings.gpu_sample_interval > 0:
+        from mcp_bridge.gpu_telemetry import GpuSampler, load_nvml_backend
+
+        if (gpu_backend := load_nvml_backend()) is not None:
+            gpu_sampler = GpuSampler(
+                gpu_backend,
+                interval=settings.gpu_sample_interval,
+                capacity=settings.gpu_history_size,
+            )
+            background.append(gpu_sampler.run)
+            cleanup.append(gpu_sampler.close)
+
+    # Host metrics history for system_history, read from /proc in-process
+    host_sampler = None
+    if settings.host_sample_interval > 0:
+        from mcp_bridge.host_metrics import HostSampler
+
+        host_sampler = HostSampler(interval=settings.host_sample_interval)
+        background.append(host_sampler.run)
+
+    # Full outputs of truncated results, shared by workers through the disk
+    blob_store = None
+    if settings.blob_quota_mb > 0 and settings.blob_dir is not None:
+        from mcp_bridge.blob_store import BlobStore
+
+        blob_store = BlobStore(
+            settings.blob_dir,
+            quota_bytes=settings.blob_quota_mb * 1024 * 1024,
+            compress=settings.blob_compress,
+        )
+
+    # Opt-in memoization of claude_execute; per worker, kept in memory
+    response_cache = None
+    if settings.claude_cache_ttl > 0:
+        from mcp_bridge.response_cache import ResponseCache
+
+        response_cache = ResponseCache(
+            max_entries=settings.claude_cache_size, ttl=settings.claude_cache_ttl
+        )
+
+    # Persistent run_command shells; per worker, like the processes they own
+    shell_sessions = None
+    if settings.shell_session_max > 0:
+        from mcp_bridge.shell_sessions import ShellSessions
+
+        shell_sessions = ShellSessions(
+            max_sessions=settings.shell_session_max,
+            idle_timeout=settings.shell_session_idle_timeout,
+        )
+        background.append(
+            lambda: shell_sessions.run(min(60.0, settings.shell_session_idle_timeout / 4))
+        )
+        cleanup.append(shell_sessions.close_all)
+
+    # Apply limit changes from a reloaded env file to the live objects
+    def apply_limits(old: Settings, new: Settings) -> None:
+        rate_limiter.resize(new.max_requests_per_minute)
+        if new.max_concurrent_claude != old.max_concurrent_claude:
+            concurrency_limiter.resize(new.max_concurrent_claude)
+        if adaptive_limiter is not None:
+            adaptive_limiter.set_bounds(
+                new.claude_concurrency_min, new.claude_concurrency_max or None
+            )
+            adaptive_limiter.load_high = new.claude_concurrency_load_high
+            adaptive_limiter.mem_low = new.claude_concurrency_mem_low
+        if fair_limiter is not None:
+            fair_limiter.configure(new.client_weights, new.claude_queue_timeout)
+        usage_ledger.daily_runtime_seconds = new.client_daily_runtime_seconds
+        usage_ledger.daily_cpu_seconds = new.client_daily_cpu_seconds
+        if shell_sessions is not None:
+            shell_sessions.max_sessions = new.shell_session_max
+            shell_sessions.idle_timeout = new.shell_session_idle_timeout
+        if new.log_level != old.log_level:
+            setup_logging(new.log_dir, new.log_level, new.max_log_size_mb)
+
+    if settings.config_reload_interval > 0:
+        watcher = ConfigWatcher(
+            live,
+            Path(Settings.model_config.get("env_file") or ".env"),
+            hooks=[apply_limits],
+            interval=settings.config_reload_interval,
+        )
+        background.append(watcher.run)
 
     # Register all tools
-    register_all_tools(mcp, settings, rate_limiter, concurrency_limiter)
+    register_all_tools(
+        mcp,
+        settings,
+        rate_limiter,
+        concurrency_limiter,
+        tracker,
+        gpu_sampler,
+        host_sampler,
+        blob_store,
+        response_cache,
+        usage_ledger,
+        shell_sessions,
+    )
 
     # Build the Starlette app (includes OAuth routes + auth middleware)
     app = mcp.streamable_http_app()
+    app.add_middleware(
+        DrainMiddleware,
+        path=mcp.settings.streamable_http_path,
+        tracker=tracker,
+    )
+    if settings.gzip_minimum_size > 0:
+        app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+    attach_lifespan(
+        app,
+        background=[
+            lambda: oauth_provider.run_sweeper(settings.oauth_sweep_interval),
+            *background,
+        ],
+        cleanup=cleanup,
+        contexts=[
+            lambda: graceful_shutdown(tracker, settings.drain_timeout),
+            mark_serving,
+        ],
+    )
 
     logger.info(
         "server_configured",
         allowed_dirs=[str(d) for d in settings.allowed_dirs],
         oauth_enabled=bool(auth_settings),
+        workers=settings.workers,
     )
 
     return app, settings
 
 
+def app_factory() -> Starlette:
+    """ASGI app factory used by uvicorn when running several workers."""
+    app, _ = create_app()
+    return app
+
+
 def main() -> None:
     """Entry point for the server."""
+    load_dotenv()
+    settings = get_settings()
+    if settings.workers > 1:
+        # uvicorn's supervisor forks the workers and restarts any that die;
+        # each worker builds its own app through the factory
+        uvicorn.run(
+            "mcp_bridge.server:app_factory",
+            factory=True,
+            workers=settings.workers,
+            host=settings.host,
+            port=settings.port,
+            log_level=settings.log_level.lower(),
+            timeout_graceful_shutdown=settings.drain_timeout,
+        )
+        return
+
     app, settings = create_app()
     uvicorn.run(
         app,
         host=settings.host,
         port=settings.port,
         log_level=settings.log_level.lower(),
+        timeout_graceful_shutdown=settings.drain_timeout,
     )
 
 
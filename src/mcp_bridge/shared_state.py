@@ -0,0 +1,262 @@
+"""SQLite-backed limiter and usage state shared by all workers of a multi-worker server.
+
+Each worker opens its own connection to the same WAL-mode database, and
+every check runs in a short ``BEGIN IMMEDIATE`` transaction so limits are
+enforced globally. Any statement can wait up to the busy timeout for a
+sibling's lock, so every one runs in a worker thread, one at a time per
+connection, never on the event loop; a slot release is handed to a
+background thread so the synchronous ``release()`` returns at once.
+Concurrency slots record the owning PID, which lets a worker reclaim slots
+left behind by a crashed sibling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from mcp_bridge.audit import get_logger
+from mcp_bridge.quotas import Usage, UsageLedger, utc_day
+from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter, rate_key
+from mcp_bridge.token_store import connect_sqlite
+
+# How often a rate limiter drops every key's events older than the window;
+# each check only prunes its own key, which leaves idle keys' rows behind
+_RATE_PURGE_INTERVAL = 60.0
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """Sliding-window rate limiter per client and tool, shared across processes."""
+
+    def __init__(self, path: Path, max_per_minute: int = 10) -> None:
+        super().__init__(max_per_minute=max_per_minute)
+        self._conn = connect_sqlite(path)
+        self._conn.isolation_level = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_events (key TEXT NOT NULL, ts REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS rate_events_key_ts ON rate_events (key, ts)"
+        )
+
+    async def check(self, tool_name: str, client_id: str | None = None) -> None:
+        await asyncio.to_thread(self._check, tool_name, rate_key(tool_name, client_id))
+
+    def _check(self, tool_name: str, key: str) -> None:
+        now = time.time()
+        conn = self._conn
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if now - self._last_purge >= _RATE_PURGE_INTERVAL:
+                    conn.execute("DELETE FROM rate_events WHERE ts <= ?", (now - 60.0,))
+                    self._last_purge = now
+                else:
+                    conn.execute(
+                        "DELETE FROM rate_events WHERE key = ? AND ts <= ?",
+                        (key, now - 60.0),
+                    )
+                (count,) = conn.execute(
+                    "SELECT COUNT(*) FROM rate_events WHERE key = ?", (key,)
+                ).fetchone()
+                if count >= self._max_per_minute:
+                    raise RuntimeError(
+                        f"Rate limit exceeded for {tool_name}: "
+                        f"max {self._max_per_minute} requests/minute"
+                    )
+                conn.execute(
+                    "INSERT INTO rate_events (key, ts) VALUES (?, ?)", (key, now)
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class SQLiteConcurrencyLimiter(ConcurrencyLimiter):
+    """Fail-fast concurrency limiter whose slots are shared across processes."""
+
+    recheck_interval = 0.25  # a sibling's release does not wake our waiters
+
+    def __init__(
+        self, path: Path, max_concurrent: int = 3, name: str = "claude_execute"
+    ) -> None:
+        super().__init__(max_concurrent=max_concurrent)
+        self._name = name
+        self._pid = os.getpid()
+        self._conn = connect_sqlite(path)
+        self._conn.isolation_level = None
+        self._lock = threading.Lock()
+        self._releases: set[asyncio.Future[None]] = set()
+        self._closed = False
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS concurrency_slots ("
+            " name TEXT NOT NULL, pid INTEGER NOT NULL, acquired_at REAL NOT NULL)"
+        )
+
+    def _reap_dead_owners(self, conn: sqlite3.Connection) -> None:
+        pids = [
+            pid
+            for (pid,) in conn.execute(
+                "SELECT DISTINCT pid FROM concurrency_slots WHERE name = ?",
+                (self._name,),
+            )
+        ]
+        for pid in pids:
+            if pid != self._pid and not _pid_alive(pid):
+                conn.execute(
+                    "DELETE FROM concurrency_slots WHERE name = ? AND pid = ?",
+                    (self._name, pid),
+                )
+
+    async def acquire(self, reserve: int = 0) -> None:
+        # Our own releases land first, so release-then-acquire never fails
+        if self._releases:
+            await asyncio.gather(*self._releases, return_exceptions=True)
+        await asyncio.to_thread(self._acquire, reserve)
+
+    def _acquire(self, reserve: int) -> None:
+        conn = self._conn
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._reap_dead_owners(conn)
+                (count,) = conn.execute(
+                    "SELECT COUNT(*) FROM concurrency_slots WHERE name = ?", (self._name,)
+                ).fetchone()
+                if count >= self._max - reserve:
+                    raise RuntimeError(
+                        f"Max concurrent claude_execute limit reached ({self._max})"
+                    )
+                conn.execute(
+                    "INSERT INTO concurrency_slots (name, pid, acquired_at) VALUES (?, ?, ?)",
+                    (self._name, self._pid, time.time()),
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def release(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._release()
+            self._wake()
+            return
+        release = loop.run_in_executor(None, self._release)
+        self._releases.add(release)
+        release.add_done_callback(self._released)
+
+    def _released(self, release: asyncio.Future[None]) -> None:
+        self._releases.discard(release)
+        if not release.cancelled() and release.exception() is not None:
+            get_logger("shared_state").warning(
+                "slot_release_failed", error=str(release.exception())
+            )
+        self._wake()
+
+    def _release(self) -> None:
+        # Slots are fungible, so any one of this process's rows will do
+        with self._lock:
+            if self._closed:
+                return  # close() already handed back every slot
+            self._conn.execute(
+                "DELETE FROM concurrency_slots WHERE rowid = ("
+                " SELECT rowid FROM concurrency_slots WHERE name = ? AND pid = ? LIMIT 1)",
+                (self._name, self._pid),
+            )
+
+    def close(self) -> None:
+        # Hand back anything still held so siblings are not blocked
+        with self._lock:
+            self._closed = True
+            self._conn.execute(
+                "DELETE FROM concurrency_slots WHERE name = ? AND pid = ?",
+                (self._name, self._pid),
+            )
+            self._conn.close()
+
+
+class SQLiteUsageLedger(UsageLedger):
+    """Per-client daily usage shared across processes."""
+
+    def __init__(
+        self,
+        path: Path,
+        daily_runtime_seconds: float = 0.0,
+        daily_cpu_seconds: float = 0.0,
+    ) -> None:
+        super().__init__(daily_runtime_seconds, daily_cpu_seconds)
+        self._conn = connect_sqlite(path)
+        self._conn.isolation_level = None
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS client_usage ("
+            " day TEXT NOT NULL, client TEXT NOT NULL, tool TEXT NOT NULL,"
+            " calls INTEGER NOT NULL, runtime_s REAL NOT NULL, cpu_s REAL NOT NULL,"
+            " PRIMARY KEY (day, client, tool))"
+        )
+
+    async def record(
+        self,
+        client_id: str,
+        tool: str,
+        runtime_s: float,
+        cpu_s: float,
+        day: str | None = None,
+    ) -> None:
+        await asyncio.to_thread(
+            self._record, day or utc_day(), client_id, tool, runtime_s, cpu_s
+        )
+
+    def _record(
+        self, day: str, client_id: str, tool: str, runtime_s: float, cpu_s: float
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO client_usage VALUES (?, ?, ?, 1, ?, ?)"
+                " ON CONFLICT (day, client, tool) DO UPDATE SET"
+                " calls = calls + 1, runtime_s = runtime_s + excluded.runtime_s,"
+                " cpu_s = cpu_s + excluded.cpu_s",
+                (day, client_id, tool, runtime_s, cpu_s),
+            )
+            self._conn.execute(
+                "DELETE FROM client_usage WHERE day < ?",
+                (utc_day(time.time() - 7 * 86400),),
+            )
+
+    async def usage(self, day: str | None = None) -> dict[tuple[str, str], Usage]:
+        return await asyncio.to_thread(self._usage_on, day or utc_day())
+
+    def _usage_on(self, day: str) -> dict[tuple[str, str], Usage]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT client, tool, calls, runtime_s, cpu_s FROM client_usage"
+                " WHERE day = ?",
+                (day,),
+            ).fetchall()
+        return {(client, tool): Usage(*rest) for client, tool, *rest in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,293 @@
+"""Named, long-lived bash sessions for ``run_command``.
+
+A session is a ``bash --noprofile --norc`` process driven over pipes, so
+``cd``, ``export`` and ``source venv/bin/activate`` carry over from one
+command to the next and no shell is started per call. Each command is sent
+as a single ``eval`` of a quoted string with stdin from ``/dev/null``. It
+is followed by sentinel lines carrying a random token on stdout (with the
+exit code and ``$PWD``) and on stderr. The reader collects each stream up
+to its sentinel, which frames the output without a pty.
+
+Sessions belong to the client that created them and run one command at a
+time. A command that times out takes its whole session (and process group)
+down with it. Sessions idle for longer than ``idle_timeout`` are closed,
+and when ``max_sessions`` are open the least recently used idle one makes
+room for a new one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import secrets
+import shlex
+import signal
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mcp_bridge.audit import get_logger
+from mcp_bridge.quotas import read_cpu_seconds
+
+if TYPE_CHECKING:
+    from mcp_bridge.lifecycle import ProcessTracker
+
+# Output per stream and command that fits before the sentinel is found
+_STREAM_LIMIT = 32 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class CommandResult:
+    stdout: bytes
+    stderr: bytes
+    exit_code: int | None
+    cwd: Path
+    cpu_seconds: float
+    ended: bool  # the shell exited (e.g. the command ran ``exit``)
+
+
+class CommandTimeout(asyncio.TimeoutError):
+    """A session command timed out; carries the CPU it used before the kill."""
+
+    def __init__(self, cpu_seconds: float) -> None:
+        super().__init__()
+        self.cpu_seconds = cpu_seconds
+
+
+class CommandOverrun(RuntimeError):
+    """A session command's output overran the stream limit; carries the CPU
+    it used before the kill."""
+
+    def __init__(self, message: str, cpu_seconds: float) -> None:
+        super().__init__(message)
+        self.cpu_seconds = cpu_seconds
+
+
+class SessionBusy(RuntimeError):
+    """Another command held the session for the whole timeout."""
+
+
+class ShellSession:
+    """One bash process; use ``start`` to create."""
+
+    def __init__(
+        self, name: str, client_id: str, proc: asyncio.subprocess.Process, cwd: Path
+    ) -> None:
+        self.name = name
+        self.client_id = client_id
+        self.proc = proc
+        self.cwd = cwd
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.commands = 0
+        self.lock = asyncio.Lock()
+        self._reset_to: Path | None = None
+
+    @classmethod
+    async def start(cls, name: str, client_id: str, cwd: Path) -> ShellSession:
+        proc = await asyncio.create_subprocess_exec(
+            "bash", "--noprofile", "--norc",
+            cwd=str(cwd),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, "TERM": "dumb"},
+            start_new_session=True,  # own process group, killable as a unit
+            limit=_STREAM_LIMIT,
+        )
+        return cls(name, client_id, proc, cwd)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+    def reset_cwd(self, cwd: Path) -> None:
+        """Run the next command from ``cwd`` (after a ``cd`` out of bounds)."""
+        self._reset_to = cwd
+        self.cwd = cwd
+
+    async def run(
+        self,
+        command: str,
+        timeout: float,
+        tracker: ProcessTracker | None = None,
+    ) -> CommandResult:
+        """Run ``command`` in the session.
+
+        Waiting for a previous command counts against ``timeout``; if it
+        never finishes ``SessionBusy`` is raised and the session is left
+        alone. On timeout the session is killed and ``CommandTimeout``
+        raised, on output over the stream limit ``CommandOverrun``.
+        """
+        assert self.proc.stdin and self.proc.stdout and self.proc.stderr
+        token = "__mcp_" + secrets.token_hex(8)
+        script = ""
+        if self._reset_to is not None:
+            script += f"cd -- {shlex.quote(str(self._reset_to))}\n"
+            self._reset_to = None
+        script += (
+            f"eval {shlex.quote(command)} < /dev/null\n"
+            f"printf '\\n%s %d %s\\n' {token} \"$?\" \"$PWD\"; "
+            f"printf '\\n%s\\n' {token} >&2\n"
+        )
+        marker = f"\n{token}".encode()
+
+        async def collect(stream: asyncio.StreamReader) -> tuple[bytes, bytes | None]:
+            try:
+                data = await stream.readuntil(marker)
+            except asyncio.IncompleteReadError as e:
+                return e.partial, None  # shell exited
+            return data[: -len(marker)], await stream.readline()
+
+        deadline = time.monotonic() + timeout
+        try:
+            await asyncio.wait_for(self.lock.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise SessionBusy(
+                f"session '{self.name}' is still busy with another command"
+            ) from None
+        try:
+            self.commands += 1
+            cpu_before = read_cpu_seconds(self.proc.pid) or 0.0
+            context = tracker.track(self.proc) if tracker is not None else contextlib.nullcontext()
+            with context:
+                try:
+                    self.proc.stdin.write(script.encode())
+                    await self.proc.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # shell already gone; the readers see EOF
+                try:
+                    (stdout, status), (stderr, _) = await asyncio.wait_for(
+                        asyncio.gather(collect(self.proc.stdout), collect(self.proc.stderr)),
+                        timeout=max(0.0, deadline - time.monotonic()),
+                    )
+                except asyncio.TimeoutError:
+                    # Once killed the shell's counters are gone, so read them first
+                    cpu_after = read_cpu_seconds(self.proc.pid)
+                    self.close()
+                    await self.proc.wait()
+                    raise CommandTimeout(
+                        max(0.0, (cpu_after or cpu_before) - cpu_before)
+                    ) from None
+                except asyncio.LimitOverrunError:
+                    cpu_after = read_cpu_seconds(self.proc.pid)
+                    self.close()
+                    # The overrun leaves its pipe paused with a full buffer and
+                    # wait() only returns at EOF, so drain it; the other
+                    # stream's collector is still reading and gets EOF itself
+                    for stream in (self.proc.stdout, self.proc.stderr):
+                        with contextlib.suppress(RuntimeError):
+                            await stream.read()
+                    await self.proc.wait()
+                    raise CommandOverrun(
+                        f"Output over {_STREAM_LIMIT // (1024 * 1024)}MiB; "
+                        f"session '{self.name}' was closed",
+                        max(0.0, (cpu_after or cpu_before) - cpu_before),
+                    ) from None
+                cpu_after = read_cpu_seconds(self.proc.pid)
+                if status is None:
+                    await self.proc.wait()
+            self.last_used = time.monotonic()
+        finally:
+            self.lock.release()
+
+        if status is None:
+            return CommandResult(
+                stdout, stderr, self.proc.returncode, self.cwd,
+                max(0.0, (cpu_after or cpu_before) - cpu_before), ended=True,
+            )
+        _, code, cwd = status.decode(errors="replace").rstrip("\n").split(" ", 2)
+        self.cwd = Path(cwd)
+        return CommandResult(
+            stdout, stderr, int(code), self.cwd,
+            max(0.0, (cpu_after or cpu_before) - cpu_before), ended=False,
+        )
+
+    def close(self) -> None:
+        if self.alive:
+            with contextlib.suppress(ProcessLookupError, PermissionError):
+                os.killpg(self.proc.pid, signal.SIGKILL)
+
+
+class ShellSessions:
+    """Registry of sessions per (client, name) with LRU and idle eviction."""
+
+    def __init__(self, max_sessions: int = 8, idle_timeout: float = 900.0) -> None:
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: dict[tuple[str, str], ShellSession] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def list(self, client_id: str) -> list[ShellSession]:
+        return [s for (c, _), s in self._sessions.items() if c == client_id]
+
+    async def get(self, client_id: str, name: str, cwd: Path) -> tuple[ShellSession, bool]:
+        """The client's session ``name``, started in ``cwd`` if new.
+
+        Returns (session, created). Raises RuntimeError when the limit is
+        reached and every session is busy.
+        """
+        key = (client_id, name)
+        session = self._sessions.get(key)
+        if session is not None and session.alive:
+            return session, False
+        self._sessions.pop(key, None)
+        if len(self._sessions) >= self.max_sessions:
+            idle = [s for s in self._sessions.values() if not s.busy]
+            if not idle:
+                raise RuntimeError(
+                    f"Shell session limit reached ({self.max_sessions}, all busy)"
+                )
+            self._evict(min(idle, key=lambda s: s.last_used), "lru")
+        session = await ShellSession.start(name, client_id, cwd)
+        if (other := self._sessions.get(key)) is not None:
+            session.close()  # a concurrent call started it first
+            return other, False
+        self._sessions[key] = session
+        return session, True
+
+    def close(self, client_id: str, name: str) -> bool:
+        session = self._sessions.get((client_id, name))
+        if session is None:
+            return False
+        self._evict(session, "closed")
+        return True
+
+    def _evict(self, session: ShellSession, reason: str) -> None:
+        self._sessions.pop((session.client_id, session.name), None)
+        session.close()
+        get_logger("shell_sessions").info(
+            "shell_session_closed",
+            client_id=session.client_id,
+            session=session.name,
+            reason=reason,
+            commands=session.commands,
+        )
+
+    def evict_idle(self, now: float | None = None) -> int:
+        now = time.monotonic() if now is None else now
+        stale = [
+            s for s in self._sessions.values()
+            if not s.alive or (not s.busy and now - s.last_used > self.idle_timeout)
+        ]
+        for session in stale:
+            self._evict(session, "idle" if session.alive else "exited")
+        return len(stale)
+
+    async def run(self, interval: float = 30.0) -> None:
+        """Background task: close idle sessions."""
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle()
+
+    def close_all(self) -> None:
+        for session in list(self._sessions.values()):
+            self._evict(session, "shutdown")
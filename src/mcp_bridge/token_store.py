@@ -0,0 +1,171 @@
+"""Pluggable persistence for OAuth clients, authorization codes and tokens.
+
+The OAuth provider keeps a hot in-memory index and writes every change
+through to a ``TokenStore``. Records are stored as serialized JSON keyed
+by ``(kind, key)`` with an optional expiry, so the provider can restore
+its state in a single pass at startup.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Protocol
+
+CLIENT = "client"
+AUTH_CODE = "code"
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+
+class TokenStore(Protocol):
+    def load(self, kind: str) -> list[tuple[str, str]]:
+        """Return all non-expired ``(key, data)`` rows of a kind."""
+        ...
+
+    def get(self, kind: str, key: str) -> str | None:
+        """Return the data of a single non-expired row, if present."""
+        ...
+
+    def put(self, kind: str, key: str, data: str, expires_at: float | None) -> None:
+        ...
+
+    def delete(self, kind: str, key: str) -> None:
+        ...
+
+    def purge_expired(self, now: float) -> int:
+        """Delete all rows that expired before ``now``; return the count."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def connect_sqlite(path: Path) -> sqlite3.Connection:
+    """Open a WAL-mode connection that is safe to share between processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class MemoryTokenStore:
+    """No-op store: state lives only in the provider's in-memory index."""
+
+    def load(self, kind: str) -> list[tuple[str, str]]:
+        return []
+
+    def get(self, kind: str, key: str) -> str | None:
+        return None
+
+    def put(self, kind: str, key: str, data: str, expires_at: float | None) -> None:
+        pass
+
+    def delete(self, kind: str, key: str) -> None:
+        pass
+
+    def purge_expired(self, now: float) -> int:
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteTokenStore:
+    """SQLite-backed store with an index on expiry for cheap purges.
+
+    Methods may be called from worker threads; a lock keeps them to one
+    statement (or transaction) at a time on the shared connection.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._conn = connect_sqlite(path)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS oauth_entries ("
+            " kind TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " expires_at REAL,"
+            " PRIMARY KEY (kind, key))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS oauth_entries_expiry "
+            "ON oauth_entries (expires_at) WHERE expires_at IS NOT NULL"
+        )
+        self._conn.commit()
+
+    def load(self, kind: str) -> list[tuple[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, data FROM oauth_entries "
+                "WHERE kind = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (kind, time.time()),
+            )
+            return list(rows)
+
+    def get(self, kind: str, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM oauth_entries WHERE kind = ? AND key = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (kind, key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, kind: str, key: str, data: str, expires_at: float | None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO oauth_entries (kind, key, data, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (kind, key, data, expires_at),
+            )
+
+    def delete(self, kind: str, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM oauth_entries WHERE kind = ? AND key = ?", (kind, key)
+            )
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM oauth_entries "
+                "WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            )
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ExpiryHeap:
+    """Min-heap of ``(expires_at, kind, key)`` used to drive the sweeper.
+
+    Entries are never updated in place; callers must check that a popped
+    entry still matches the live record before deleting it.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, expires_at: float, kind: str, key: str) -> None:
+        heapq.heappush(self._heap, (expires_at, kind, key))
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    def pop_expired(self, now: float) -> list[tuple[float, str, str]]:
+        expired: list[tuple[float, str, str]] = []
+        while self._heap and self._heap[0][0] <= now:
+            expired.append(heapq.heappop(self._heap))
+        return expired
@@ -5,8 +5,15 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from mcp.server.fastmcp import FastMCP
 
+    from mcp_bridge.blob_store import BlobStore
     from mcp_bridge.config import Settings
+    from mcp_bridge.gpu_telemetry import GpuSampler
+    from mcp_bridge.host_metrics import HostSampler
+    from mcp_bridge.lifecycle import ProcessTracker
+    from mcp_bridge.quotas import UsageLedger
     from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+    from mcp_bridge.response_cache import ResponseCache
+    from mcp_bridge.shell_sessions import ShellSessions
 
 
 def register_all_tools(
@@ -14,18 +21,54 @@ def register_all_tools(
     settings: Settings,
     rate_limiter: RateLimiter,
     concurrency_limiter: ConcurrencyLimiter,
+    processes: ProcessTracker,
+    gpu_sampler: GpuSampler | None = None,
+    host_sampler: HostSampler | None = None,
+    blob_store: BlobStore | None = None,
+    response_cache: ResponseCache | None = None,
+    usage_ledger: UsageLedger | None = None,
+    shell_sessions: ShellSessions | None = None,
 ) -> None:
     """Register all MCP tools with the server."""
+    from mcp_bridge.fair_queue import FairConcurrencyLimiter
+    from mcp_bridge.tools.blobs import register as reg_blobs
     from mcp_bridge.tools.claude_execute import register as reg_claude
     from mcp_bridge.tools.file_ops import register as reg_file
     from mcp_bridge.tools.gpu_status import register as reg_gpu
     from mcp_bridge.tools.project_status import register as reg_project
     from mcp_bridge.tools.run_command import register as reg_run
     from mcp_bridge.tools.system_info import register as reg_system
+    from mcp_bridge.tools.usage import register as reg_usage
 
-    reg_claude(mcp, settings, rate_limiter, concurrency_limiter)
-    reg_run(mcp, settings, rate_limiter)
+    reg_claude(
+        mcp,
+        settings,
+        rate_limiter,
+        concurrency_limiter,
+        processes,
+        blob_store,
+        response_cache,
+        usage_ledger,
+    )
+    reg_run(
+        mcp,
+        settings,
+        rate_limiter,
+        processes,
+        blob_store,
+        usage_ledger,
+        shell_sessions,
+    )
     reg_file(mcp, settings, rate_limiter)
-    reg_gpu(mcp, rate_limiter)
+    reg_gpu(mcp, rate_limiter, gpu_sampler)
     reg_project(mcp, settings, rate_limiter)
-    reg_system(mcp, rate_limiter)
+    reg_system(mcp, rate_limiter, host_sampler)
+    if blob_store is not None:
+        reg_blobs(mcp, rate_limiter, blob_store)
+    if usage_ledger is not None:
+        fair = (
+            concurrency_limiter
+            if isinstance(concurrency_limiter, FairConcurrencyLimiter)
+            else None
+        )
+        reg_usage(mcp, rate_limiter, usage_ledger, fair)
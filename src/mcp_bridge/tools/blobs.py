@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.blob_store import BlobStore
+    from mcp_bridge.rate_limiter import RateLimiter
+
+MAX_READ_BYTES = 1_000_000
+
+
+def _utf8_start(data: bytes, pos: int) -> int:
+    """Move ``pos`` forward past UTF-8 continuation bytes."""
+    while pos < len(data) and data[pos] & 0xC0 == 0x80:
+        pos += 1
+    return pos
+
+
+def register(
+    mcp: FastMCP,
+    rate_limiter: RateLimiter,
+    store: BlobStore,
+) -> None:
+
+    @mcp.tool()
+    async def blob_read(handle: str, offset: int = 0, length: int = 50_000) -> str:
+        """Read part of a large output stored by a previous tool call.
+
+        Truncated claude_execute/run_command results end with a
+        "[full output: blob <handle>, N bytes]" line; use that handle here
+        to page through the full text.
+
+        Args:
+            handle: Blob handle from a truncated result
+            offset: Byte offset to start reading from (default 0)
+            length: Number of bytes to read (default 50000, max 1000000)
+        """
+        await rate_limiter.check("blob_read")
+
+        length = max(1, min(length, MAX_READ_BYTES))
+        offset = max(0, offset)
+        try:
+            # Read a few extra bytes so the chunk can end on a whole character
+            data, size = await asyncio.to_thread(store.read, handle, offset, length + 3)
+        except KeyError:
+            return f"ERROR: Unknown or expired blob: {handle}"
+
+        start = _utf8_start(data, 0) if offset else 0
+        end = _utf8_start(data, length) if len(data) > length else len(data)
+        text = data[start:end].decode("utf-8", errors="replace")
+        next_offset = offset + end
+        if next_offset >= size:
+            footer = f"[bytes {offset + start}-{next_offset} of {size}; end of blob]"
+        else:
+            footer = (
+                f"[bytes {offset + start}-{next_offset} of {size}; "
+                f"next offset {next_offset}]"
+            )
+        return f"{text}\n{footer}"
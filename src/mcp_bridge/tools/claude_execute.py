@@ -1,15 +1,146 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import os
 import time
 from typing import TYPE_CHECKING
 
+# Resolved at runtime by FastMCP to build the tool schema and inject Context
+from mcp.server.fastmcp import Context
+from pydantic import BaseModel
+
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from mcp.server.fastmcp import FastMCP
 
+    from mcp_bridge.blob_store import BlobStore
+    from mcp_bridge.claude_stream import StreamParser
     from mcp_bridge.config import Settings
+    from mcp_bridge.lifecycle import ProcessTracker
+    from mcp_bridge.quotas import UsageLedger
     from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+    from mcp_bridge.response_cache import ResponseCache
+
+
+# stream-json events can carry whole file contents on a single line
+_STREAM_LINE_LIMIT = 16 * 1024 * 1024
+
+
+class BatchJob(BaseModel):
+    prompt: str
+    working_directory: str = "~/projects"
+
+
+async def _communicate_stream(
+    proc: asyncio.subprocess.Process, parser: StreamParser
+) -> tuple[bytes, bytes]:
+    """Like ``proc.communicate()``, but stdout lines go to ``parser`` as they
+    arrive instead of being buffered."""
+
+    async def read_stdout() -> None:
+        assert proc.stdout is not None
+        async for line in proc.stdout:
+            parser.feed(line)
+
+    assert proc.stderr is not None
+    _, stderr = await asyncio.gather(read_stdout(), proc.stderr.read())
+    await proc.wait()
+    return b"", stderr
+
+
+async def _run_claude(
+    settings: Settings,
+    processes: ProcessTracker,
+    prompt: str,
+    cwd: Path,
+    max_turns: int,
+    timeout_seconds: float,
+    output_format: str = "text",
+    parser: StreamParser | None = None,
+) -> tuple[int | None, str, float, float]:
+    """Run the CLI once; returns (exit code or None on timeout, output,
+    elapsed seconds, CPU seconds).
+
+    With a ``parser`` the CLI emits stream-json, which is parsed as it
+    arrives, and the output is the parser's compact summary.
+    """
+    from mcp_bridge.quotas import cpu_meter
+
+    cmd = [
+        settings.claude_cli_path,
+        "--print",
+        "--dangerously-skip-permissions",
+        "--max-turns",
+        str(max_turns),
+        "--verbose",
+    ]
+    if parser is not None:
+        cmd.extend(["--output-format", "stream-json"])
+    elif output_format == "json":
+        cmd.extend(["--output-format", "json"])
+    cmd.extend(["--prompt", prompt])
+
+    # CRITICAL: unset CLAUDECODE env vars so claude CLI can start
+    env = os.environ.copy()
+    env.pop("CLAUDECODE", None)
+    env.pop("CLAUDE_CODE_ENTRYPOINT", None)
+
+    start = time.monotonic()
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(cwd),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        start_new_session=True,  # own process group, killable as a unit
+        limit=_STREAM_LINE_LIMIT,
+    )
+
+    with processes.track(proc):
+        async with cpu_meter(proc.pid) as meter:
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    proc.communicate() if parser is None
+                    else _communicate_stream(proc, parser),
+                    timeout=timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                processes.kill(proc)
+                await proc.wait()
+                return None, "", time.monotonic() - start, meter.cpu_seconds
+            except (ValueError, asyncio.LimitOverrunError):
+                # A stream-json line longer than the reader's limit
+                processes.kill(proc)
+                # Nothing reads stdout any more: drain it, or a full buffer
+                # pauses the pipe and wait() never sees it close
+                assert proc.stdout is not None
+                while await proc.stdout.read(_STREAM_LINE_LIMIT):
+                    pass
+                await proc.wait()
+                return (
+                    proc.returncode,
+                    f"ERROR: The CLI wrote an output line over {_STREAM_LINE_LIMIT} "
+                    "bytes. Process killed.",
+                    time.monotonic() - start,
+                    meter.cpu_seconds,
+                )
+
+    elapsed = time.monotonic() - start
+    if parser is not None:
+        result = parser.finish().render()
+    else:
+        result = stdout.decode("utf-8", errors="replace")
+
+    if proc.returncode != 0:
+        err = stderr.decode("utf-8", errors="replace")
+        result = (
+            f"Exit code: {proc.returncode}\n\n"
+            f"STDOUT:\n{result}\n\n"
+            f"STDERR:\n{err}"
+        )
+    return proc.returncode, result, elapsed, meter.cpu_seconds
 
 
 def register(
@@ -17,6 +148,10 @@ def register(
     settings: Settings,
     rate_limiter: RateLimiter,
     concurrency_limiter: ConcurrencyLimiter,
+    processes: ProcessTracker,
+    blobs: BlobStore | None = None,
+    responses: ResponseCache | None = None,
+    usage: UsageLedger | None = None,
 ) -> None:
 
     @mcp.tool()
@@ -26,20 +161,35 @@ def register(
         max_turns: int = 5,
         timeout_seconds: int = 300,
         output_format: str = "text",
+        cache: bool = True,
     ) -> str:
         """Execute a prompt via Claude Code CLI on the remote server.
 
         Claude CLI has full access to the filesystem, can read/write files,
         run commands, and complete complex coding tasks autonomously.
 
+        When the server has response caching enabled, a repeated prompt
+        against an unchanged git checkout returns the earlier answer.
+
         Args:
             prompt: The instruction/prompt to execute
             working_directory: Working directory (must be in allowed list)
             max_turns: Maximum agentic turns (default 5, max 20)
             timeout_seconds: Global timeout in seconds (default 300, max 600)
-            output_format: Output format: "text" or "json"
+            output_format: Output format: "text", "json" (the CLI's full JSON
+                result) or "stream" (final answer plus a compact summary of
+                turns, tool calls, cost and tokens)
+            cache: Set to false to force a fresh run (default true)
         """
         from mcp_bridge.audit import get_logger, truncate_for_log
+        from mcp_bridge.claude_stream import StreamParser
+        from mcp_bridge.clients import current_client_id
+        from mcp_bridge.response_cache import cache_key, repo_fingerprint
+        from mcp_bridge.result_shaping import (
+            keep_full_output,
+            policy_for,
+            shape_output,
+        )
         from mcp_bridge.sandbox import validate_path
 
         await rate_limiter.check("claude_execute")
@@ -47,66 +197,216 @@ def register(
         cwd = validate_path(working_directory, settings.allowed_dirs)
         max_turns = min(max_turns, 20)
         timeout_seconds = min(timeout_seconds, settings.claude_max_timeout)
+        logger = get_logger("claude_execute")
+        client = current_client_id()
+
+        # Cache hits are answered without taking a concurrency slot
+        key = fingerprint = None
+        if responses is not None and cache:
+            fingerprint = await repo_fingerprint(cwd)
+            if fingerprint is not None:
+                key = cache_key(
+                    fingerprint,
+                    cwd,
+                    prompt=prompt,
+                    max_turns=max_turns,
+                    output_format=output_format,
+                )
+                if (hit := responses.get(key)) is not None:
+                    logger.info(
+                        "claude_execute_cache_hit",
+                        prompt_preview=prompt[:100],
+                        working_directory=str(cwd),
+                        cache_key=key[:16],
+                    )
+                    return hit
+
+        if usage is not None:
+            await usage.check(client)
 
+        parser = StreamParser() if output_format == "stream" else None
         await concurrency_limiter.acquire()
         try:
-            cmd = [
-                settings.claude_cli_path,
-                "--print",
-                "--dangerously-skip-permissions",
-                "--max-turns",
-                str(max_turns),
-                "--verbose",
-            ]
-            if output_format == "json":
-                cmd.extend(["--output-format", "json"])
-            cmd.extend(["--prompt", prompt])
-
-            # CRITICAL: unset CLAUDECODE env vars so claude CLI can start
-            env = os.environ.copy()
-            env.pop("CLAUDECODE", None)
-            env.pop("CLAUDE_CODE_ENTRYPOINT", None)
-
-            start = time.monotonic()
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=str(cwd),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
+            exit_code, result, elapsed, cpu = await _run_claude(
+                settings, processes, prompt, cwd, max_turns, timeout_seconds,
+                output_format, parser,
             )
+            concurrency_limiter.observe(elapsed)
+            if usage is not None:
+                await usage.record(client, "claude_execute", elapsed, cpu)
+            if exit_code is None:
+                error = f"ERROR: Timeout after {timeout_seconds}s. Process killed."
+                if parser is not None and parser.summary.turns:
+                    error += "\n\nPartial run:\n" + parser.finish().render()
+                return error
 
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    proc.communicate(), timeout=timeout_seconds
-                )
-            except asyncio.TimeoutError:
-                proc.kill()
-                await proc.wait()
-                return f"ERROR: Timeout after {timeout_seconds}s. Process killed."
+            shaped = shape_output(result, policy_for(settings, "claude_execute"))
+            result = shaped.text + await keep_full_output(shaped, result, blobs)
 
-            elapsed = time.monotonic() - start
-            result = stdout.decode("utf-8", errors="replace")
+            # Only replay runs that left the checkout as they found it
+            cached = (
+                key is not None
+                and exit_code == 0
+                and await repo_fingerprint(cwd) == fingerprint
+            )
+            if cached:
+                responses.put(key, result)
 
-            if proc.returncode != 0:
-                err = stderr.decode("utf-8", errors="replace")
-                result = (
-                    f"Exit code: {proc.returncode}\n\n"
-                    f"STDOUT:\n{result}\n\n"
-                    f"STDERR:\n{err}"
-                )
+            stream_stats: dict[str, object] = {}
+            if parser is not None:
+                stream_stats = {
+                    "num_turns": parser.summary.num_turns,
+                    "cost_usd": parser.summary.cost_usd,
+                    "turns": parser.summary.turn_timings(),
+                }
 
-            logger = get_logger("claude_execute")
             logger.info(
                 "claude_execute_completed",
+                client_id=client,
                 prompt_preview=prompt[:100],
                 working_directory=str(cwd),
-                exit_code=proc.returncode,
+                exit_code=exit_code,
                 elapsed_seconds=round(elapsed, 2),
-                output_length=len(result),
+                cpu_seconds=round(cpu, 2),
+                original_size=shaped.original_size,
+                shipped_size=shaped.shipped_size,
+                cached=cached,
                 output_preview=truncate_for_log(result),
+                **stream_stats,
             )
 
             return result
         finally:
             concurrency_limiter.release()
+
+    @mcp.tool()
+    async def claude_execute_batch(
+        jobs: list[BatchJob],
+        ctx: Context,
+        max_parallel: int = 2,
+        max_turns: int = 5,
+        job_timeout_seconds: int = 300,
+        deadline_seconds: int = 1800,
+    ) -> str:
+        """Run Claude Code CLI over several prompts/directories in parallel.
+
+        Use this to apply the same instruction across many repositories.
+        Jobs start in order as concurrency slots free up, but only while
+        another slot stays free, so batches (however many run at once) never
+        take the last slot from interactive claude_execute calls. Progress is
+        reported as each job finishes; the result lists every job's output
+        in order.
+
+        Args:
+            jobs: List of {"prompt": ..., "working_directory": ...} objects
+            max_parallel: Jobs to run at once (default 2, capped by server limit)
+            max_turns: Maximum agentic turns per job (default 5, max 20)
+            job_timeout_seconds: Timeout per job (default 300, max 600)
+            deadline_seconds: Overall deadline; jobs not started by then are
+                skipped and running ones are cut short (default 1800)
+        """
+        from mcp_bridge.audit import get_logger, truncate_for_log
+        from mcp_bridge.clients import current_client_id
+        from mcp_bridge.result_shaping import (
+            keep_full_output,
+            policy_for,
+            shape_output,
+        )
+        from mcp_bridge.sandbox import validate_path
+
+        await rate_limiter.check("claude_execute_batch")
+        client = current_client_id()
+
+        if not jobs:
+            return "ERROR: No jobs given"
+        if len(jobs) > settings.claude_batch_max_jobs:
+            return f"ERROR: At most {settings.claude_batch_max_jobs} jobs per batch"
+        # Validate every directory before starting anything
+        cwds = [validate_path(j.working_directory, settings.allowed_dirs) for j in jobs]
+        max_turns = min(max_turns, 20)
+        job_timeout_seconds = min(job_timeout_seconds, settings.claude_max_timeout)
+        # Jobs acquire with reserve=1, so the limiter keeps one slot free for
+        # interactive claude_execute calls across all batches
+        batch_slots = concurrency_limiter.capacity - 1
+        if batch_slots < 1:
+            return (
+                f"ERROR: Batches need a claude concurrency limit of at least 2 "
+                f"(one slot stays free for claude_execute); it is "
+                f"{concurrency_limiter.capacity} now"
+            )
+        parallel = max(1, min(max_parallel, batch_slots, len(jobs)))
+        deadline = time.monotonic() + deadline_seconds
+
+        # Each job gets an equal share of the result budget
+        policy = policy_for(settings, "claude_execute_batch")
+        policy = dataclasses.replace(policy, max_chars=policy.max_chars // len(jobs))
+
+        logger = get_logger("claude_execute_batch")
+        results: list[str] = [""] * len(jobs)
+        pending = iter(range(len(jobs)))
+        finished = 0
+
+        async def run_job(i: int) -> str:
+            header = f"=== Job {i + 1}/{len(jobs)}: {cwds[i]}"
+            skipped = f"{header} (skipped: deadline reached) ==="
+            if time.monotonic() >= deadline:
+                return skipped
+            if usage is not None:
+                try:
+                    await usage.check(client)
+                except RuntimeError as exc:
+                    return f"{header} (skipped: {exc}) ==="
+            try:
+                await concurrency_limiter.acquire_within(
+                    deadline - time.monotonic(), reserve=1
+                )
+            except RuntimeError:
+                return skipped
+            try:
+                timeout = min(job_timeout_seconds, deadline - time.monotonic())
+                exit_code, output, elapsed, cpu = await _run_claude(
+                    settings, processes, jobs[i].prompt, cwds[i], max_turns, timeout
+                )
+                concurrency_limiter.observe(elapsed)
+                if usage is not None:
+                    await usage.record(client, "claude_execute", elapsed, cpu)
+            finally:
+                concurrency_limiter.release()
+            if exit_code is None:
+                return f"{header} (timeout after {elapsed:.0f}s, killed) ==="
+
+            shaped = shape_output(output, policy)
+            body = shaped.text + await keep_full_output(shaped, output, blobs)
+            logger.info(
+                "batch_job_completed",
+                client_id=client,
+                job=i,
+                prompt_preview=jobs[i].prompt[:100],
+                working_directory=str(cwds[i]),
+                exit_code=exit_code,
+                elapsed_seconds=round(elapsed, 2),
+                original_size=shaped.original_size,
+                shipped_size=shaped.shipped_size,
+                output_preview=truncate_for_log(body),
+            )
+            return f"{header} (exit {exit_code}, {elapsed:.1f}s) ===\n{body}"
+
+        async def worker() -> None:
+            nonlocal finished
+            # Workers pull jobs in order, so they start first-come first-served
+            for i in pending:
+                results[i] = await run_job(i)
+                finished += 1
+                await ctx.report_progress(finished, len(jobs))
+                await ctx.info(results[i].split("\n", 1)[0])
+
+        start = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(parallel)))
+
+        logger.info(
+            "claude_execute_batch_completed",
+            jobs=len(jobs),
+            parallel=parallel,
+            elapsed_seconds=round(time.monotonic() - start, 2),
+        )
+        return "\n\n".join(results)
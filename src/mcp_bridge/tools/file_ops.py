@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import time
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,26 +11,54 @@ if TYPE_CHECKING:
     from mcp_bridge.config import Settings
     from mcp_bridge.rate_limiter import RateLimiter
 
+# How long file_watch keeps collecting after the first matching event
+_WATCH_SETTLE_SECONDS = 0.25
+_WATCH_MAX_EVENTS = 500
+# Files handed to the archive writer thread at a time
+_ARCHIVE_BATCH = 256
+
 
 def register(
     mcp: FastMCP,
     settings: Settings,
     rate_limiter: RateLimiter,
 ) -> None:
+    from mcp_bridge.fs_watch import WatchHub
+
+    from mcp_bridge.transfers import HashCache, TransferSpool
+
+    # Shared by all file_watch calls: one watch per directory
+    hub = WatchHub(poll_interval=settings.file_watch_poll_interval)
+    hashes = HashCache()
+    assert settings.transfer_dir is not None
+    spool = TransferSpool(settings.transfer_dir, ttl=settings.transfer_ttl)
 
     @mcp.tool()
     async def file_read(
         path: str,
         line_start: int | None = None,
         line_end: int | None = None,
+        etag: bool = False,
+        if_none_match: str = "",
     ) -> str:
         """Read a file from the server.
 
+        With etag=true (or if_none_match) the result ends with an
+        "[etag ...]" line, the SHA-256 of the whole file. To check a file
+        again, pass that value as if_none_match: if the file is unchanged
+        only a short "NOT MODIFIED" line comes back. The etag always covers
+        the whole file, also with line_start/line_end: NOT MODIFIED means
+        no line changed, while a new etag may come from a change outside
+        the requested lines.
+
         Args:
             path: Absolute or ~ path to the file (must be in allowed dirs)
             line_start: Optional start line (1-based, inclusive)
             line_end: Optional end line (1-based, inclusive)
+            etag: Append the file's etag to the result
+            if_none_match: Etag from an earlier read of this file (implies etag)
         """
+        from mcp_bridge.result_shaping import policy_for, shape_output
         from mcp_bridge.sandbox import validate_path
 
         await rate_limiter.check("file_read")
@@ -43,7 +74,23 @@ def register(
                 "Use line_start/line_end to read a portion."
             )
 
-        content = resolved.read_text(encoding="utf-8", errors="replace")
+        wanted = if_none_match.strip().strip('"').lower()
+        footer = ""
+        if wanted or etag:
+            # A cached hash is only trusted for files untouched for a while
+            cached = hashes.get(resolved, resolved.stat()) if wanted else None
+            if cached is not None and cached == wanted:
+                return f"NOT MODIFIED: {resolved} [etag {cached}]"
+            # Otherwise the etag is the hash of exactly the bytes returned
+            data, digest = await asyncio.to_thread(hashes.read, resolved)
+            if wanted == digest:
+                return f"NOT MODIFIED: {resolved} [etag {digest}]"
+            footer = f"\n[etag {digest}]"
+        else:
+            data = await asyncio.to_thread(resolved.read_bytes)
+
+        # Newlines translated as read_text would
+        content = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
 
         if line_start is not None or line_end is not None:
             lines = content.splitlines(keepends=True)
@@ -51,7 +98,15 @@ def register(
             end = line_end or len(lines)
             content = "".join(lines[start:end])
 
-        return content
+        shaped = shape_output(content, policy_for(settings, "file_read", verbatim=True))
+        if shaped.changed:
+            return (
+                shaped.text
+                + shaped.footer()
+                + "\n[use line_start/line_end to read the omitted part]"
+                + footer
+            )
+        return content + footer
 
     @mcp.tool()
     async def file_write(
@@ -80,3 +135,318 @@ def register(
             resolved.write_text(content, encoding="utf-8")
 
         return f"OK: Written {len(content)} chars to {resolved}"
+
+    @mcp.tool()
+    async def file_download(
+        path: str = "", offset: int = 0, length: int = 1_048_576, handle: str = ""
+    ) -> str:
+        """Read a chunk of any file (binary-safe) as base64.
+
+        Use this instead of file_read for binary or large files. Call with
+        increasing offsets until the footer says "end of file"; after an
+        interruption, continue from the last offset received. Check each
+        chunk against its sha256, and the reassembled file against the file
+        sha256 (it changes if the file is modified between chunks).
+
+        Args:
+            path: Absolute or ~ path to the file (must be in allowed dirs)
+            offset: Byte offset of the chunk (default 0)
+            length: Chunk size in bytes (default 1MiB, capped by the server)
+            handle: Transfer handle from archive_create, instead of a path
+        """
+        from mcp_bridge.sandbox import validate_path
+        from mcp_bridge.transfers import read_chunk
+
+        await rate_limiter.check("file_download")
+        if handle:
+            try:
+                resolved = spool.path(handle)
+            except KeyError:
+                return f"ERROR: Unknown or expired transfer handle: {handle}"
+        else:
+            resolved = validate_path(path, settings.allowed_dirs)
+        if not resolved.is_file():
+            return f"ERROR: '{resolved}' is not a file or does not exist"
+        if offset < 0:
+            return "ERROR: offset must be >= 0"
+
+        length = max(1, min(length, settings.transfer_max_chunk))
+        data, chunk_sha256, size = await asyncio.to_thread(read_chunk, resolved, offset, length)
+        # Check the offset before hashing: a bad one must not cost a full read
+        if offset > size:
+            return f"ERROR: offset {offset} is past the end of the file ({size} bytes)"
+        file_sha256 = await asyncio.to_thread(hashes.sha256, resolved)
+        end = min(offset + length, size)
+        where = "end of file" if end >= size else f"next offset {end}"
+        return (
+            f"{data.decode('ascii')}\n"
+            f"[bytes {offset}-{end} of {size}; {where}; "
+            f"chunk sha256 {chunk_sha256}; file sha256 {file_sha256}]"
+        )
+
+    @mcp.tool()
+    async def file_upload(
+        path: str,
+        data: str = "",
+        offset: int = 0,
+        chunk_sha256: str = "",
+        complete: bool = False,
+        sha256: str = "",
+    ) -> str:
+        """Write any file (binary-safe) in base64 chunks; resumable.
+
+        Send chunks in order at increasing offsets, then call with
+        complete=true (optionally with the last chunk) to move the file
+        into place. Until then it is kept as a hidden .<name>.upload file
+        next to the target. Call with no data to get the offset to resume
+        from. Sending a chunk at an offset drops anything received after it.
+
+        Args:
+            path: Absolute or ~ path of the target (must be in allowed dirs)
+            data: Base64-encoded chunk (may be empty)
+            offset: Byte offset of the chunk in the file
+            chunk_sha256: Optional SHA-256 (hex) of the decoded chunk
+            complete: Finish the upload and replace the target
+            sha256: Optional SHA-256 (hex) of the whole file, checked on complete
+        """
+        import base64
+        import binascii
+        import hashlib
+
+        from mcp_bridge.sandbox import validate_path
+        from mcp_bridge.transfers import finish_upload, received_bytes, write_chunk
+
+        await rate_limiter.check("file_upload")
+        resolved = validate_path(path, settings.allowed_dirs)
+        if resolved.is_dir():
+            return f"ERROR: '{resolved}' is a directory"
+
+        received = await asyncio.to_thread(received_bytes, resolved)
+        if data:
+            try:
+                chunk = base64.b64decode(data, validate=True)
+            except (binascii.Error, ValueError):
+                return "ERROR: data is not valid base64"
+            if len(chunk) > settings.transfer_max_chunk:
+                return (
+                    f"ERROR: chunk of {len(chunk)} bytes exceeds the "
+                    f"{settings.transfer_max_chunk} byte limit"
+                )
+            if chunk_sha256 and hashlib.sha256(chunk).hexdigest() != chunk_sha256.lower():
+                return f"ERROR: chunk sha256 mismatch; chunk at offset {offset} not written"
+            try:
+                received = await asyncio.to_thread(write_chunk, resolved, offset, chunk)
+            except ValueError as e:
+                return f"ERROR: {e}"
+        if not complete:
+            return f"OK: {received} bytes received for {resolved}; next offset {received}"
+
+        try:
+            size, digest = await asyncio.to_thread(finish_upload, resolved, sha256, hashes)
+        except FileNotFoundError:
+            return f"ERROR: No upload in progress for {resolved}"
+        except ValueError as e:
+            return f"ERROR: {e}; the partial upload was kept, resend chunks to fix it"
+        return f"OK: Written {size} bytes to {resolved} (sha256 {digest})"
+
+    @mcp.tool()
+    async def archive_create(
+        path: str,
+        format: str = "tar.gz",
+        respect_gitignore: bool = True,
+    ) -> str:
+        """Pack a directory into an archive for download with file_download.
+
+        Returns a transfer handle; fetch the archive with
+        file_download(handle=...). Handles expire after a while. In a git
+        checkout, files ignored by .gitignore are left out unless
+        respect_gitignore is false (the .git directory is never included).
+        Paths in the archive are relative to the directory.
+
+        Args:
+            path: Directory to pack (must be in allowed dirs)
+            format: "tar.gz" (default), "tar.zst" or "zip"
+            respect_gitignore: Skip git-ignored files (default true)
+        """
+        from mcp_bridge.archives import FORMATS, ArchiveWriter, list_tree
+        from mcp_bridge.sandbox import validate_path
+
+        await rate_limiter.check("archive_create")
+        resolved = validate_path(path, settings.allowed_dirs)
+        if not resolved.is_dir():
+            return f"ERROR: '{resolved}' is not a directory or does not exist"
+        if format not in FORMATS:
+            return f"ERROR: format must be one of {', '.join(FORMATS)}"
+
+        start = time.monotonic()
+        handle, out = spool.new("." + format)
+        try:
+            writer = await asyncio.to_thread(
+                ArchiveWriter, resolved, out, format, settings.archive_max_mb * 1024 * 1024
+            )
+        except ValueError as e:
+            spool.discard(handle)
+            return f"ERROR: {e}"
+        try:
+            batch: list[str] = []
+            async with contextlib.aclosing(list_tree(resolved, respect_gitignore)) as names:
+                async for name in names:
+                    batch.append(name)
+                    if len(batch) >= _ARCHIVE_BATCH:
+                        await asyncio.to_thread(writer.add_many, batch)
+                        batch = []
+            await asyncio.to_thread(writer.add_many, batch)
+        except ValueError as e:
+            await asyncio.to_thread(writer.close)
+            spool.discard(handle)
+            return f"ERROR: {e}"
+        except BaseException:
+            await asyncio.to_thread(writer.close)
+            spool.discard(handle)
+            raise
+        await asyncio.to_thread(writer.close)
+
+        size = out.stat().st_size
+        digest = await asyncio.to_thread(hashes.sha256, out)
+        return (
+            f"OK: {writer.files} files ({writer.bytes_in} bytes) from {resolved} "
+            f"packed into {size} bytes of {format} in {time.monotonic() - start:.1f}s\n"
+            f"handle: {handle}\n"
+            f"sha256: {digest}\n"
+            f"[download with file_download(handle=\"{handle}\"); "
+            f"expires in {spool.ttl / 60:.0f} min]"
+        )
+
+    @mcp.tool()
+    async def archive_extract(
+        destination: str,
+        path: str = "",
+        handle: str = "",
+        overwrite: bool = False,
+    ) -> str:
+        """Unpack a tar (gz/bz2/xz/zst) or zip archive into a directory.
+
+        Upload the archive with file_upload first (or pass the handle of one
+        made by archive_create). Members that would land outside the
+        destination, absolute paths and device files are refused.
+
+        Args:
+            destination: Directory to unpack into (must be in allowed dirs)
+            path: Path of the archive (must be in allowed dirs)
+            handle: Transfer handle from archive_create, instead of a path
+            overwrite: Replace existing files (default: skip them)
+        """
+        import lzma
+        import tarfile
+        import zipfile
+        import zlib
+
+        from mcp_bridge.archives import extract_archive
+        from mcp_bridge.sandbox import validate_path
+
+        await rate_limiter.check("archive_extract")
+        dest = validate_path(destination, settings.allowed_dirs)
+        if handle:
+            try:
+                archive = spool.path(handle)
+            except KeyError:
+                return f"ERROR: Unknown or expired transfer handle: {handle}"
+        else:
+            archive = validate_path(path, settings.allowed_dirs)
+        if not archive.is_file():
+            return f"ERROR: '{archive}' is not a file or does not exist"
+
+        start = time.monotonic()
+        try:
+            files, size, skipped = await asyncio.to_thread(
+                extract_archive, archive, dest, settings.archive_max_mb * 1024 * 1024, overwrite
+            )
+        except ValueError as e:
+            return f"ERROR: {e} (files unpacked before the error were kept)"
+        except (tarfile.TarError, zipfile.BadZipFile, EOFError, zlib.error, lzma.LZMAError) as e:
+            # tarfile.ReadError for a truncated tar, EOFError or zlib.error
+            # for a truncated or corrupt compressed stream
+            return (
+                f"ERROR: Corrupt or truncated archive: {e or type(e).__name__} "
+                "(files unpacked before the error were kept)"
+            )
+        result = (
+            f"OK: Unpacked {files} files ({size} bytes) into {dest} "
+            f"in {time.monotonic() - start:.1f}s"
+        )
+        if skipped:
+            result += f"; skipped {skipped} existing files (pass overwrite=true to replace)"
+        return result
+
+    @mcp.tool()
+    async def file_watch(
+        path: str,
+        pattern: str = "*",
+        events: str = "create,modify,delete",
+        timeout_seconds: int = 60,
+    ) -> str:
+        """Wait until files matching a pattern are created, modified or deleted.
+
+        Use this instead of polling with file_read or run_command while
+        waiting for a build artifact or log file. Returns as soon as an event
+        matches, together with any further matching events that follow
+        within a fraction of a second. Not recursive.
+
+        Args:
+            path: Directory to watch, or a file (its directory is watched for it)
+            pattern: Glob matched against entry names in the directory (default "*")
+            events: Comma-separated event kinds: create, modify, delete
+            timeout_seconds: Give up after this many seconds (default 60)
+        """
+        from fnmatch import fnmatchcase
+
+        from mcp_bridge.fs_watch import EVENT_KINDS, GONE
+        from mcp_bridge.sandbox import validate_path
+
+        await rate_limiter.check("file_watch")
+        resolved = validate_path(path, settings.allowed_dirs)
+
+        kinds = {k.strip() for k in events.split(",") if k.strip()}
+        if not kinds or not kinds <= set(EVENT_KINDS):
+            return f"ERROR: events must be a subset of {', '.join(EVENT_KINDS)}"
+        if resolved.is_dir():
+            directory = resolved
+        else:
+            directory = validate_path(str(resolved.parent), settings.allowed_dirs)
+            if pattern == "*":
+                pattern = resolved.name
+        if not directory.is_dir():
+            return f"ERROR: '{directory}' is not a directory or does not exist"
+
+        timeout = max(0, min(timeout_seconds, settings.file_watch_max_timeout))
+        start = time.monotonic()
+        deadline = start + timeout
+        matched: dict[tuple[str, str], None] = {}
+        gone = False
+        async with hub.subscribe(directory) as queue:
+            while len(matched) < _WATCH_MAX_EVENTS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if event.kind == GONE:
+                    gone = True
+                    break
+                if event.kind in kinds and fnmatchcase(event.name, pattern):
+                    if not matched:
+                        deadline = min(deadline, time.monotonic() + _WATCH_SETTLE_SECONDS)
+                    matched[(event.kind, event.name)] = None
+
+        elapsed = time.monotonic() - start
+        lines = [f"{kind:<7} {directory / name}" for kind, name in matched]
+        if gone:
+            lines.append(f"watched directory {directory} was removed")
+        if not lines:
+            return (
+                f"No {'/'.join(sorted(kinds))} events matching '{pattern}' "
+                f"in {directory} within {timeout}s"
+            )
+        return f"{len(matched)} event(s) after {elapsed:.1f}s ({hub.backend}):\n" + "\n".join(lines)
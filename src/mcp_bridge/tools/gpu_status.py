@@ -7,19 +7,54 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from mcp.server.fastmcp import FastMCP
 
+    from mcp_bridge.gpu_telemetry import GpuSampler
     from mcp_bridge.rate_limiter import RateLimiter
 
 
-def register(mcp: FastMCP, rate_limiter: RateLimiter) -> None:
+def register(
+    mcp: FastMCP,
+    rate_limiter: RateLimiter,
+    sampler: GpuSampler | None = None,
+) -> None:
 
-    @mcp.tool()
-    async def gpu_status() -> str:
-        """Get GPU status: model, VRAM usage, temperature, running processes.
+    async def nvml_status(sampler: GpuSampler, window_seconds: int) -> str:
+        samples = await sampler.read_now()
+        if not samples:
+            return "GPU: N/A (no NVIDIA GPU found)"
 
-        Returns N/A if no NVIDIA GPU is available.
-        """
-        await rate_limiter.check("gpu_status")
+        result: list[str] = []
+        for s in samples:
+            result.append(
+                f"GPU {s.index}: {s.name} (Bus: {s.bus_id})\n"
+                f"  VRAM: {s.mem_used_mb:.0f}MB / {s.mem_total_mb:.0f}MB "
+                f"(free: {s.mem_free_mb:.0f}MB)\n"
+                f"  Temperature: {s.temperature_c:.0f}C\n"
+                f"  Utilization: GPU {s.util_gpu:.0f}%, Memory {s.util_mem:.0f}%"
+            )
+            count, stats = sampler.window_stats(s.index, window_seconds)
+            if count > 1:
+                util, mem, temp = (
+                    stats["util_gpu"], stats["mem_used_mb"], stats["temperature_c"]
+                )
+                result.append(
+                    f"  Last {window_seconds}s ({count} samples, min/avg/max):\n"
+                    f"    GPU util: {util.min:.0f}/{util.avg:.1f}/{util.max:.0f}%\n"
+                    f"    VRAM used: {mem.min:.0f}/{mem.avg:.0f}/{mem.max:.0f}MB\n"
+                    f"    Temperature: {temp.min:.0f}/{temp.avg:.1f}/{temp.max:.0f}C"
+                )
+
+        procs = await asyncio.to_thread(sampler.backend.processes)
+        if procs:
+            result.append("\nRunning GPU processes:")
+            for p in procs:
+                used = f"{p.used_mb:.0f}MB" if p.used_mb is not None else "N/A"
+                result.append(f"  {p.pid}, {p.name}, {used}")
+        else:
+            result.append("\nNo GPU processes running")
 
+        return "\n".join(result)
+
+    async def nvidia_smi_status() -> str:
         if not shutil.which("nvidia-smi"):
             return "GPU: N/A (nvidia-smi not found on this system)"
 
@@ -68,3 +103,25 @@ def register(mcp: FastMCP, rate_limiter: RateLimiter) -> None:
             result.append("\nNo GPU processes running")
 
         return "\n".join(result)
+
+    @mcp.tool()
+    async def gpu_status(window_seconds: int = 300) -> str:
+        """Get GPU status: model, VRAM usage, temperature, running processes.
+
+        With NVML available, also reports min/avg/max utilization, VRAM and
+        temperature over the trailing window from the background sampler.
+        Returns N/A if no NVIDIA GPU is available.
+
+        Args:
+            window_seconds: History window for min/avg/max (default 300)
+        """
+        await rate_limiter.check("gpu_status")
+
+        if sampler is not None and sampler.available:
+            try:
+                return await nvml_status(sampler, window_seconds)
+            except Exception as exc:  # pynvml.NVMLError: driver reset, GPU lost
+                from mcp_bridge.audit import get_logger
+
+                get_logger("gpu_status").warning("nvml_read_failed", error=str(exc))
+        return await nvidia_smi_status()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
-from typing import TYPE_CHECKING
+import os
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
     from mcp.server.fastmcp import FastMCP
@@ -9,6 +11,110 @@ if TYPE_CHECKING:
     from mcp_bridge.config import Settings
     from mcp_bridge.rate_limiter import RateLimiter
 
+DIFF_MODES = ("unstaged", "staged", "all")
+# Files listed in the numstat summary before "... N more"
+_SUMMARY_MAX_FILES = 200
+_MAX_DIFF_CHARS = 100_000
+# Files whose paths are passed to the git diff of one page, at most
+_PAGE_MAX_FILES = 100
+_READ_SIZE = 64 * 1024
+_GIT_TIMEOUT = 15
+
+
+class FileStat(NamedTuple):
+    added: int | None  # None for binary files
+    deleted: int | None
+    path: str
+    pathspecs: tuple[str, ...]  # raw path(s), both sides of a rename
+
+
+def parse_numstat(output: bytes) -> list[FileStat]:
+    """Entries of ``git diff --numstat -z`` (renames as "old => new")."""
+    fields = output.split(b"\0")
+    stats: list[FileStat] = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        added, deleted, path = fields[i].split(b"\t", 2)
+        raw = [path]
+        if not path:  # rename or copy: the two paths follow
+            raw = [fields[i + 1], fields[i + 2]]
+            path = b" => ".join(raw)
+            i += 2
+        i += 1
+        stats.append(FileStat(
+            None if added == b"-" else int(added),
+            None if deleted == b"-" else int(deleted),
+            path.decode("utf-8", errors="replace"),
+            tuple(os.fsdecode(r) for r in raw),
+        ))
+    return stats
+
+
+async def _lines(stream: asyncio.StreamReader, limit: int) -> AsyncIterator[bytes]:
+    """Lines of ``stream`` read in fixed-size chunks, cut at ``limit`` bytes.
+
+    Only the first ``limit`` bytes of a longer line are kept; the rest is
+    read and dropped, so memory stays bounded however long the line is.
+    """
+    pending = b""
+    dropping = False  # past the limit of the current line
+    while chunk := await stream.read(_READ_SIZE):
+        *complete, tail = chunk.split(b"\n")
+        for part in complete:
+            if not dropping:
+                yield (pending + part)[:limit] + b"\n"
+            pending, dropping = b"", False
+        if not dropping:
+            pending += tail
+            if len(pending) > limit:
+                yield pending[:limit]
+                pending, dropping = b"", True
+    if pending:
+        yield pending
+
+
+async def read_diff_page(
+    stream: asyncio.StreamReader, skip_files: int, budget: int
+) -> tuple[str, int, bool]:
+    """Whole-file diffs from ``stream``, after skipping ``skip_files`` files.
+
+    Stops reading as soon as the next file would not fit in ``budget``
+    chars; a first file larger than the budget is cut. Returns (text,
+    files shown, whether the last one was cut).
+    """
+    page: list[str] = []
+    used = 0
+    current: list[str] = []  # the file being read, added once it is complete
+    current_size = 0
+    index = -1
+    shown = 0
+    cut = False
+    # A line longer than the budget is cut anyway: keep no more of it than
+    # decodes to over ``budget`` chars (a char is at most 4 bytes)
+    async for raw in _lines(stream, 4 * (budget + 1)):
+        line = raw.decode("utf-8", errors="replace")
+        if line.startswith("diff --git "):
+            index += 1
+            page.extend(current)
+            used += current_size
+            current, current_size = [], 0
+            if index >= skip_files:
+                shown += 1
+        if index < skip_files:
+            continue
+        if used + current_size + len(line) > budget:
+            if shown > 1:  # does not fit after the others: next page
+                shown -= 1
+                current = []
+            else:
+                current.append(line[: budget - current_size])
+                cut = True
+            break
+        current.append(line)
+        current_size += len(line)
+    page.extend(current)
+    return "".join(page), shown, cut
+
 
 def register(
     mcp: FastMCP,
@@ -21,20 +127,35 @@ def register(
         project_path: str,
         include_diff: bool = False,
         log_count: int = 5,
+        diff_mode: str = "unstaged",
+        diff_ref: str = "",
+        diff_paths: str = "",
+        diff_offset: int = 0,
+        diff_max_chars: int = 10_000,
     ) -> str:
         """Get git status of a project: branch, status, recent commits, optionally diff.
 
+        With include_diff, a per-file summary (+added -deleted) of all
+        changed files comes first, then a page of whole-file diffs. Pass the
+        "next: diff_offset=N" value from the result to get the following
+        page, and diff_paths to narrow the diff to some files.
+
         Args:
             project_path: Path to the project (must be in allowed dirs)
             include_diff: Include diff of uncommitted changes
             log_count: Number of recent commits to show (default 5)
+            diff_mode: "unstaged" (default), "staged", or "all" (working tree vs HEAD)
+            diff_ref: Compare against this ref instead of HEAD (staged/all only)
+            diff_paths: Comma-separated pathspecs to limit the diff to
+            diff_offset: Index of the first file of the diff page (default 0)
+            diff_max_chars: Size of a diff page (default 10000, max 100000)
         """
         from mcp_bridge.sandbox import validate_path
 
         await rate_limiter.check("project_status")
         cwd = validate_path(project_path, settings.allowed_dirs)
 
-        async def run_git(args: list[str]) -> str:
+        async def git_output(args: list[str]) -> tuple[int | None, bytes, bytes]:
             proc = await asyncio.create_subprocess_exec(
                 "git",
                 *args,
@@ -42,11 +163,97 @@ def register(
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=15)
-            if proc.returncode != 0:
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=_GIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
+            return proc.returncode, stdout, stderr
+
+        async def run_git(args: list[str]) -> str:
+            returncode, stdout, stderr = await git_output(args)
+            if returncode != 0:
                 return f"(git error: {stderr.decode().strip()})"
             return stdout.decode().strip()
 
+        async def diff_section() -> str:
+            if diff_mode not in DIFF_MODES:
+                return f"\nDiff: (diff_mode must be one of {', '.join(DIFF_MODES)})"
+            if diff_ref.startswith("-"):
+                return "\nDiff: (diff_ref must be a ref, not an option)"
+            if diff_ref and diff_mode == "unstaged":
+                return "\nDiff: (diff_ref needs diff_mode staged or all)"
+            args = ["diff", "--no-color", "--no-ext-diff"]
+            if diff_mode == "staged":
+                args += ["--cached", diff_ref or "HEAD"]
+            elif diff_mode == "all":
+                args.append(diff_ref or "HEAD")
+            pathspecs = [p.strip() for p in diff_paths.split(",") if p.strip()]
+            what = diff_mode + (f" vs {diff_ref}" if diff_ref else "")
+
+            try:
+                returncode, numstat, stderr = await git_output(
+                    ["diff", "--numstat", "-z", *args[1:], "--", *pathspecs]
+                )
+            except asyncio.TimeoutError:
+                return "\nDiff: (git diff timed out)"
+            if returncode != 0:
+                return f"\nDiff: (git error: {stderr.decode().strip()})"
+            stats = parse_numstat(numstat)
+            if not stats:
+                return f"\nDiff: (no {what} changes)"
+            added = sum(s.added or 0 for s in stats)
+            deleted = sum(s.deleted or 0 for s in stats)
+            lines = [f"\nDiff summary ({what}, {len(stats)} files, +{added} -{deleted}):"]
+            for s in stats[:_SUMMARY_MAX_FILES]:
+                counts = "binary" if s.added is None else f"+{s.added} -{s.deleted}"
+                lines.append(f"  {counts:>13}  {s.path}")
+            if len(stats) > _SUMMARY_MAX_FILES:
+                lines.append(f"  ... {len(stats) - _SUMMARY_MAX_FILES} more files")
+
+            offset = max(0, diff_offset)
+            if offset >= len(stats):
+                lines.append(f"\n(diff_offset {offset} is past the last file)")
+                return "\n".join(lines)
+            budget = max(1, min(diff_max_chars, _MAX_DIFF_CHARS))
+            # Diff only the files that can be on this page, named literally,
+            # so git does not compute the earlier pages again
+            page_files = stats[offset : offset + _PAGE_MAX_FILES]
+            proc = await asyncio.create_subprocess_exec(
+                "git",
+                "--literal-pathspecs",
+                *args,
+                "--",
+                *(path for s in page_files for path in s.pathspecs),
+                cwd=str(cwd),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            assert proc.stdout is not None
+            try:
+                text, shown, cut = await asyncio.wait_for(
+                    read_diff_page(proc.stdout, 0, budget), timeout=_GIT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                lines.append("\n(git diff timed out)")
+                return "\n".join(lines)
+            finally:
+                # Stop git rather than let it compute diffs nobody will read
+                if proc.returncode is None:
+                    proc.kill()
+                await proc.wait()
+
+            end = offset + shown
+            header = f"\nDiff of files {offset + 1}-{end} of {len(stats)}"
+            if end < len(stats):
+                header += f" (next: diff_offset={end})"
+            lines.append(header + ":")
+            lines.append(text.rstrip("\n"))
+            if cut:
+                lines.append(f"... [diff of this file cut at {budget} chars]")
+            return "\n".join(lines)
+
         parts: list[str] = []
 
         branch = await run_git(["branch", "--show-current"])
@@ -59,12 +266,6 @@ def register(
         parts.append(f"\nRecent commits:\n{log}")
 
         if include_diff:
-            diff = await run_git(["diff"])
-            if diff:
-                if len(diff) > 5000:
-                    diff = diff[:5000] + f"\n... [truncated, {len(diff)} chars total]"
-                parts.append(f"\nDiff:\n{diff}")
-            else:
-                parts.append("\nDiff: (no unstaged changes)")
+            parts.append(await diff_section())
 
         return "\n".join(parts)
@@ -8,14 +8,22 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from mcp.server.fastmcp import FastMCP
 
+    from mcp_bridge.blob_store import BlobStore
     from mcp_bridge.config import Settings
+    from mcp_bridge.lifecycle import ProcessTracker
+    from mcp_bridge.quotas import UsageLedger
     from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.shell_sessions import ShellSessions
 
 
 def register(
     mcp: FastMCP,
     settings: Settings,
     rate_limiter: RateLimiter,
+    processes: ProcessTracker,
+    blobs: BlobStore | None = None,
+    usage: UsageLedger | None = None,
+    shells: ShellSessions | None = None,
 ) -> None:
 
     @mcp.tool()
@@ -23,45 +31,117 @@ def register(
         command: str,
         working_directory: str = "~/projects",
         timeout_seconds: int = 60,
+        session: str = "",
     ) -> str:
         """Execute a bash command on the remote server.
 
         For simple operations (build, test, git, status checks).
         For complex tasks requiring reasoning, use claude_execute instead.
 
+        Pass a session name to run in a persistent bash that keeps its cwd,
+        environment and activated virtualenvs between calls; the first call
+        starts it in working_directory, later calls ignore working_directory
+        (use cd). Idle sessions are closed automatically.
+
         Args:
             command: Bash command to execute
             working_directory: Working directory (must be in allowed list)
             timeout_seconds: Timeout in seconds (default 60, max 300)
+            session: Optional persistent shell session name
         """
         from mcp_bridge.audit import get_logger, truncate_for_log
+        from mcp_bridge.clients import current_client_id
+        from mcp_bridge.quotas import cpu_meter
+        from mcp_bridge.result_shaping import (
+            keep_full_output,
+            policy_for,
+            shape_output,
+        )
         from mcp_bridge.sandbox import validate_command, validate_path
+        from mcp_bridge.shell_sessions import (
+            CommandOverrun,
+            CommandTimeout,
+            SessionBusy,
+        )
 
         await rate_limiter.check("run_command")
 
         cwd = validate_path(working_directory, settings.allowed_dirs)
         validate_command(command, settings.blocked_commands)
         timeout_seconds = min(timeout_seconds, 300)
+        client = current_client_id()
+        if usage is not None:
+            await usage.check(client)
+        if session and shells is None:
+            return "ERROR: Shell sessions are disabled on this server"
 
+        notes: list[str] = []
         start = time.monotonic()
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            cwd=str(cwd),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            env={**os.environ, "TERM": "dumb"},
-        )
-
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(), timeout=timeout_seconds
+        if session:
+            assert shells is not None
+            shell, created = await shells.get(client, session, cwd)
+            previous_cwd = shell.cwd
+            try:
+                result = await shell.run(command, timeout_seconds, processes)
+            except SessionBusy as e:
+                return f"ERROR: {e}"
+            except (CommandTimeout, CommandOverrun) as e:
+                shells.close(client, session)
+                if usage is not None:
+                    await usage.record(
+                        client, "run_command", time.monotonic() - start, e.cpu_seconds
+                    )
+                if isinstance(e, CommandOverrun):
+                    return f"ERROR: {e}"
+                return (
+                    f"ERROR: Timeout after {timeout_seconds}s; "
+                    f"session '{session}' was closed"
+                )
+            stdout, stderr = result.stdout, result.stderr
+            returncode, cpu_seconds = result.exit_code, result.cpu_seconds
+            cwd = result.cwd
+            if result.ended:
+                shells.close(client, session)
+                notes.append(f"session '{session}' ended (the shell exited)")
+            else:
+                try:
+                    validate_path(str(cwd), settings.allowed_dirs)
+                except ValueError:
+                    shell.reset_cwd(previous_cwd)
+                    notes.append(
+                        f"cwd {cwd} is outside the allowed directories; "
+                        f"session reset to {previous_cwd}"
+                    )
+                    cwd = previous_cwd
+            if created:
+                notes.insert(0, f"started session '{session}'")
+        else:
+            proc = await asyncio.create_subprocess_shell(
+                command,
+                cwd=str(cwd),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env={**os.environ, "TERM": "dumb"},
+                start_new_session=True,  # own process group, killable as a unit
             )
-        except asyncio.TimeoutError:
-            proc.kill()
-            await proc.wait()
-            return f"ERROR: Timeout after {timeout_seconds}s"
+
+            with processes.track(proc):
+                async with cpu_meter(proc.pid) as meter:
+                    try:
+                        stdout, stderr = await asyncio.wait_for(
+                            proc.communicate(), timeout=timeout_seconds
+                        )
+                    except asyncio.TimeoutError:
+                        processes.kill(proc)
+                        await proc.wait()
+                        stdout = None
+            returncode, cpu_seconds = proc.returncode, meter.cpu_seconds
 
         elapsed = time.monotonic() - start
+        if usage is not None:
+            await usage.record(client, "run_command", elapsed, cpu_seconds)
+        if stdout is None:
+            return f"ERROR: Timeout after {timeout_seconds}s"
 
         parts: list[str] = []
         if stdout:
@@ -70,18 +150,59 @@ def register(
             parts.append(
                 f"\n--- STDERR ---\n{stderr.decode('utf-8', errors='replace')}"
             )
-        parts.append(f"\n--- Exit code: {proc.returncode} | Time: {elapsed:.1f}s ---")
+        footer = f"Exit code: {returncode} | Time: {elapsed:.1f}s"
+        if session:
+            footer += f" | Session: {session} in {cwd}"
+        parts.append(f"\n--- {footer} ---")
+        parts.extend(f"\n[{note}]" for note in notes)
 
-        result = "".join(parts)
+        output = "".join(parts)
+        shaped = shape_output(output, policy_for(settings, "run_command"))
+        result_text = shaped.text + await keep_full_output(shaped, output, blobs)
 
         logger = get_logger("run_command")
         logger.info(
             "run_command_completed",
+            client_id=client,
             command_preview=command[:100],
             working_directory=str(cwd),
-            exit_code=proc.returncode,
+            session=session or None,
+            exit_code=returncode,
             elapsed_seconds=round(elapsed, 2),
-            output_preview=truncate_for_log(result),
+            cpu_seconds=round(cpu_seconds, 2),
+            original_size=shaped.original_size,
+            shipped_size=shaped.shipped_size,
+            output_preview=truncate_for_log(result_text),
         )
 
-        return result
+        return result_text
+
+    @mcp.tool()
+    async def shell_sessions(close: str = "") -> str:
+        """List your persistent run_command shell sessions, or close one.
+
+        Args:
+            close: Name of a session to close (optional)
+        """
+        from mcp_bridge.clients import current_client_id
+
+        await rate_limiter.check("shell_sessions")
+        if shells is None:
+            return "Shell sessions are disabled on this server"
+        client = current_client_id()
+        lines = []
+        if close:
+            closed = shells.close(client, close)
+            lines.append(f"Closed session '{close}'" if closed else f"No session '{close}'")
+        now = time.monotonic()
+        sessions = shells.list(client)
+        lines.append(
+            f"{len(sessions)} session(s) (server limit {shells.max_sessions}, "
+            f"idle timeout {shells.idle_timeout:g}s)"
+        )
+        for s in sorted(sessions, key=lambda s: s.name):
+            lines.append(
+                f"  {s.name:<20} {'busy' if s.busy else 'idle':<5} "
+                f"{s.commands:>5} cmds  idle {now - s.last_used:>6.0f}s  {s.cwd}"
+            )
+        return "\n".join(lines)
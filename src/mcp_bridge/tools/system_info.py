@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mcp.server.fastmcp import FastMCP
 
+    from mcp_bridge.host_metrics import HostSampler
     from mcp_bridge.rate_limiter import RateLimiter
 
 
-def register(mcp: FastMCP, rate_limiter: RateLimiter) -> None:
+def register(
+    mcp: FastMCP,
+    rate_limiter: RateLimiter,
+    sampler: HostSampler | None = None,
+) -> None:
 
     @mcp.tool()
     async def system_info() -> str:
@@ -44,3 +50,55 @@ def register(mcp: FastMCP, rate_limiter: RateLimiter) -> None:
         parts.append(f"\nTop processes:\n{top}")
 
         return "\n".join(parts)
+
+    @mcp.tool()
+    async def system_history(
+        window_seconds: int = 3600,
+        points: int = 60,
+        metrics: str = "load1,mem_used_mb,disk_used_pct",
+    ) -> str:
+        """Get host metric trends from the in-memory sampler (no new processes).
+
+        Returns a CSV time series downsampled to at most `points` rows, using
+        the finest stored resolution (raw samples, 1m or 15m) that covers
+        the window, followed by the most recent top-process snapshot.
+
+        Args:
+            window_seconds: How far back to look (default 3600, max 7 days)
+            points: Maximum number of rows to return (default 60)
+            metrics: Comma-separated subset of load1, load5, load15,
+                mem_used_mb, mem_available_mb, swap_used_mb, disk_used_pct
+        """
+        from mcp_bridge.host_metrics import HOST_FIELDS, wall_clock
+
+        await rate_limiter.check("system_history")
+
+        if sampler is None:
+            return "ERROR: Host metrics sampler is disabled (HOST_SAMPLE_INTERVAL=0)"
+
+        wanted = [m.strip() for m in metrics.split(",") if m.strip()]
+        unknown = [m for m in wanted if m not in HOST_FIELDS]
+        if unknown:
+            return f"ERROR: Unknown metrics {unknown}; choose from {list(HOST_FIELDS)}"
+
+        window_seconds = min(window_seconds, 7 * 24 * 3600)
+        resolution, ts, series = sampler.history(window_seconds, points)
+        if not ts:
+            return f"No samples yet in the last {window_seconds}s"
+
+        lines = [
+            f"Resolution: {resolution}, {len(ts)} rows over the last {window_seconds}s",
+            "time," + ",".join(wanted),
+        ]
+        for i, t in enumerate(ts):
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(wall_clock(t)))
+            lines.append(stamp + "," + ",".join(f"{series[m][i]:.2f}" for m in wanted))
+
+        if sampler.top_processes:
+            snap_ts, procs = sampler.top_processes[-1]
+            age = int(time.monotonic() - snap_ts)
+            lines.append(f"\nTop processes ({age}s ago): pid, name, cpu%, rss MB")
+            for p in procs:
+                lines.append(f"  {p.pid}, {p.name}, {p.cpu_percent:.1f}, {p.rss_mb:.0f}")
+
+        return "\n".join(lines)
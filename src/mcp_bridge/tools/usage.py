@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.fair_queue import FairConcurrencyLimiter
+    from mcp_bridge.quotas import UsageLedger
+    from mcp_bridge.rate_limiter import RateLimiter
+
+
+def register(
+    mcp: FastMCP,
+    rate_limiter: RateLimiter,
+    ledger: UsageLedger,
+    fair: FairConcurrencyLimiter | None = None,
+) -> None:
+
+    @mcp.tool()
+    async def usage_report(days: int = 1) -> str:
+        """Show per-client runtime and CPU usage of claude_execute/run_command.
+
+        Args:
+            days: Number of most recent UTC days to include (default 1, max 7)
+        """
+        from mcp_bridge.clients import current_client_id
+        from mcp_bridge.quotas import Usage, utc_day
+
+        await rate_limiter.check("usage_report")
+
+        def limit(value: float) -> str:
+            return f"{value:g}s/day" if value else "unlimited"
+
+        lines = [
+            f"Quotas per client: runtime {limit(ledger.daily_runtime_seconds)}, "
+            f"CPU {limit(ledger.daily_cpu_seconds)}",
+            f"You are: {current_client_id()}",
+        ]
+        now = time.time()
+        days = max(1, min(days, 7))
+        for day in [utc_day(now - 86400 * k) for k in reversed(range(days))]:
+            usage = await ledger.usage(day)
+            lines.append(f"\n{day} (UTC)")
+            if not usage:
+                lines.append("  (no usage)")
+                continue
+            totals: dict[str, Usage] = {}
+            lines.append(
+                f"  {'client':<28} {'tool':<16} {'calls':>6} {'runtime_s':>10} {'cpu_s':>8}"
+            )
+            for (client, tool), u in sorted(usage.items()):
+                totals.setdefault(client, Usage()).add(u)
+                lines.append(
+                    f"  {client:<28} {tool:<16} {u.calls:>6} "
+                    f"{u.runtime_s:>10.1f} {u.cpu_s:>8.1f}"
+                )
+            for client, total in sorted(totals.items()):
+                lines.append(
+                    f"  {client:<28} {'TOTAL':<16} {total.calls:>6} "
+                    f"{total.runtime_s:>10.1f} {total.cpu_s:>8.1f}"
+                )
+
+        if fair is not None:
+            queued = fair.queued()
+            lines.append("\nclaude_execute queue (weight, granted, waiting):")
+            for client in sorted(set(fair.granted) | set(queued)):
+                lines.append(
+                    f"  {client:<28} {fair.weight(client):>6g} "
+                    f"{fair.granted[client]:>8} {queued[client]:>8}"
+                )
+        return "\n".join(lines)
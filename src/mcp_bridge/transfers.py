@@ -0,0 +1,257 @@
+"""Binary-safe, resumable file transfer in base64 chunks.
+
+Downloads read a chunk at an explicit offset with ``os.preadv`` into one
+buffer, which is hashed and base64-encoded in place. Each chunk is returned
+with its own SHA-256 and the SHA-256 of the whole file. Whole files are
+hashed through a fixed-size buffer and the hashes kept in a
+:class:`HashCache` keyed on the file's identity, size and mtime. Like
+git's index, the cache ignores files modified less than two seconds before
+they were hashed: a same-size rewrite within one mtime tick would otherwise
+keep its old hash. Files are
+never mapped: another process truncating a mapped file would kill the
+server with SIGBUS, while a read just comes back short.
+
+An upload writes into a hidden ``.<name>.upload`` file next to the target.
+Writing at ``offset`` keeps the bytes before it and drops anything after
+the new chunk, so the partial file never has holes or stale tails and its
+size is always the offset to resume from. Completing an upload checks the
+whole-file SHA-256 and atomically renames the partial file over the target.
+
+Files the server produces for a client to fetch (archives) go into a
+:class:`TransferSpool` and are addressed by an opaque handle instead of a
+path; they are deleted ``ttl`` seconds after they were written.
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import hashlib
+import os
+import re
+import secrets
+import stat
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+_HASH_BUFFER = 1024 * 1024
+# Files modified this recently when hashed may change again without a
+# visible mtime change, so their hashes are not cached
+_RACY_SECONDS = 2.0
+_SPOOL_HANDLE_RE = re.compile(r"[0-9a-f]{32}(\.[a-z0-9]+)*")
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _pread_into(fd: int, buffer: memoryview, offset: int) -> int:
+    """Fill ``buffer`` from ``offset``; fewer bytes only at end of file."""
+    filled = 0
+    while filled < len(buffer):
+        n = os.preadv(fd, [buffer[filled:]], offset + filled)
+        if n == 0:
+            break
+        filled += n
+    return filled
+
+
+def _hash_fd(fd: int, size: int) -> str:
+    """SHA-256 of the first ``size`` bytes of ``fd`` (less if it shrank)."""
+    h = hashlib.sha256()
+    buffer = memoryview(bytearray(min(size, _HASH_BUFFER)))
+    offset = 0
+    while offset < size:
+        n = _pread_into(fd, buffer[: size - offset], offset)
+        if n == 0:
+            break
+        h.update(buffer[:n])
+        offset += n
+    return h.hexdigest()
+
+
+class HashCache:
+    """SHA-256 of files, cached per path until their size or mtime changes."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Path, tuple[tuple[int, int, int, int], str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Path, st: os.stat_result) -> str | None:
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != _stat_key(st):
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+
+    def put(
+        self, path: Path, st: os.stat_result, digest: str, hashed_at: float | None = None
+    ) -> None:
+        """Cache ``digest`` for ``path`` as of ``st``, if that mtime is safe to trust."""
+        hashed_at = time.time() if hashed_at is None else hashed_at
+        with self._lock:
+            if hashed_at - st.st_mtime < _RACY_SECONDS:
+                self._entries.pop(path, None)
+                return
+            self._entries[path] = (_stat_key(st), digest)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def sha256(self, path: Path) -> str:
+        """Hash of ``path``; blocking, call from a thread for large files."""
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if (digest := self.get(path, st)) is not None:
+                return digest
+            hashed_at = time.time()
+            digest = _hash_fd(f.fileno(), st.st_size)
+            # Only cache if the file did not change while we were reading it
+            if _stat_key(os.fstat(f.fileno())) == _stat_key(st):
+                self.put(path, st, digest, hashed_at)
+            return digest
+
+    def read(self, path: Path) -> tuple[bytes, str]:
+        """Contents and hash of a small file, read once; caches the hash."""
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            hashed_at = time.time()
+            data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            if _stat_key(os.fstat(f.fileno())) == _stat_key(st):
+                self.put(path, st, digest, hashed_at)
+            return data, digest
+
+
+def read_chunk(path: Path, offset: int, length: int) -> tuple[bytes, str, int]:
+    """Base64 of ``length`` bytes at ``offset``, their SHA-256, and the file size."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if offset >= size or length <= 0:
+            return b"", _EMPTY_SHA256, size
+        buffer = memoryview(bytearray(min(length, size - offset)))
+        n = _pread_into(f.fileno(), buffer, offset)
+        if n < len(buffer):  # truncated since the fstat
+            buffer, size = buffer[:n], offset + n
+        return base64.b64encode(buffer), hashlib.sha256(buffer).hexdigest(), size
+
+
+def partial_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.upload")
+
+
+def received_bytes(path: Path) -> int:
+    """Bytes of an unfinished upload to ``path`` (0 if none)."""
+    try:
+        return partial_path(path).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def write_chunk(path: Path, offset: int, data: bytes) -> int:
+    """Write ``data`` at ``offset`` of the upload to ``path``.
+
+    Returns the bytes received so far. Raises ValueError if ``offset`` is
+    past the end of what was received (the gap would be a hole).
+    """
+    partial = partial_path(path)
+    partial.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(partial, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if offset > size:
+            raise ValueError(
+                f"offset {offset} is past the {size} bytes received; resume at {size}"
+            )
+        end = offset + len(data)
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        os.ftruncate(fd, end)
+        return end
+    finally:
+        os.close(fd)
+
+
+def finish_upload(
+    path: Path, expected_sha256: str = "", hashes: HashCache | None = None
+) -> tuple[int, str]:
+    """Check the upload to ``path`` and move it into place.
+
+    Returns (size, sha256). Raises FileNotFoundError if nothing was
+    uploaded and ValueError on a checksum mismatch (the partial file is
+    kept so the client can re-send chunks).
+    """
+    partial = partial_path(path)
+    with open(partial, "rb") as f:
+        st = os.fstat(f.fileno())
+        digest = _hash_fd(f.fileno(), st.st_size)
+        if expected_sha256 and digest != expected_sha256.lower():
+            raise ValueError(
+                f"sha256 mismatch: received {st.st_size} bytes hashing to {digest}"
+            )
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+    if hashes is not None:
+        hashes.put(path, path.stat(), digest)
+    return st.st_size, digest
+
+
+class TransferSpool:
+    """Server-made files for download, addressed by handle and expired by age."""
+
+    def __init__(self, root: Path, ttl: float = 3600.0) -> None:
+        self.root = root
+        self.ttl = ttl
+
+    def new(self, suffix: str = "") -> tuple[str, Path]:
+        """A fresh (handle, path) to write to; also drops expired files."""
+        self.root.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self.sweep()
+        handle = secrets.token_hex(16) + suffix
+        return handle, self.root / handle
+
+    def path(self, handle: str) -> Path:
+        """The file for ``handle``; KeyError if unknown or expired."""
+        if not _SPOOL_HANDLE_RE.fullmatch(handle):
+            raise KeyError(handle)
+        path = self.root / handle
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            raise KeyError(handle) from None
+        if not stat.S_ISREG(st.st_mode):
+            raise KeyError(handle)
+        # Do not rely on the sweeper having run since the file expired
+        if time.time() - st.st_mtime > self.ttl:
+            path.unlink(missing_ok=True)
+            raise KeyError(handle)
+        return path
+
+    def discard(self, handle: str) -> None:
+        with contextlib.suppress(KeyError):
+            self.path(handle).unlink(missing_ok=True)
+
+    def sweep(self, now: float | None = None) -> int:
+        now = time.time() if now is None else now
+        removed = 0
+        try:
+            entries = list(os.scandir(self.root))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            with contextlib.suppress(FileNotFoundError):
+                if now - entry.stat().st_mtime > self.ttl:
+                    os.unlink(entry.path)
+                    removed += 1
+        return removed
@@ -0,0 +1,89 @@
+"""Tests for the AIMD concurrency limiter with a fake pressure sensor."""
+
+import pytest
+
+from mcp_bridge.adaptive_limiter import AdaptiveConcurrencyLimiter
+
+
+class FakeSensor:
+    def __init__(self) -> None:
+        self.load = 0.2
+        self.mem = 0.5
+
+    def __call__(self) -> tuple[float, float]:
+        return self.load, self.mem
+
+
+def make(initial=2, **kwargs):
+    sensor = FakeSensor()
+    limiter = AdaptiveConcurrencyLimiter(
+        initial, min_limit=1, max_limit=8, sensor=sensor, **kwargs
+    )
+    return limiter, sensor
+
+
+async def test_grows_by_one_when_saturated():
+    limiter, _ = make()
+    await limiter.acquire()
+    await limiter.acquire()
+    with pytest.raises(RuntimeError, match="Max concurrent"):
+        await limiter.acquire()
+
+    change = limiter.adjust(now=1.0)
+    assert (change.old, change.new, change.reason) == (2, 3, "saturated")
+    await limiter.acquire()  # the new slot is usable right away
+    assert limiter.in_use == 3
+
+    for _ in range(3):
+        limiter.release()
+    assert limiter.adjust(now=2.0).new == 4  # all slots were busy meanwhile
+    assert limiter.adjust(now=3.0) is None  # idle: no change
+
+
+async def test_cuts_multiplicatively_under_pressure():
+    limiter, sensor = make(initial=8)
+    sensor.load = 3.0
+    change = limiter.adjust()
+    assert (change.new, change.reason) == (5, "load 3.00/cpu")
+
+    sensor.load, sensor.mem = 0.2, 0.05
+    assert limiter.adjust().new == 3
+    assert limiter.adjust().new == 2
+    assert limiter.adjust().new == 1
+    assert limiter.adjust() is None  # floor reached
+    assert limiter.metrics()["limit"] == 1
+    assert len(limiter.metrics()["changes"]) == 4
+
+
+def test_latency_gradient_triggers_decrease():
+    limiter, _ = make(initial=4)
+    limiter.observe(10.0)
+    assert limiter.adjust() is None  # first sample sets the baseline
+    limiter.observe(35.0)
+    change = limiter.adjust()
+    assert (change.new, change.reason) == (2, "latency")
+
+
+async def test_admin_metrics_endpoint(tmp_path, monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    monkeypatch.setenv("BEARER_TOKEN", "test-token-123")
+    monkeypatch.setenv("ALLOWED_DIRS_RAW", "/tmp")
+    monkeypatch.setenv("LOG_DIR", str(tmp_path))
+    monkeypatch.setenv("CLAUDE_CONCURRENCY_ADAPTIVE", "true")
+    monkeypatch.delenv("PUBLIC_URL", raising=False)
+
+    import mcp_bridge.config as cfg
+    monkeypatch.setattr(cfg, "_settings", None)
+
+    from mcp_bridge.server import create_app
+    app, _ = create_app()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/admin/metrics")).status_code == 401
+        r = await client.get(
+            "/admin/metrics", headers={"Authorization": "Bearer test-token-123"}
+        )
+        assert r.status_code == 200
+        assert r.json()["concurrency"]["limit"] == 3
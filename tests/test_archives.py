@@ -0,0 +1,164 @@
+"""Tests for archive_create / archive_extract."""
+
+import base64
+import io
+import os
+import re
+import subprocess
+import tarfile
+import zipfile
+
+import pytest
+
+from mcp_bridge.archives import ArchiveLimitError, extract_archive
+
+
+@pytest.fixture
+def settings(tmp_path):
+    from mcp_bridge.config import Settings
+
+    return Settings(
+        bearer_token="t",
+        allowed_dirs_raw=str(tmp_path / "work"),
+        log_dir=tmp_path / "state",
+        transfer_max_chunk=10_000_000,
+    )
+
+
+@pytest.fixture
+def mcp(settings):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.file_ops import register
+
+    server = FastMCP("test")
+    register(server, settings, RateLimiter(max_per_minute=1000))
+    return server
+
+
+async def call(mcp, tool, **args):
+    result = await mcp.call_tool(tool, args)
+    return "".join(c.text for c in result[0])
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "work" / "proj"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "main.py").write_text("print('hi')\n")
+    (root / "data.bin").write_bytes(bytes(range(256)) * 10)
+    (root / "build").mkdir()
+    (root / "build" / "out.o").write_bytes(b"\0" * 100)
+    (root / ".gitignore").write_text("build/\n")
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    return root
+
+
+async def download(mcp, handle):
+    out = await call(mcp, "file_download", handle=handle, length=10_000_000)
+    data, footer = out.rsplit("\n", 1)
+    assert "end of file" in footer
+    return base64.b64decode(data)
+
+
+@pytest.mark.parametrize("fmt", ["tar.gz", "zip"])
+async def test_archive_honours_gitignore_and_round_trips(mcp, project, tmp_path, fmt):
+    out = await call(mcp, "archive_create", path=str(project), format=fmt)
+    assert out.startswith("OK: 3 files")
+    handle = re.search(r"handle: (\S+)", out).group(1)
+    blob = await download(mcp, handle)
+
+    if fmt == "zip":
+        names = zipfile.ZipFile(io.BytesIO(blob)).namelist()
+    else:
+        names = tarfile.open(fileobj=io.BytesIO(blob)).getnames()
+    assert sorted(names) == [".gitignore", "data.bin", "src/main.py"]
+
+    dest = tmp_path / "work" / "copy"
+    out = await call(mcp, "archive_extract", destination=str(dest), handle=handle)
+    assert out.startswith(f"OK: Unpacked {len(names)} files")
+    assert (dest / "data.bin").read_bytes() == (project / "data.bin").read_bytes()
+    assert (dest / "src" / "main.py").read_text() == "print('hi')\n"
+
+    out = await call(mcp, "archive_extract", destination=str(dest), handle=handle)
+    assert f"skipped {len(names)} existing files" in out
+
+
+async def test_archive_without_gitignore_and_bad_requests(mcp, project):
+    out = await call(mcp, "archive_create", path=str(project), respect_gitignore=False)
+    assert out.startswith("OK: 4 files")
+    out = await call(mcp, "archive_create", path=str(project), format="rar")
+    assert out.startswith("ERROR: format must be one of")
+    out = await call(mcp, "file_download", handle="0" * 32 + ".zip")
+    assert out.startswith("ERROR: Unknown or expired transfer handle")
+    out = await call(mcp, "file_download", handle="../../etc/passwd")
+    assert out.startswith("ERROR: Unknown or expired transfer handle")
+
+
+async def test_expired_handles_are_refused_before_the_sweep(mcp, settings, project):
+    out = await call(mcp, "archive_create", path=str(project))
+    handle = re.search(r"handle: (\S+)", out).group(1)
+    spooled = settings.transfer_dir / handle
+    old = spooled.stat().st_mtime - settings.transfer_ttl - 1
+    os.utime(spooled, (old, old))
+
+    out = await call(mcp, "file_download", handle=handle)
+    assert out.startswith("ERROR: Unknown or expired transfer handle")
+    assert not spooled.exists()
+
+
+async def test_archive_size_limit(mcp, settings, project):
+    settings.archive_max_mb = 0
+    out = await call(mcp, "archive_create", path=str(project))
+    assert out.startswith("ERROR: the files exceed the 0 byte limit")
+    assert list(settings.transfer_dir.iterdir()) == []
+
+
+def make_tar(path, members):
+    with tarfile.open(path, "w:gz") as tar:
+        for info, data in members:
+            tar.addfile(info, io.BytesIO(data) if data is not None else None)
+
+
+def test_extract_refuses_traversal_and_links_out(tmp_path):
+    evil = tarfile.TarInfo("../escape.txt")
+    evil.size = 3
+    make_tar(tmp_path / "a.tar.gz", [(evil, b"bad")])
+    with pytest.raises(ValueError, match="unsafe member"):
+        extract_archive(tmp_path / "a.tar.gz", tmp_path / "dest", 1 << 20)
+    assert not (tmp_path / "escape.txt").exists()
+
+    link = tarfile.TarInfo("link")
+    link.type = tarfile.SYMTYPE
+    link.linkname = "/etc"
+    make_tar(tmp_path / "b.tar.gz", [(link, None)])
+    with pytest.raises(ValueError, match="unsafe member"):
+        extract_archive(tmp_path / "b.tar.gz", tmp_path / "dest", 1 << 20)
+
+    with zipfile.ZipFile(tmp_path / "c.zip", "w") as zf:
+        zf.writestr("../../escape.txt", "bad")
+    with pytest.raises(ValueError, match="unsafe path"):
+        extract_archive(tmp_path / "c.zip", tmp_path / "dest", 1 << 20)
+
+
+def test_extract_enforces_the_size_limit(tmp_path):
+    with zipfile.ZipFile(tmp_path / "bomb.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("zeros", b"\0" * 100_000)
+    with pytest.raises(ArchiveLimitError):
+        extract_archive(tmp_path / "bomb.zip", tmp_path / "dest", 50_000)
+
+
+@pytest.mark.parametrize("mode", ["w", "w:gz"])
+async def test_extract_reports_truncated_archives(mcp, tmp_path, mode):
+    work = tmp_path / "work"
+    work.mkdir()
+    info = tarfile.TarInfo("blob")
+    info.size = 40_000
+    with tarfile.open(work / "full.tar", mode) as tar:
+        tar.addfile(info, io.BytesIO(os.urandom(info.size)))
+    data = (work / "full.tar").read_bytes()
+    (work / "cut.tar").write_bytes(data[: len(data) // 2])
+    out = await call(mcp, "archive_extract", path=str(work / "cut.tar"),
+                     destination=str(work / "dest"))
+    assert out.startswith("ERROR: Corrupt or truncated archive")
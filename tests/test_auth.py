@@ -6,7 +6,7 @@ import time
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from mcp_bridge.oauth_provider import InMemoryOAuthProvider
+from mcp_bridge.oauth_provider import InMemoryOAuthProvider, hash_token
 from mcp.server.auth.provider import AuthorizationParams
 from mcp.shared.auth import OAuthClientInformationFull
 from pydantic import AnyUrl
@@ -154,7 +154,7 @@ async def test_expired_auth_code(provider):
     code = redirect_url.split("code=")[1].split("&")[0]
 
     # Expire the code manually
-    provider._auth_codes[code].expires_at = time.time() - 1
+    provider._auth_codes[hash_token(code)].expires_at = time.time() - 1
 
     assert await provider.load_authorization_code(client, code) is None
 
@@ -177,7 +177,7 @@ async def test_expired_access_token(provider):
     token = await provider.exchange_authorization_code(client, auth_code)
 
     # Expire the access token manually
-    provider._access_tokens[token.access_token].expires_at = int(time.time()) - 1
+    provider._access_tokens[hash_token(token.access_token)].expires_at = int(time.time()) - 1
 
     assert await provider.load_access_token(token.access_token) is None
 
@@ -205,6 +205,56 @@ async def test_revoke_access_token(provider):
     assert await provider.load_access_token(token.access_token) is None
 
 
+@pytest.mark.asyncio
+async def test_tokens_stored_as_digests(provider):
+    client = await _register_client(provider)
+    params = AuthorizationParams(
+        client_id=client.client_id,
+        redirect_uri=AnyUrl("http://localhost/callback"),
+        redirect_uri_provided_explicitly=True,
+        state="s",
+        scopes=[],
+        code_challenge="c",
+        code_challenge_method="S256",
+    )
+    redirect_url = await provider.authorize(client, params)
+    code = redirect_url.split("code=")[1].split("&")[0]
+    assert code not in provider._auth_codes
+    auth_code = await provider.load_authorization_code(client, code)
+    token = await provider.exchange_authorization_code(client, auth_code)
+
+    assert token.access_token not in provider._access_tokens
+    assert token.refresh_token not in provider._refresh_tokens
+    at = await provider.load_access_token(token.access_token)
+    assert at is not None
+    assert at.token == hash_token(token.access_token)
+
+
+@pytest.mark.asyncio
+async def test_validated_token_cache_is_bounded(provider):
+    provider._cache_size = 1
+    client = await _register_client(provider)
+    tokens = []
+    for _ in range(2):
+        params = AuthorizationParams(
+            client_id=client.client_id,
+            redirect_uri=AnyUrl("http://localhost/callback"),
+            redirect_uri_provided_explicitly=True,
+            state="s",
+            scopes=[],
+            code_challenge="c",
+            code_challenge_method="S256",
+        )
+        redirect_url = await provider.authorize(client, params)
+        code = redirect_url.split("code=")[1].split("&")[0]
+        auth_code = await provider.load_authorization_code(client, code)
+        tokens.append(await provider.exchange_authorization_code(client, auth_code))
+
+    for token in tokens:
+        assert await provider.load_access_token(token.access_token) is not None
+    assert list(provider._validated) == [hash_token(tokens[1].access_token)]
+
+
 @pytest.mark.asyncio
 async def test_wrong_client_cannot_load_code(provider):
     client_a = await _register_client(provider)
@@ -0,0 +1,78 @@
+"""Tests for the content-addressed blob store and blob_read."""
+
+import hashlib
+import os
+
+import pytest
+
+from mcp_bridge.blob_store import BlobStore
+from mcp_bridge.rate_limiter import RateLimiter
+
+
+def test_put_dedupes_and_reads_ranges(tmp_path):
+    store = BlobStore(tmp_path, quota_bytes=1 << 20)
+    data = b"0123456789" * 10
+    handle = store.put(data)
+    assert handle == hashlib.sha256(data).hexdigest()
+    assert store.put(data) == handle
+    assert len(store) == 1 and store.total_bytes == 100
+
+    assert store.read(handle, 10, 5) == (b"01234", 100)
+    assert store.read(handle) == (data, 100)
+    with pytest.raises(KeyError):
+        store.read("0" * 64)
+    with pytest.raises(KeyError):
+        store.read("../etc/passwd")
+
+
+def test_lru_eviction_under_quota(tmp_path):
+    store = BlobStore(tmp_path, quota_bytes=250)
+    a = store.put(b"a" * 100)
+    b = store.put(b"b" * 100)
+    store.read(a)  # a is now most recently used
+    c = store.put(b"c" * 100)
+
+    assert store.total_bytes == 200
+    store.read(a)
+    store.read(c)
+    with pytest.raises(KeyError):
+        store.read(b)
+
+    # LRU order and sizes are rebuilt from disk
+    reopened = BlobStore(tmp_path, quota_bytes=250)
+    assert len(reopened) == 2 and reopened.total_bytes == 200
+
+
+def test_blob_written_by_other_instance_is_found(tmp_path):
+    first = BlobStore(tmp_path, quota_bytes=1000)
+    second = BlobStore(tmp_path, quota_bytes=1000)
+    handle = first.put(b"shared")
+    assert second.read(handle) == (b"shared", 6)
+
+
+def test_compressed_blobs(tmp_path):
+    pytest.importorskip("zstandard")
+    store = BlobStore(tmp_path, quota_bytes=1 << 20, compress=True)
+    handle = store.put(b"x" * 10_000)
+    assert store.total_bytes < 10_000
+    assert store.read(handle, 9_990) == (b"x" * 10, 10_000)
+
+
+async def test_blob_read_pages_on_character_boundaries(tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.blobs import register
+
+    store = BlobStore(tmp_path, quota_bytes=1 << 20)
+    handle = store.put("é".encode() * 10)  # 2 bytes per character
+    mcp = FastMCP("test")
+    register(mcp, RateLimiter(max_per_minute=100), store)
+
+    first = str(await mcp.call_tool("blob_read", {"handle": handle, "length": 5}))
+    assert "ééé" in first and "next offset 6" in first
+    last = str(await mcp.call_tool(
+        "blob_read", {"handle": handle, "offset": 6, "length": 100}
+    ))
+    assert "é" * 7 in last and "end of blob" in last
+    missing = str(await mcp.call_tool("blob_read", {"handle": "f" * 64}))
+    assert "Unknown or expired blob" in missing
@@ -0,0 +1,141 @@
+"""Tests for claude_execute_batch using a stub CLI script."""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_bridge.config import Settings
+from mcp_bridge.lifecycle import ProcessTracker
+from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+
+
+@pytest.fixture
+def settings(tmp_path):
+    cli = tmp_path / "claude"
+    # Echo the prompt (last argument) after a delay taken from the prompt
+    cli.write_text(
+        "#!/bin/sh\n"
+        'for last; do :; done\n'
+        'case "$last" in sleep*) sleep "${last#sleep }";; esac\n'
+        'echo "done: $last in $(basename "$PWD")"\n'
+    )
+    cli.chmod(0o755)
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+    return Settings(
+        bearer_token="t",
+        allowed_dirs_raw=str(tmp_path),
+        claude_cli_path=str(cli),
+        blob_quota_mb=0,
+    )
+
+
+async def call_batch(mcp, arguments, progress=None):
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    async with create_connected_server_and_client_session(mcp) as client:
+        result = await client.call_tool(
+            "claude_execute_batch", arguments, progress_callback=progress
+        )
+    return "".join(c.text for c in result.content)
+
+
+def make_server(settings, max_concurrent=3):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.claude_execute import register
+
+    mcp = FastMCP("test")
+    limiter = ConcurrencyLimiter(max_concurrent=max_concurrent)
+    register(mcp, settings, RateLimiter(max_per_minute=100), limiter, ProcessTracker())
+    return mcp, limiter
+
+
+async def test_batch_runs_jobs_in_parallel(settings, tmp_path):
+    mcp, _ = make_server(settings)
+    jobs = [
+        {"prompt": "sleep 0.5", "working_directory": str(tmp_path / name)}
+        for name in ("a", "b")
+    ]
+    progress = []
+
+    async def on_progress(done, total, message):
+        progress.append((done, total))
+
+    start = time.monotonic()
+    text = await call_batch(mcp, {"jobs": jobs, "max_parallel": 2}, on_progress)
+    assert time.monotonic() - start < 0.9
+    assert progress == [(1, 2), (2, 2)]
+    assert "Job 1/2" in text and "Job 2/2" in text
+    assert "done: sleep 0.5 in a" in text and "done: sleep 0.5 in b" in text
+
+
+async def test_batch_leaves_a_slot_and_honours_deadline(settings, tmp_path):
+    mcp, limiter = make_server(settings, max_concurrent=2)
+    jobs = [
+        {"prompt": "sleep 5", "working_directory": str(tmp_path / "a")},
+        {"prompt": "quick", "working_directory": str(tmp_path / "b")},
+    ]
+    text = await call_batch(
+        mcp, {"jobs": jobs, "max_parallel": 5, "deadline_seconds": 1}
+    )
+    # Only one job at a time: the first is cut off, the second never starts
+    assert "Job 1/2" in text and "killed" in text
+    assert "skipped: deadline reached" in text
+    await limiter.acquire()
+    await limiter.acquire()  # all slots were given back
+
+
+async def test_batch_refused_without_a_spare_slot(settings, tmp_path):
+    mcp, _ = make_server(settings, max_concurrent=1)
+    jobs = [{"prompt": "quick", "working_directory": str(tmp_path / "a")}]
+    text = await call_batch(mcp, {"jobs": jobs})
+    assert text.startswith("ERROR: Batches need a claude concurrency limit of at least 2")
+
+
+async def test_concurrent_batches_leave_a_slot_between_them(settings, tmp_path):
+    mcp, limiter = make_server(settings, max_concurrent=3)
+    jobs = [
+        {"prompt": "sleep 0.3", "working_directory": str(tmp_path / name)}
+        for name in ("a", "b")
+    ]
+    peak = 0
+
+    async def watch() -> None:
+        nonlocal peak
+        while True:
+            peak = max(peak, limiter._in_use)
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(watch())
+    batches = asyncio.gather(
+        *(call_batch(mcp, {"jobs": jobs, "max_parallel": 2}) for _ in range(2))
+    )
+    await asyncio.sleep(0.15)
+    await limiter.acquire()  # an interactive call still finds a slot
+    limiter.release()
+    texts = await batches
+    watcher.cancel()
+
+    assert peak == 2  # each batch could run 2 alone; together they share 2
+    assert all("done: sleep 0.3 in b" in text for text in texts)
+
+
+async def test_waiting_for_a_slot_wakes_on_release():
+    limiter = ConcurrencyLimiter(max_concurrent=1)
+    await limiter.acquire()
+    asyncio.get_running_loop().call_later(0.05, limiter.release)
+    start = time.monotonic()
+    await limiter.acquire_within(5)
+    assert time.monotonic() - start < 0.2
+    with pytest.raises(RuntimeError):
+        await limiter.acquire_within(0.05)
+
+
+async def test_batch_rejects_directory_outside_sandbox(settings, tmp_path):
+    mcp, _ = make_server(settings)
+    text = await call_batch(
+        mcp, {"jobs": [{"prompt": "x", "working_directory": "/etc"}]}
+    )
+    assert "not under any allowed directory" in text
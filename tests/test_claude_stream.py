@@ -0,0 +1,130 @@
+"""Tests for incremental stream-json parsing of Claude CLI output."""
+
+import json
+
+from mcp_bridge.claude_stream import StreamParser
+from mcp_bridge.config import Settings
+from mcp_bridge.lifecycle import ProcessTracker
+from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+
+EVENTS = [
+    {"type": "system", "subtype": "init", "model": "m", "session_id": "s1"},
+    {"type": "assistant", "message": {"id": "msg1", "content": [
+        {"type": "text", "text": "Let me look."},
+        {"type": "tool_use", "id": "t1", "name": "Read", "input": {"path": "a"}},
+    ]}},
+    {"type": "assistant", "message": {"id": "msg1", "content": [
+        {"type": "tool_use", "id": "t2", "name": "Bash", "input": {"cmd": "ls"}},
+    ]}},
+    {"type": "user", "message": {"content": [
+        {"type": "tool_result", "tool_use_id": "t1", "content": "x" * 10_000},
+        {"type": "tool_result", "tool_use_id": "t2", "content": "boom", "is_error": True},
+    ]}},
+    {"type": "assistant", "message": {"id": "msg2", "content": [
+        {"type": "tool_use", "id": "t3", "name": "Read", "input": {"path": "b"}},
+    ]}},
+    {"type": "result", "subtype": "success", "is_error": False, "num_turns": 2,
+     "duration_ms": 12_300, "duration_api_ms": 9_800, "total_cost_usd": 0.0123,
+     "result": "The module parses config.",
+     "usage": {"input_tokens": 100, "cache_read_input_tokens": 50, "output_tokens": 20}},
+]
+
+
+def test_parser_summarizes_events():
+    parser = StreamParser()
+    for event in EVENTS:
+        parser.feed(json.dumps(event).encode() + b"\n")
+    parser.feed(b"not json\n")
+    parser.feed(b"\n")
+    summary = parser.finish()
+
+    assert summary.result == "The module parses config."
+    assert summary.session_id == "s1"
+    assert [t.tools for t in summary.turns] == [["Read", "Bash"], ["Read"]]
+    assert summary.tool_counts == {"Read": 2, "Bash": 1}
+    assert summary.tool_errors == 1
+    assert summary.input_tokens == 150 and summary.output_tokens == 20
+    assert summary.malformed == 1
+
+    text = summary.render()
+    assert text.startswith("The module parses config.")
+    assert "success | 2 turns | 12.3s (api 9.8s) | $0.0123" in text
+    assert "Tools: Read x2, Bash x1 (1 failed)" in text
+    assert "xxxx" not in text
+
+
+def test_parser_treats_null_usage_fields_as_zero():
+    parser = StreamParser()
+    parser.feed(json.dumps({
+        "type": "result", "subtype": "success", "result": "ok", "num_turns": None,
+        "duration_ms": None,
+        "usage": {"input_tokens": None, "cache_read_input_tokens": 7,
+                  "output_tokens": None},
+    }))
+    summary = parser.finish()
+    assert summary.input_tokens == 7 and summary.output_tokens == 0
+    assert summary.duration_ms == 0
+    assert summary.render().startswith("ok")
+
+
+def test_parser_falls_back_to_last_text_without_result():
+    parser = StreamParser()
+    parser.feed(json.dumps(EVENTS[1]))
+    summary = parser.finish()
+    assert summary.result == "Let me look."
+    assert summary.num_turns == 1
+    assert "incomplete" in summary.render()
+
+
+async def test_claude_execute_stream_format(tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.claude_execute import register
+
+    events = tmp_path / "events.jsonl"
+    events.write_text("\n".join(json.dumps(e) for e in EVENTS) + "\n")
+    cli = tmp_path / "claude"
+    cli.write_text(
+        "#!/bin/sh\n"
+        'case "$*" in *"--output-format stream-json"*) ;; *) exit 2;; esac\n'
+        f"cat {events}\n"
+    )
+    cli.chmod(0o755)
+    settings = Settings(
+        bearer_token="t",
+        allowed_dirs_raw=str(tmp_path),
+        claude_cli_path=str(cli),
+        blob_quota_mb=0,
+    )
+    mcp = FastMCP("test")
+    register(
+        mcp,
+        settings,
+        RateLimiter(max_per_minute=100),
+        ConcurrencyLimiter(max_concurrent=1),
+        ProcessTracker(),
+    )
+    text = str(await mcp.call_tool("claude_execute", {
+        "prompt": "summarize",
+        "working_directory": str(tmp_path),
+        "output_format": "stream",
+    }))
+    assert "The module parses config." in text
+    assert "Tools: Read x2, Bash x1" in text
+    assert "xxxx" not in text
+
+
+async def test_overlong_stream_line_kills_the_run(tmp_path, monkeypatch):
+    from mcp_bridge.tools import claude_execute
+
+    monkeypatch.setattr(claude_execute, "_STREAM_LINE_LIMIT", 1024)
+    cli = tmp_path / "claude"
+    cli.write_text("#!/bin/sh\nhead -c 100000 /dev/zero | tr '\\0' x\nsleep 30\n")
+    cli.chmod(0o755)
+    settings = Settings(bearer_token="t", claude_cli_path=str(cli))
+    code, result, elapsed, _ = await claude_execute._run_claude(
+        settings, ProcessTracker(), "p", tmp_path, 1, 10, parser=StreamParser()
+    )
+    assert code is not None and code != 0
+    assert result.startswith("ERROR: The CLI wrote an output line over 1024 bytes")
+    assert elapsed < 5
@@ -0,0 +1,108 @@
+"""Tests for hot-reloading settings from the env file."""
+
+import os
+
+import pytest
+
+from mcp_bridge.config import Settings
+from mcp_bridge.config_reload import ConfigWatcher, LiveSettings
+from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    saved = dict(os.environ)
+    path = tmp_path / "bridge.env"
+    path.write_text("BEARER_TOKEN=t\nMAX_REQUESTS_PER_MINUTE=60\n")
+    yield path
+    os.environ.clear()
+    os.environ.update(saved)
+
+
+def watch(path, hooks=()):
+    for key, value in {"BEARER_TOKEN": "t", "MAX_REQUESTS_PER_MINUTE": "60"}.items():
+        os.environ[key] = value
+    live = LiveSettings(Settings())
+    return live, ConfigWatcher(live, path, hooks=list(hooks))
+
+
+async def test_reload_swaps_settings_and_runs_hooks(env_file):
+    limiter = RateLimiter(max_per_minute=60)
+    live, watcher = watch(
+        env_file, [lambda old, new: limiter.resize(new.max_requests_per_minute)]
+    )
+    env_file.write_text("BEARER_TOKEN=t\nMAX_REQUESTS_PER_MINUTE=1\n")
+
+    assert await watcher.reload()
+    assert live.max_requests_per_minute == 1
+    await limiter.check("run_command")
+    with pytest.raises(RuntimeError, match="Rate limit exceeded"):
+        await limiter.check("run_command")
+
+
+async def test_invalid_file_keeps_previous_snapshot(env_file):
+    calls = []
+    live, watcher = watch(env_file, [lambda old, new: calls.append(new)])
+    before = live.snapshot
+    env_file.write_text("BEARER_TOKEN=t\nMAX_REQUESTS_PER_MINUTE=lots\n")
+
+    assert not await watcher.reload()
+    assert live.snapshot is before
+    assert calls == []
+    assert os.environ["MAX_REQUESTS_PER_MINUTE"] == "60"  # not leaked to children
+
+
+async def test_failing_hook_does_not_stop_the_others(env_file):
+    calls = []
+
+    def broken(old, new):
+        raise RuntimeError("boom")
+
+    live, watcher = watch(env_file, [broken, lambda old, new: calls.append(new)])
+    env_file.write_text("BEARER_TOKEN=t\nMAX_REQUESTS_PER_MINUTE=5\n")
+
+    assert await watcher.reload()
+    assert live.max_requests_per_minute == 5
+    assert calls == [live.snapshot]
+
+
+async def test_external_environment_wins_over_file(env_file):
+    os.environ["MAX_CONCURRENT_CLAUDE"] = "7"
+    env_file.write_text("BEARER_TOKEN=t\nMAX_CONCURRENT_CLAUDE=2\n")
+    live, watcher = watch(env_file)
+    env_file.write_text("BEARER_TOKEN=t\nMAX_CONCURRENT_CLAUDE=3\nLOG_LEVEL=DEBUG\n")
+
+    assert await watcher.reload()
+    assert live.max_concurrent_claude == 7
+    assert live.log_level == "DEBUG"
+
+
+async def test_removed_keys_fall_back_to_defaults(env_file):
+    env_file.write_text("BEARER_TOKEN=t\nMAX_REQUESTS_PER_MINUTE=60\nLOG_LEVEL=DEBUG\n")
+    live, watcher = watch(env_file)
+    os.environ["LOG_LEVEL"] = "DEBUG"
+    env_file.write_text("BEARER_TOKEN=t\nMAX_REQUESTS_PER_MINUTE=60\n")
+
+    assert await watcher.reload()
+    assert live.log_level == Settings.model_fields["log_level"].default
+
+
+def test_live_settings_are_read_only(env_file):
+    live, _ = watch(env_file)
+    with pytest.raises(AttributeError):
+        live.max_requests_per_minute = 5
+
+
+async def test_concurrency_limiter_resizes_with_slots_in_use():
+    limiter = ConcurrencyLimiter(max_concurrent=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    limiter.resize(1)
+    limiter.release()
+    # Still one in use, which is the new limit
+    with pytest.raises(RuntimeError):
+        await limiter.acquire()
+    limiter.resize(3)
+    await limiter.acquire()
+    await limiter.acquire()
@@ -0,0 +1,120 @@
+"""Tests for the profiling, tracemalloc and task-dump admin diagnostics."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from mcp_bridge.diagnostics import MemoryTracer, sample_profile, task_dump
+from mcp_bridge.lifecycle import ProcessTracker
+
+
+def busy_loop_for_profile(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_returns_collapsed_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop_for_profile, args=(stop,), name="busy")
+    worker.start()
+    try:
+        stacks = sample_profile(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = stacks.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    busy = [line for line in lines if "busy_loop_for_profile" in line]
+    assert busy and all(line.startswith("busy;") for line in busy)
+
+
+def test_memory_snapshot_and_diff():
+    tracer = MemoryTracer()
+    with pytest.raises(RuntimeError, match="No baseline"):
+        tracer.diff()
+    try:
+        assert tracer.snapshot()["started_tracing"]
+        hoard = [bytearray(1024) for _ in range(2000)]
+        diff = tracer.diff(limit=5)
+        assert diff["top"][0]["size_diff_kb"] >= 1000
+        assert "test_diagnostics.py" in diff["top"][0]["where"]
+        del hoard
+    finally:
+        assert tracer.stop()
+    assert not tracer.tracing
+
+
+async def test_task_dump_links_tool_to_subprocess(tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.config import Settings
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.run_command import register
+
+    tracker = ProcessTracker()
+    mcp = FastMCP("test")
+    settings = Settings(bearer_token="t", allowed_dirs_raw=str(tmp_path))
+    register(mcp, settings, RateLimiter(max_per_minute=100), tracker)
+
+    call = asyncio.create_task(mcp.call_tool(
+        "run_command", {"command": "sleep 5", "working_directory": str(tmp_path)}
+    ))
+    deadline = time.monotonic() + 5
+    while not len(tracker) and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    try:
+        tasks = task_dump(tracker)
+    finally:
+        for proc in list(tracker._procs):
+            tracker.kill(proc)
+        await call
+
+    entry = tasks[0]
+    assert entry["tool"] == "run_command"
+    assert any("run_command.py:run_command" in frame for frame in entry["awaiting"])
+    assert "sleep 5" in entry["subprocesses"][0]["cmdline"]
+
+
+async def test_admin_routes_require_token(tmp_path, monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+
+    monkeypatch.setenv("BEARER_TOKEN", "test-token-123")
+    monkeypatch.setenv("ALLOWED_DIRS_RAW", "/tmp")
+    monkeypatch.setenv("LOG_DIR", str(tmp_path))
+    monkeypatch.delenv("PUBLIC_URL", raising=False)
+
+    import mcp_bridge.config as cfg
+    monkeypatch.setattr(cfg, "_settings", None)
+
+    from mcp_bridge.server import create_app
+    app, _ = create_app()
+
+    auth = {"Authorization": "Bearer test-token-123"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/admin/tasks")).status_code == 401
+        assert (await client.get("/admin/profile")).status_code == 401
+
+        r = await client.get("/admin/tasks", headers=auth)
+        assert r.status_code == 200 and r.json()["count"] >= 1
+
+        r = await client.get("/admin/profile?seconds=0.05", headers=auth)
+        assert r.status_code == 200
+        assert "profile.collapsed" in r.headers["content-disposition"]
+        for query in ("seconds=nan", "seconds=0", "interval=nan", "interval=inf", "interval=-1"):
+            r = await client.get(f"/admin/profile?{query}", headers=auth)
+            assert r.status_code == 400, query
+
+        assert (await client.get("/admin/memory/diff", headers=auth)).status_code == 409
+        r = await client.post("/admin/memory/snapshot?frames=lots", headers=auth)
+        assert r.status_code == 400
+        assert (await client.get("/admin/memory/diff?limit=x", headers=auth)).status_code == 400
+        assert (await client.delete("/admin/memory", headers=auth)).json() == {"stopped": False}
+        r = await client.post("/admin/memory/snapshot?frames=0", headers=auth)
+        assert r.status_code == 200  # clamped to one frame
+        assert (await client.delete("/admin/memory", headers=auth)).json() == {"stopped": True}
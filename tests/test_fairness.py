@@ -0,0 +1,124 @@
+"""Tests for per-client rate limits, fair queuing and daily quotas."""
+
+import asyncio
+import contextvars
+
+import pytest
+
+from mcp_bridge.fair_queue import FairConcurrencyLimiter
+from mcp_bridge.lifecycle import ProcessTracker
+from mcp_bridge.quotas import UsageLedger
+from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+from mcp_bridge.shared_state import SQLiteUsageLedger
+
+who = contextvars.ContextVar("who", default="anonymous")
+
+
+@pytest.fixture
+def as_client(monkeypatch):
+    monkeypatch.setattr("mcp_bridge.fair_queue.current_client_id", who.get)
+    monkeypatch.setattr("mcp_bridge.clients.current_client_id", who.get)
+
+
+async def test_rate_limits_are_per_client():
+    limiter = RateLimiter(max_per_minute=2)
+    await limiter.check("run_command", client_id="a")
+    await limiter.check("run_command", client_id="a")
+    with pytest.raises(RuntimeError, match="Rate limit exceeded"):
+        await limiter.check("run_command", client_id="a")
+    await limiter.check("run_command", client_id="b")
+
+
+async def grant_order(fair, requests):
+    """Queue (client, hold) requests behind a held slot; return grant order."""
+    order = []
+
+    async def run(client):
+        who.set(client)
+        await fair.acquire()
+        order.append(client)
+        await asyncio.sleep(0.01)
+        fair.release()
+
+    who.set("holder")
+    await fair.acquire()
+    tasks = []
+    for client in requests:
+        tasks.append(asyncio.create_task(run(client)))
+        await asyncio.sleep(0)  # enqueue in submission order
+    fair.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+async def test_flooding_client_does_not_starve_others(as_client):
+    fair = FairConcurrencyLimiter(ConcurrencyLimiter(1), queue_timeout=5, poll=0.01)
+    order = await grant_order(fair, ["a", "a", "a", "a", "b"])
+    assert order.index("b") <= 1
+
+
+async def test_weights_share_slots_proportionally(as_client):
+    fair = FairConcurrencyLimiter(
+        ConcurrencyLimiter(1), weights={"a": 2.0}, queue_timeout=5, poll=0.01
+    )
+    order = await grant_order(fair, ["a"] * 6 + ["b"] * 6)
+    assert order[:6].count("a") == 4
+
+
+async def test_queue_timeout(as_client):
+    fair = FairConcurrencyLimiter(ConcurrencyLimiter(1), queue_timeout=0.1, poll=0.01)
+    await fair.acquire()
+    with pytest.raises(RuntimeError, match="waited 0s in queue"):
+        await fair.acquire()
+    assert not fair.queued()
+
+
+async def test_idle_clients_are_forgotten(as_client):
+    fair = FairConcurrencyLimiter(ConcurrencyLimiter(1))
+    for i in range(2000):
+        who.set(f"client-{i}")
+        await fair.acquire()
+        fair.release()
+    # each one-off client falls behind the virtual clock once the next is granted
+    assert len(fair._last_tag) <= 512
+
+
+@pytest.mark.parametrize("shared", [False, True])
+async def test_daily_quota(tmp_path, shared):
+    if shared:
+        ledger = SQLiteUsageLedger(tmp_path / "state.db", daily_runtime_seconds=10)
+    else:
+        ledger = UsageLedger(daily_runtime_seconds=10)
+    await ledger.record("a", "run_command", 6.0, 1.0)
+    await ledger.check("a")
+    await ledger.record("a", "claude_execute", 5.0, 2.0)
+    with pytest.raises(RuntimeError, match="Daily runtime quota exhausted for a"):
+        await ledger.check("a")
+    await ledger.check("b")
+    total = await ledger.client_total("a")
+    assert (total.calls, total.runtime_s, total.cpu_s) == (2, 11.0, 3.0)
+    ledger.close()
+
+
+async def test_run_command_charges_client_and_reports(tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.config import Settings
+    from mcp_bridge.tools.run_command import register as reg_run
+    from mcp_bridge.tools.usage import register as reg_usage
+
+    settings = Settings(bearer_token="t", allowed_dirs_raw=str(tmp_path))
+    ledger = UsageLedger(daily_runtime_seconds=0.2)
+    mcp = FastMCP("test")
+    limiter = RateLimiter(max_per_minute=100)
+    reg_run(mcp, settings, limiter, ProcessTracker(), usage=ledger)
+    reg_usage(mcp, limiter, ledger)
+
+    args = {"command": "sleep 0.3", "working_directory": str(tmp_path)}
+    await mcp.call_tool("run_command", args)
+    with pytest.raises(Exception, match="Daily runtime quota exhausted"):
+        await mcp.call_tool("run_command", args)
+
+    report = str(await mcp.call_tool("usage_report", {}))
+    assert "anonymous" in report and "run_command" in report
+    assert "runtime 0.2s/day" in report
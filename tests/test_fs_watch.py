@@ -0,0 +1,113 @@
+"""Tests for shared directory watches and the file_watch tool."""
+
+import asyncio
+
+import pytest
+
+from mcp_bridge.fs_watch import GONE, FsEvent, WatchHub
+
+
+async def next_event(queue, timeout=2.0):
+    return await asyncio.wait_for(queue.get(), timeout)
+
+
+async def next_of_kind(queue, kind):
+    """Skip other events; inotify reports one write as MODIFY + CLOSE_WRITE."""
+    while (event := await next_event(queue)).kind != kind:
+        pass
+    return event
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def hub(request):
+    hub = WatchHub(use_inotify=request.param == "inotify", poll_interval=0.05)
+    yield hub
+    hub.close()
+
+
+async def test_create_modify_delete_events(hub, tmp_path):
+    async with hub.subscribe(tmp_path) as queue:
+        target = tmp_path / "out.log"
+        target.write_text("a")
+        assert await next_event(queue) == FsEvent("create", "out.log")
+        await asyncio.sleep(0.1)
+        target.write_text("bb")
+        assert await next_of_kind(queue, "modify") == FsEvent("modify", "out.log")
+        target.unlink()
+        assert await next_of_kind(queue, "delete") == FsEvent("delete", "out.log")
+
+
+async def test_watches_are_shared_between_subscribers(hub, tmp_path):
+    async with hub.subscribe(tmp_path) as first, hub.subscribe(tmp_path) as second:
+        assert hub.watched() == {tmp_path: 2}
+        (tmp_path / "x").mkdir()
+        assert (await next_event(first)).name == "x"
+        assert (await next_event(second)).is_dir
+    assert hub.watched() == {}
+
+
+async def test_removed_directory_ends_the_watch(hub, tmp_path):
+    watched = tmp_path / "build"
+    watched.mkdir()
+    async with hub.subscribe(watched) as queue:
+        watched.rmdir()
+        await next_of_kind(queue, GONE)
+    watched.mkdir()
+    async with hub.subscribe(watched) as queue:
+        (watched / "again").write_text("")
+        assert (await next_event(queue)).name == "again"
+
+
+@pytest.fixture
+def mcp(tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.config import Settings
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.file_ops import register
+
+    server = FastMCP("test")
+    settings = Settings(bearer_token="t", allowed_dirs_raw=str(tmp_path))
+    register(server, settings, RateLimiter(max_per_minute=100))
+    return server
+
+
+def text(result):
+    return "".join(c.text for c in result[0])
+
+
+async def test_file_watch_returns_matching_events(mcp, tmp_path):
+    call = asyncio.create_task(mcp.call_tool(
+        "file_watch",
+        {"path": str(tmp_path), "pattern": "*.whl", "events": "create", "timeout_seconds": 5},
+    ))
+    await asyncio.sleep(0.1)
+    (tmp_path / "notes.txt").write_text("x")
+    (tmp_path / "pkg-1.0.whl").write_text("x")
+    (tmp_path / "pkg-1.0-py3.whl").write_text("x")
+    out = text(await call)
+
+    assert out.startswith("2 event(s)")
+    assert f"create  {tmp_path / 'pkg-1.0.whl'}" in out
+    assert "notes.txt" not in out
+
+
+async def test_file_watch_on_a_file_and_timeout(mcp, tmp_path):
+    log = tmp_path / "server.log"
+    log.write_text("")
+    out = text(await mcp.call_tool(
+        "file_watch", {"path": str(log), "events": "modify", "timeout_seconds": 0}
+    ))
+    assert out == f"No modify events matching 'server.log' in {tmp_path} within 0s"
+
+    call = asyncio.create_task(mcp.call_tool(
+        "file_watch", {"path": str(log), "events": "modify", "timeout_seconds": 5}
+    ))
+    await asyncio.sleep(0.1)
+    log.write_text("ready\n")
+    assert "modify  " + str(log) in text(await call)
+
+
+async def test_file_watch_rejects_unknown_events(mcp, tmp_path):
+    out = text(await mcp.call_tool("file_watch", {"path": str(tmp_path), "events": "open"}))
+    assert out.startswith("ERROR: events must be")
@@ -0,0 +1,119 @@
+"""Tests for the NVML sampler using a fake backend (no GPU required)."""
+
+import asyncio
+
+import pytest
+
+from mcp_bridge.gpu_telemetry import GpuProcess, GpuSample, GpuSampler
+from mcp_bridge.rate_limiter import RateLimiter
+from mcp_bridge.ring_buffer import TimeSeriesRing
+
+
+class FakeGpuBackend:
+    def __init__(self) -> None:
+        self.util = 0.0
+        self.closed = False
+
+    def sample(self) -> list[GpuSample]:
+        return [GpuSample(
+            index=0,
+            name="Fake RTX",
+            bus_id="00000000:01:00.0",
+            mem_total_mb=24576,
+            mem_used_mb=1024 + self.util * 10,
+            mem_free_mb=23552 - self.util * 10,
+            temperature_c=40 + self.util / 10,
+            util_gpu=self.util,
+            util_mem=self.util / 2,
+        )]
+
+    def processes(self) -> list[GpuProcess]:
+        return [GpuProcess(pid=1234, name="python", used_mb=512)]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_ring_buffer_wraps_and_windows():
+    ring = TimeSeriesRing(3, ("v",))
+    for ts in range(5):
+        ring.append(float(ts), {"v": ts * 10.0})
+    ts, series = ring.series()
+    assert ts == [2.0, 3.0, 4.0]
+    assert series["v"] == [20.0, 30.0, 40.0]
+    stats = ring.stats(since=3.0)
+    assert (stats["v"].min, stats["v"].avg, stats["v"].max) == (30.0, 35.0, 40.0)
+    assert ring.latest() == (4.0, {"v": 40.0})
+
+
+def test_sampler_window_stats():
+    backend = FakeGpuBackend()
+    sampler = GpuSampler(backend, capacity=10)
+    for ts, util in [(100.0, 10.0), (110.0, 50.0), (120.0, 30.0)]:
+        backend.util = util
+        sampler.record(backend.sample(), ts=ts)
+
+    count, stats = sampler.window_stats(0, window_seconds=15, now=120.0)
+    assert count == 2
+    assert stats["util_gpu"].min == 30.0
+    assert stats["util_gpu"].max == 50.0
+    assert stats["util_gpu"].avg == 40.0
+
+
+@pytest.mark.asyncio
+async def test_gpu_status_uses_sampler():
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.gpu_status import register
+
+    backend = FakeGpuBackend()
+    sampler = GpuSampler(backend)
+    await sampler.sample_now()
+    await sampler.sample_now()
+
+    mcp = FastMCP("test")
+    register(mcp, RateLimiter(max_per_minute=100), sampler)
+    text = str(await mcp.call_tool("gpu_status", {"window_seconds": 60}))
+
+    assert "Fake RTX" in text
+    assert "2 samples" in text
+    # the tool's own reading stays out of the fixed-interval history
+    assert sampler.window_stats(0, 60)[0] == 2
+    assert "1234, python, 512MB" in text
+
+
+class LostGpuBackend(FakeGpuBackend):
+    def sample(self) -> list[GpuSample]:
+        raise RuntimeError("GPU is lost")
+
+
+@pytest.mark.asyncio
+async def test_gpu_status_falls_back_to_nvidia_smi_when_nvml_fails(tmp_path, monkeypatch):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.gpu_status import register
+
+    smi = tmp_path / "nvidia-smi"
+    smi.write_text(
+        "#!/bin/sh\n"
+        'case "$1" in --query-gpu*) '
+        'echo "Smi RTX, 00000000:01:00.0, 24576, 1024, 23552, 41, 7, 3";; esac\n'
+    )
+    smi.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:/usr/bin:/bin")
+
+    sampler = GpuSampler(LostGpuBackend(), interval=0.01)
+    task = asyncio.create_task(sampler.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+    assert not sampler.available
+
+    mcp = FastMCP("test")
+    register(mcp, RateLimiter(max_per_minute=100), sampler)
+    text = str(await mcp.call_tool("gpu_status", {}))
+    assert "Smi RTX" in text
+
+    # a read that fails before the sampler notices also falls back
+    sampler.available = True
+    text = str(await mcp.call_tool("gpu_status", {}))
+    assert "Smi RTX" in text
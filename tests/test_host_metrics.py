@@ -0,0 +1,94 @@
+"""Tests for the multi-resolution host metrics sampler."""
+
+import time
+
+import pytest
+
+from mcp_bridge.host_metrics import HOST_FIELDS, HostSampler, read_host_sample
+from mcp_bridge.rate_limiter import RateLimiter
+
+
+def _values(v: float) -> dict[str, float]:
+    return {f: v for f in HOST_FIELDS}
+
+
+def test_read_host_sample_from_proc():
+    sample = read_host_sample()
+    assert set(sample) == set(HOST_FIELDS)
+    assert sample["mem_available_mb"] > 0
+    assert 0 <= sample["disk_used_pct"] <= 100
+
+
+def test_minute_buckets_are_averaged_and_rolled_up():
+    sampler = HostSampler()
+    # Two minutes of 1s samples: first minute value 1.0, second 3.0,
+    # then one sample in the third minute closes the second bucket
+    for t in range(0, 60):
+        sampler.record(900.0 * 10 + t, _values(1.0))
+    for t in range(60, 120):
+        sampler.record(900.0 * 10 + t, _values(3.0))
+    sampler.record(900.0 * 10 + 120, _values(5.0))
+
+    ts, series = sampler.rings["1m"].series()
+    assert ts == [9000.0, 9060.0]
+    assert series["load1"] == [1.0, 3.0]
+    assert len(sampler.rings["1s"]) == 121
+    assert len(sampler.rings["15m"]) == 0
+
+
+def test_history_picks_resolution_and_downsamples():
+    sampler = HostSampler()
+    for t in range(600):
+        sampler.record(float(t), _values(float(t)))
+
+    resolution, ts, series = sampler.history(600, points=10, now=600.0)
+    assert resolution == "1s"
+    assert len(ts) == 10
+    assert series["load1"][0] == pytest.approx(29.5)
+
+    resolution, _, _ = sampler.history(3600 * 6, points=10, now=600.0)
+    assert resolution == "1m"
+
+
+def test_raw_ring_follows_the_sampling_interval():
+    sampler = HostSampler(interval=5)
+    assert sampler.resolutions[0] == ("5s", 5, 180)  # still 15 minutes
+    for t in range(0, 900, 5):
+        sampler.record(float(t), _values(1.0))
+    resolution, ts, _ = sampler.history(900, points=0, now=900.0)
+    assert (resolution, len(ts)) == ("5s", 180)
+    # an interval past a bucket size drops that rollup
+    assert [r[0] for r in HostSampler(interval=120).resolutions] == ["120s", "15m"]
+
+
+@pytest.mark.asyncio
+async def test_system_history_tool():
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.system_info import register
+
+    sampler = HostSampler()
+    now = time.monotonic()
+    for t in range(30):
+        sampler.record(now - 30 + t, _values(0.5))
+
+    mcp = FastMCP("test")
+    register(mcp, RateLimiter(max_per_minute=100), sampler)
+    text = str(await mcp.call_tool(
+        "system_history", {"window_seconds": 60, "points": 5, "metrics": "load1"}
+    ))
+    assert "Resolution: 1s" in text
+    assert "time,load1" in text
+    assert "0.50" in text
+
+
+def test_history_ignores_wall_clock_steps(monkeypatch):
+    sampler = HostSampler()
+    now = time.monotonic()
+    for t in range(30):
+        sampler.record(now - 30 + t, _values(1.0))
+    # an NTP step back an hour does not hide the recent samples
+    stepped = time.time() - 3600
+    monkeypatch.setattr(time, "time", lambda: stepped)
+    _, ts, _ = sampler.history(60, points=0)
+    assert len(ts) == 30
@@ -0,0 +1,121 @@
+"""Tests for drain mode, readiness and subprocess cleanup."""
+
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from mcp_bridge.lifecycle import ProcessTracker
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("BEARER_TOKEN", "test-token-123")
+    monkeypatch.setenv("ALLOWED_DIRS_RAW", "/tmp")
+    monkeypatch.setenv("LOG_DIR", str(tmp_path))
+    monkeypatch.delenv("PUBLIC_URL", raising=False)
+
+    import mcp_bridge.config as cfg
+    monkeypatch.setattr(cfg, "_settings", None)
+
+    from mcp_bridge.server import create_app
+    app, _ = create_app()
+    return app
+
+
+def _alive(pid: int) -> bool:
+    """True if ``pid`` exists and is not a zombie awaiting reaping."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+async def _spawn(cmd: str) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_shell(cmd, start_new_session=True)
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_running_processes():
+    tracker = ProcessTracker()
+    proc = await _spawn("sleep 0.2")
+
+    async def run() -> None:
+        with tracker.track(proc):
+            await proc.wait()
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0)
+    await tracker.drain(timeout=5)
+    assert tracker.draining
+    assert proc.returncode == 0
+    await task
+
+
+@pytest.mark.asyncio
+async def test_drain_kills_process_group_after_deadline():
+    tracker = ProcessTracker()
+    # The shell's background child shares its process group
+    proc = await asyncio.create_subprocess_shell(
+        "sleep 30 & echo $!; wait",
+        stdout=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    grandchild = int((await proc.stdout.readline()).decode())
+
+    async def run() -> None:
+        with tracker.track(proc):
+            await proc.wait()
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0)
+    await tracker.drain(timeout=0.1, grace=0.5)
+    await task
+    assert proc.returncode is not None
+    await asyncio.sleep(0.1)
+    assert not _alive(grandchild)
+
+
+@pytest.mark.asyncio
+async def test_ready_only_while_serving(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.get("/ready")
+        assert r.status_code == 503
+        assert r.json()["ready"] is False
+        assert (await client.get("/health")).status_code == 200
+
+        async with app.router.lifespan_context(app):
+            r = await client.get("/ready")
+            assert r.status_code == 200
+            assert r.json()["ready"] is True
+
+
+@pytest.mark.asyncio
+async def test_admin_drain_requires_token_and_refuses_tool_calls(app):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.post("/admin/drain")
+        assert r.status_code == 401
+
+        for bad in ("soon", "nan", "-1"):
+            r = await client.post(
+                f"/admin/drain?timeout={bad}",
+                headers={"Authorization": "Bearer test-token-123"},
+            )
+            assert r.status_code == 400
+
+        r = await client.post(
+            "/admin/drain?timeout=1",
+            headers={"Authorization": "Bearer test-token-123"},
+        )
+        assert r.status_code == 202
+        assert r.json()["draining"] is True
+
+        r = await client.get("/ready")
+        assert r.status_code == 503
+        assert r.json()["draining"] is True
+
+        r = await client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "ping"})
+        assert r.status_code == 503
@@ -0,0 +1,69 @@
+"""Smoke tests for scripts/loadtest.py and the fake claude CLI."""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+@pytest.fixture(scope="module")
+def loadtest():
+    spec = importlib.util.spec_from_file_location("loadtest", SCRIPTS / "loadtest.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["loadtest"] = module  # dataclasses look the module up
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules["loadtest"]
+
+
+def test_fake_claude_honours_prompt_overrides():
+    out = subprocess.run(
+        [sys.executable, str(SCRIPTS / "fake_claude.py"), "--print",
+         "--prompt", "latency=0 bytes=30 exit=3"],
+        capture_output=True, text=True,
+    )
+    assert out.returncode == 3
+    assert len(out.stdout) == 30
+
+
+def test_compare_flags_regressions_beyond_tolerance(loadtest):
+    baseline = {"throughput_rps": 100, "p50_ms": 10, "p99_ms": 50,
+                "rejection_rate": 0.0, "error_rate": 0.0, "peak_rss_mb": 80}
+    assert loadtest.compare(dict(baseline, throughput_rps=90, p99_ms=55), baseline, 0.15) == []
+    assert loadtest.compare(
+        dict(baseline, throughput_rps=80, rejection_rate=0.05), baseline, 0.15
+    ) == ["throughput_rps", "rejection_rate"]
+
+
+def test_percentile_and_mix(loadtest):
+    assert loadtest.percentile(list(range(1, 101)), 99) == 99
+    assert loadtest.percentile([], 50) == 0.0
+    assert loadtest.parse_mix("run_command=2,file_read") == {"run_command": 2, "file_read": 1}
+    with pytest.raises(ValueError):
+        loadtest.parse_mix("rm_rf=1")
+
+
+async def test_short_run_drives_every_tool(loadtest, monkeypatch):
+    import mcp_bridge.config as config
+
+    monkeypatch.setattr(os, "environ", os.environ.copy())
+    monkeypatch.setattr(config, "_settings", None)
+    cfg = loadtest.LoadConfig(
+        clients=3,
+        duration=1.0,
+        mix=loadtest.parse_mix("claude_execute=1,claude_stream=1,run_command=1,file_read=1"),
+        latency=0.01,
+        jitter=0.0,
+        output_bytes=100,
+    )
+    result = await loadtest.run_load(cfg)
+
+    assert result["calls"] > 0
+    assert result["error_rate"] == 0
+    assert result["throughput_rps"] > 0
+    assert result["peak_rss_mb"] > 0
@@ -0,0 +1,41 @@
+"""Smoke tests for scripts/microbench.py."""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "microbench.py"
+
+
+@pytest.fixture(scope="module")
+def microbench():
+    spec = importlib.util.spec_from_file_location("microbench", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["microbench"] = module  # dataclasses look the module up
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules["microbench"]
+
+
+def test_every_benchmark_runs(microbench):
+    scale = microbench.Scale(
+        clients=10, window=10, patterns=12, depth=3, allowed_dirs=2,
+        tokens=5, log_bytes=1000,
+    )
+    results = microbench.run_benchmarks(scale, repeat=1, min_time=0.001)
+
+    assert len(results) == 11
+    assert all(r["ns_per_op"] > 0 for r in results.values())
+    assert "validate_path (depth 3 symlinks, 2 dirs)" in results
+
+
+def test_compare_flags_slower_benchmarks(microbench):
+    baseline = {"a": {"ns_per_op": 100.0}, "b": {"ns_per_op": 100.0}}
+    results = {
+        "a": {"ns_per_op": 120.0},
+        "b": {"ns_per_op": 140.0},
+        "new": {"ns_per_op": 1.0},
+    }
+    assert microbench.compare(results, baseline, 0.25) == ["b"]
@@ -0,0 +1,127 @@
+"""Tests for project_status diff summaries and pages."""
+
+import asyncio
+import subprocess
+
+import pytest
+
+from mcp_bridge.tools.project_status import _lines, parse_numstat, read_diff_page
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "config", "user.email", "t@example.com")
+    git(tmp_path, "config", "user.name", "t")
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (tmp_path / name).write_text("one\n")
+    (tmp_path / "logo.bin").write_bytes(b"\0\1")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+@pytest.fixture
+def mcp(repo):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.config import Settings
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.project_status import register
+
+    server = FastMCP("test")
+    register(server, Settings(bearer_token="t", allowed_dirs_raw=str(repo)),
+             RateLimiter(max_per_minute=1000))
+    return server
+
+
+async def status(mcp, repo, **args):
+    result = await mcp.call_tool(
+        "project_status", {"project_path": str(repo), "include_diff": True, **args}
+    )
+    return "".join(c.text for c in result[0])
+
+
+async def test_summary_then_pages_of_whole_files(mcp, repo):
+    (repo / "a.txt").write_text("one\ntwo\n")
+    (repo / "b.txt").write_text("x" * 3000 + "\n")
+    (repo / "c.txt").write_text("")
+    (repo / "logo.bin").write_bytes(b"\0\2")
+
+    out = await status(mcp, repo, diff_max_chars=1000)
+    assert "Diff summary (unstaged, 4 files, +2 -2):" in out
+    assert "+1 -0  a.txt" in out
+    assert "binary  logo.bin" in out
+    assert "Diff of files 1-1 of 4 (next: diff_offset=1):" in out
+    assert "+two" in out and "b.txt" not in out.split("Diff of files")[1]
+
+    out = await status(mcp, repo, diff_max_chars=1000, diff_offset=1)
+    assert "Diff of files 2-2 of 4 (next: diff_offset=2):" in out
+    assert "[diff of this file cut at 1000 chars]" in out
+
+    out = await status(mcp, repo, diff_offset=2)
+    page = out.split("Diff of files 3-4 of 4:")[1]
+    assert "-one" in page and "Binary files" in page
+
+
+async def test_staged_ref_and_pathspec(mcp, repo):
+    (repo / "a.txt").write_text("staged\n")
+    git(repo, "add", "a.txt")
+    (repo / "b.txt").write_text("unstaged\n")
+
+    out = await status(mcp, repo, diff_mode="staged")
+    assert "Diff summary (staged, 1 files" in out and "+staged" in out
+    out = await status(mcp, repo, diff_mode="all", diff_paths="b.txt")
+    assert "Diff summary (all, 1 files" in out and "+unstaged" in out
+    out = await status(mcp, repo, diff_mode="all", diff_ref="HEAD")
+    assert "(all vs HEAD, 2 files" in out
+
+    git(repo, "commit", "-q", "-am", "more")
+    assert "Diff: (no unstaged changes)" in await status(mcp, repo)
+    out = await status(mcp, repo, diff_mode="all", diff_ref="HEAD~1")
+    assert "(all vs HEAD~1, 2 files" in out
+    assert "must be a ref" in await status(mcp, repo, diff_mode="all", diff_ref="--output=x")
+    assert "needs diff_mode" in await status(mcp, repo, diff_ref="HEAD")
+
+
+def test_parse_numstat_with_rename():
+    out = b"1\t2\ta.py\0-\t-\tlogo.png\x000\t0\t\0old.py\0new.py\0"
+    assert parse_numstat(out) == [
+        (1, 2, "a.py", ("a.py",)),
+        (None, None, "logo.png", ("logo.png",)),
+        (0, 0, "old.py => new.py", ("old.py", "new.py")),
+    ]
+
+
+async def test_read_diff_page_stops_at_the_budget():
+    stream = asyncio.StreamReader()
+    for i in range(3):
+        stream.feed_data(f"diff --git a/{i} b/{i}\n+{'y' * 40}\n".encode())
+    # never fed EOF: the reader must stop on its own once the page is full
+    text, shown, cut = await asyncio.wait_for(read_diff_page(stream, 0, 130), 1)
+    assert (shown, cut) == (2, False)
+    assert text.count("diff --git") == 2
+
+
+async def test_long_lines_are_cut_without_buffering_them():
+    stream = asyncio.StreamReader()
+    stream.feed_data(b"+" + b"z" * 1_000_000 + b"\nnext\n")
+    stream.feed_eof()
+    assert [len(line) async for line in _lines(stream, 100)] == [100, 5]
+
+
+async def test_later_pages_and_renames(mcp, repo):
+    git(repo, "mv", "a.txt", "renamed [1].txt")
+    (repo / "c.txt").write_text("two\n")
+    git(repo, "add", ".")
+    out = await status(mcp, repo, diff_mode="staged", diff_max_chars=150)
+    assert "a.txt => renamed [1].txt" in out
+    assert "+two" in out.split("Diff of files 1-1 of 2")[1]
+    # the page's paths are passed literally, brackets and both rename sides
+    out = await status(mcp, repo, diff_mode="staged", diff_max_chars=150, diff_offset=1)
+    page = out.split("Diff of files 2-2 of 2:")[1]
+    assert "rename from a.txt" in page and "+two" not in page
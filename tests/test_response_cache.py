@@ -0,0 +1,102 @@
+"""Tests for memoized claude_execute results."""
+
+import subprocess
+
+import pytest
+
+from mcp_bridge.config import Settings
+from mcp_bridge.lifecycle import ProcessTracker
+from mcp_bridge.rate_limiter import ConcurrencyLimiter, RateLimiter
+from mcp_bridge.response_cache import ResponseCache, repo_fingerprint
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "repo"
+    path.mkdir()
+    (path / "a.py").write_text("x = 1\n")
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run([*git, "init", "-q"], cwd=path, check=True)
+    subprocess.run([*git, "add", "."], cwd=path, check=True)
+    subprocess.run([*git, "commit", "-qm", "init"], cwd=path, check=True)
+    return path
+
+
+def test_lru_and_ttl():
+    cache = ResponseCache(max_entries=2, ttl=10)
+    cache.put("a", "A", now=0)
+    cache.put("b", "B", now=0)
+    assert cache.get("a", now=1) == "A"
+    cache.put("c", "C", now=1)  # evicts b, the least recently used
+    assert cache.get("b", now=1) is None
+    assert cache.get("a", now=9) == "A"
+    assert cache.get("a", now=10) is None
+
+
+async def test_fingerprint_tracks_tree_state(repo, tmp_path):
+    clean = await repo_fingerprint(repo)
+    assert clean is not None
+    assert await repo_fingerprint(repo) == clean
+
+    (repo / "a.py").write_text("x = 2\n")
+    edited = await repo_fingerprint(repo)
+    assert edited != clean
+
+    (repo / "new.txt").write_text("untracked")
+    assert await repo_fingerprint(repo) != edited
+
+    (tmp_path / "plain").mkdir()
+    assert await repo_fingerprint(tmp_path / "plain") is None
+
+
+async def test_claude_execute_replays_read_only_runs(repo, tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.tools.claude_execute import register
+
+    calls = tmp_path / "calls"
+    cli = tmp_path / "claude"
+    # Counts invocations; the prompt "edit" modifies the checkout
+    cli.write_text(
+        "#!/bin/sh\n"
+        f"echo run >> {calls}\n"
+        "for last; do :; done\n"
+        '[ "$last" = edit ] && echo "y = 1" >> a.py\n'
+        'echo "answer to $last"\n'
+    )
+    cli.chmod(0o755)
+    settings = Settings(
+        bearer_token="t",
+        allowed_dirs_raw=str(tmp_path),
+        claude_cli_path=str(cli),
+        blob_quota_mb=0,
+    )
+    mcp = FastMCP("test")
+    register(
+        mcp,
+        settings,
+        RateLimiter(max_per_minute=100),
+        ConcurrencyLimiter(max_concurrent=1),
+        ProcessTracker(),
+        responses=ResponseCache(),
+    )
+
+    def runs() -> int:
+        return len(calls.read_text().splitlines())
+
+    args = {"prompt": "summarize", "working_directory": str(repo)}
+    first = str(await mcp.call_tool("claude_execute", args))
+    second = str(await mcp.call_tool("claude_execute", args))
+    assert "answer to summarize" in first and first == second
+    assert runs() == 1
+
+    await mcp.call_tool("claude_execute", {**args, "cache": False})
+    assert runs() == 2
+
+    # A run that changes the tree is not stored, and invalidates the rest
+    edit = {"prompt": "edit", "working_directory": str(repo)}
+    await mcp.call_tool("claude_execute", edit)
+    await mcp.call_tool("claude_execute", edit)
+    assert runs() == 4
+    await mcp.call_tool("claude_execute", args)
+    assert runs() == 5
@@ -0,0 +1,82 @@
+"""Tests for tool result shaping."""
+
+import time
+
+from mcp_bridge.config import Settings
+from mcp_bridge.result_shaping import (
+    ShapePolicy,
+    collapse_progress,
+    dedupe_lines,
+    head_tail,
+    policy_for,
+    shape_output,
+    strip_ansi,
+)
+
+
+def test_strip_ansi():
+    assert strip_ansi("\x1b[31mred\x1b[0m \x1b]0;title\x07ok") == "red ok"
+
+
+def test_collapse_progress_keeps_last_redraw_and_tables():
+    text = (
+        "start\n"
+        " 10%|#     | 1/10\r 50%|#####  | 5/10\r100%|########| 10/10\n"
+        "downloaded\n"
+        "Epoch 1: 20%|██  | 2/10\n"
+        "Epoch 1: 90%|█████████ | 9/10\n"
+        "a.py  10  2  80%\n"
+        "b.py  10  2  80%\n"
+        "===== 5 passed =====\r\n"
+    )
+    out = collapse_progress(text)
+    assert "100%|########| 10/10" in out
+    assert "50%" not in out
+    assert "20%" not in out and "Epoch 1: 90%" in out
+    assert "a.py  10  2  80%\nb.py  10  2  80%" in out
+    assert "===== 5 passed =====" in out
+
+
+def test_collapse_progress_is_linear_on_long_lines():
+    line = "=" * 10_000
+    start = time.perf_counter()
+    assert collapse_progress(f"{line}\n{line} 50%\n") == f"{line}\n{line} 50%\n"
+    assert time.perf_counter() - start < 0.05
+
+
+def test_dedupe_lines():
+    assert dedupe_lines("a\na\nb\nb\nb\nb\nc") == (
+        "a\na\nb\n[... previous line repeated 3 more times]\nc"
+    )
+
+
+def test_head_tail_cuts_on_lines():
+    text = "\n".join(f"line {i}" for i in range(1000))
+    out = head_tail(text, 200, head_fraction=0.5)
+    assert out.startswith("line 0\n")
+    assert out.endswith("line 999")
+    assert "chars omitted" in out
+    assert len(out) < 260
+
+
+def test_shape_output_sizes_and_footer():
+    shaped = shape_output("x\n" * 50_000, ShapePolicy(max_chars=1000))
+    assert shaped.original_size == 100_000
+    assert shaped.shipped_size == len(shaped.text)
+    assert "100000 ->" in shaped.footer()
+
+    small = shape_output("hello", ShapePolicy())
+    assert not small.changed and small.footer() == ""
+
+
+def test_policy_for_overrides():
+    settings = Settings(
+        bearer_token="t",
+        result_max_chars=500,
+        result_limits_raw="file_read=9000",
+    )
+    assert policy_for(settings, "run_command").max_chars == 500
+    verbatim = policy_for(settings, "file_read", verbatim=True)
+    assert verbatim.max_chars == 9000
+    assert not verbatim.strip_ansi
+    assert shape_output("\x1b[1mA\x1b[0m", verbatim).text == "\x1b[1mA\x1b[0m"
@@ -0,0 +1,174 @@
+"""Tests for limiter and OAuth state shared between workers."""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+from pydantic import AnyUrl
+
+from mcp.server.auth.provider import AuthorizationParams
+from mcp.shared.auth import OAuthClientInformationFull
+
+from mcp_bridge.oauth_provider import InMemoryOAuthProvider
+from mcp_bridge.shared_state import (
+    SQLiteConcurrencyLimiter,
+    SQLiteRateLimiter,
+    SQLiteUsageLedger,
+)
+from mcp_bridge.token_store import SQLiteTokenStore
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_global_across_instances(tmp_path):
+    db = tmp_path / "state.db"
+    worker_a = SQLiteRateLimiter(db, max_per_minute=2)
+    worker_b = SQLiteRateLimiter(db, max_per_minute=2)
+    await worker_a.check("run_command")
+    await worker_b.check("run_command")
+    with pytest.raises(RuntimeError, match="Rate limit exceeded"):
+        await worker_a.check("run_command")
+    await worker_b.check("file_read")  # other tools are unaffected
+    worker_a.close()
+    worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_purges_idle_keys(tmp_path):
+    limiter = SQLiteRateLimiter(tmp_path / "state.db", max_per_minute=2)
+    limiter._conn.execute(
+        "INSERT INTO rate_events (key, ts) VALUES (?, ?)", ("idle", time.time() - 120)
+    )
+    await limiter.check("run_command")
+    keys = [k for (k,) in limiter._conn.execute("SELECT key FROM rate_events")]
+    assert "idle" not in keys and len(keys) == 1
+    limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_slots_are_shared(tmp_path):
+    db = tmp_path / "state.db"
+    worker_a = SQLiteConcurrencyLimiter(db, max_concurrent=1)
+    worker_b = SQLiteConcurrencyLimiter(db, max_concurrent=1)
+    await worker_a.acquire()
+    with pytest.raises(RuntimeError, match="Max concurrent"):
+        await worker_b.acquire()
+    worker_a.release()
+    # The release lands in the background; a sibling sees it on a recheck
+    await worker_b.acquire_within(2)
+    worker_b.release()
+    worker_a.close()
+    worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_slots_of_dead_workers_are_reclaimed(tmp_path):
+    db = tmp_path / "state.db"
+    limiter = SQLiteConcurrencyLimiter(db, max_concurrent=1)
+    # Simulate a slot left behind by a worker that crashed
+    limiter._conn.execute(
+        "INSERT INTO concurrency_slots (name, pid, acquired_at) VALUES (?, ?, ?)",
+        ("claude_execute", 2**22 + 1, time.time()),
+    )
+    await limiter.acquire()
+    limiter.release()
+    limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_provider_sees_other_workers(tmp_path):
+    db = tmp_path / "state.db"
+    # default cache TTL: a revocation on one worker applies on the other at once
+    worker_a = InMemoryOAuthProvider(store=SQLiteTokenStore(db), shared=True)
+    worker_b = InMemoryOAuthProvider(store=SQLiteTokenStore(db), shared=True)
+
+    client = OAuthClientInformationFull(
+        client_id="placeholder",
+        redirect_uris=[AnyUrl("http://localhost/callback")],
+        grant_types=["authorization_code", "refresh_token"],
+        response_types=["code"],
+        token_endpoint_auth_method="client_secret_post",
+    )
+    await worker_a.register_client(client)
+    assert await worker_b.get_client(client.client_id) is not None
+
+    params = AuthorizationParams(
+        client_id=client.client_id,
+        redirect_uri=AnyUrl("http://localhost/callback"),
+        redirect_uri_provided_explicitly=True,
+        state="s",
+        scopes=[],
+        code_challenge="c",
+        code_challenge_method="S256",
+    )
+    redirect_url = await worker_a.authorize(client, params)
+    code = redirect_url.split("code=")[1].split("&")[0]
+    auth_code = await worker_b.load_authorization_code(client, code)
+    token = await worker_b.exchange_authorization_code(client, auth_code)
+
+    at = await worker_a.load_access_token(token.access_token)
+    assert at is not None
+    await worker_b.revoke_token(at)
+    assert await worker_a.load_access_token(token.access_token) is None
+    worker_a.close()
+    worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_registration_does_not_regrow_the_expiry_heap(tmp_path):
+    provider = InMemoryOAuthProvider(
+        store=SQLiteTokenStore(tmp_path / "state.db"), shared=True, max_clients=3
+    )
+    for _ in range(6):
+        client = OAuthClientInformationFull(
+            client_id="placeholder",
+            redirect_uris=[AnyUrl("http://localhost/callback")],
+        )
+        await provider.register_client(client)
+        await provider._issue_tokens(client, [])
+        for table in (provider._access_tokens, provider._refresh_tokens):
+            for token in list(table.values()):
+                await provider.revoke_token(token)
+    # at the cap every registration rebuilds the heap from the store
+    assert len(provider._expiry) <= 2 * 3 + 2
+    provider.close()
+
+
+@pytest.mark.asyncio
+async def test_a_locked_database_does_not_block_the_event_loop(tmp_path):
+    db = tmp_path / "state.db"
+    limiter = SQLiteConcurrencyLimiter(db, max_concurrent=1)
+    ledger = SQLiteUsageLedger(db)
+    provider = InMemoryOAuthProvider(store=SQLiteTokenStore(db), shared=True)
+    await limiter.acquire()
+
+    # A sibling worker holds the write lock for a while
+    sibling = sqlite3.connect(str(db), isolation_level=None)
+    sibling.execute("BEGIN IMMEDIATE")
+    client = OAuthClientInformationFull(
+        client_id="placeholder", redirect_uris=[AnyUrl("http://localhost/callback")]
+    )
+    limiter.release()
+    pending = asyncio.gather(
+        ledger.record("a", "run_command", 1.0, 0.5),
+        provider.register_client(client),
+    )
+
+    ticks = 0
+    start = time.monotonic()
+    while time.monotonic() - start < 0.3:
+        await asyncio.sleep(0.01)
+        ticks += 1
+    assert ticks >= 10  # each write would otherwise stall the loop until COMMIT
+    assert not pending.done()
+
+    sibling.execute("COMMIT")
+    await pending
+    await limiter.acquire()  # the queued release has landed
+    assert (await ledger.usage())[("a", "run_command")].calls == 1
+    assert await provider.get_client(client.client_id) is not None
+    limiter.release()
+    sibling.close()
+    limiter.close()
+    ledger.close()
+    provider.close()
@@ -0,0 +1,159 @@
+"""Tests for persistent run_command shell sessions."""
+
+import asyncio
+
+import pytest
+
+from mcp_bridge.shell_sessions import CommandTimeout, SessionBusy, ShellSessions
+
+
+@pytest.fixture
+async def shells():
+    registry = ShellSessions(max_sessions=2, idle_timeout=60)
+    yield registry
+    procs = [s.proc for s in registry._sessions.values()]
+    registry.close_all()
+    for proc in procs:
+        await proc.wait()
+
+
+async def test_state_carries_over_between_commands(shells, tmp_path):
+    (tmp_path / "sub").mkdir()
+    shell, created = await shells.get("c", "dev", tmp_path)
+    assert created
+
+    await shell.run("cd sub && export GREETING='hi there'", timeout=5)
+    result = await shell.run("printf '%s' \"$GREETING\"; pwd >&2; false", timeout=5)
+
+    assert result.stdout == b"hi there"
+    assert result.stderr == f"{tmp_path / 'sub'}\n".encode()
+    assert result.exit_code == 1
+    assert result.cwd == tmp_path / "sub"
+    again, created = await shells.get("c", "dev", tmp_path)
+    assert again is shell and not created
+
+
+async def test_commands_cannot_break_the_framing(shells, tmp_path):
+    shell, _ = await shells.get("c", "dev", tmp_path)
+    assert (await shell.run("echo 'unterminated", timeout=5)).exit_code != 0
+    assert (await shell.run("cat", timeout=5)).stdout == b""  # stdin is /dev/null
+    result = await shell.run("for i in 1 2; do\n  echo $i\ndone", timeout=5)
+    assert result.stdout == b"1\n2\n"
+
+
+async def test_timeout_kills_the_session(shells, tmp_path):
+    shell, _ = await shells.get("c", "dev", tmp_path)
+    with pytest.raises(asyncio.TimeoutError):
+        await shell.run("sleep 10", timeout=0.2)
+    assert not shell.alive
+    fresh, created = await shells.get("c", "dev", tmp_path)
+    assert created and fresh is not shell
+
+
+async def test_timeout_reports_the_cpu_used_before_the_kill(shells, tmp_path):
+    shell, _ = await shells.get("c", "dev", tmp_path)
+    with pytest.raises(CommandTimeout) as excinfo:
+        await shell.run("while :; do :; done", timeout=0.5)  # spins in bash itself
+    assert excinfo.value.cpu_seconds > 0
+
+
+async def test_waiting_for_a_busy_session_is_bounded(shells, tmp_path):
+    shell, _ = await shells.get("c", "dev", tmp_path)
+    async with shell.lock:  # another command is running
+        with pytest.raises(SessionBusy):
+            await shell.run("true", timeout=0.1)
+    assert shell.alive
+    assert (await shell.run("echo ok", timeout=5)).stdout == b"ok\n"
+
+
+async def test_exit_ends_the_session(shells, tmp_path):
+    shell, _ = await shells.get("c", "dev", tmp_path)
+    result = await shell.run("echo bye; exit 3", timeout=5)
+    assert result.ended and result.exit_code == 3
+    assert result.stdout == b"bye\n"
+
+
+async def test_session_limit_and_idle_eviction(shells, tmp_path):
+    a, _ = await shells.get("c", "a", tmp_path)
+    b, _ = await shells.get("c", "b", tmp_path)
+    a.last_used -= 10
+    c, _ = await shells.get("c", "c", tmp_path)  # evicts a, the LRU
+    assert [s.name for s in shells.list("c")] == ["b", "c"]
+
+    async with b.lock, c.lock:
+        with pytest.raises(RuntimeError, match="limit reached"):
+            await shells.get("c", "d", tmp_path)
+
+    b.last_used -= 120
+    assert shells.evict_idle() == 1
+    assert [s.name for s in shells.list("c")] == ["c"]
+    assert shells.list("other-client") == []
+
+
+@pytest.fixture
+def mcp(tmp_path, shells):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.config import Settings
+    from mcp_bridge.lifecycle import ProcessTracker
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.run_command import register
+
+    server = FastMCP("test")
+    settings = Settings(bearer_token="t", allowed_dirs_raw=str(tmp_path), blob_quota_mb=0)
+    register(server, settings, RateLimiter(max_per_minute=100), ProcessTracker(), shells=shells)
+    return server
+
+
+async def run(mcp, **arguments):
+    content = (await mcp.call_tool("run_command", arguments))[0]
+    return "".join(c.text for c in content)
+
+
+async def test_run_command_sessions(mcp, tmp_path):
+    (tmp_path / "venv").mkdir()
+    args = {"working_directory": str(tmp_path), "session": "build"}
+
+    out = await run(mcp, command="cd venv; VIRTUAL_ENV=$PWD", **args)
+    assert "[started session 'build']" in out
+    out = await run(mcp, command="echo $VIRTUAL_ENV", **args)
+    assert out.startswith(f"{tmp_path / 'venv'}\n")
+    assert f"Session: build in {tmp_path / 'venv'}" in out
+
+    out = await run(mcp, command="cd /", **args)
+    assert "outside the allowed directories" in out
+    assert (await run(mcp, command="pwd", **args)).startswith(f"{tmp_path / 'venv'}\n")
+
+    listing = "".join(
+        c.text for c in (await mcp.call_tool("shell_sessions", {"close": "build"}))[0]
+    )
+    assert listing.startswith("Closed session 'build'\n0 session(s)")
+
+
+async def test_output_overrun_is_an_error_result_and_charged(tmp_path, shells, monkeypatch):
+    from mcp.server.fastmcp import FastMCP
+
+    import mcp_bridge.shell_sessions
+    from mcp_bridge.config import Settings
+    from mcp_bridge.lifecycle import ProcessTracker
+    from mcp_bridge.quotas import UsageLedger
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.run_command import register
+
+    monkeypatch.setattr(mcp_bridge.shell_sessions, "_STREAM_LIMIT", 1024 * 1024)
+    server = FastMCP("test")
+    settings = Settings(bearer_token="t", allowed_dirs_raw=str(tmp_path), blob_quota_mb=0)
+    ledger = UsageLedger()
+    register(
+        server, settings, RateLimiter(max_per_minute=100), ProcessTracker(),
+        usage=ledger, shells=shells,
+    )
+
+    out = await asyncio.wait_for(
+        run(server, command="head -c 3000000 /dev/zero", working_directory=str(tmp_path),
+            session="big"),
+        timeout=10,
+    )
+    assert out.startswith("ERROR: Output over 1MiB; session 'big' was closed")
+    assert (await ledger.usage())[("anonymous", "run_command")].calls == 1
+    assert shells.list("anonymous") == []
@@ -0,0 +1,36 @@
+"""Cold-start budget and the startup profiling script."""
+
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "profile_startup.py"
+
+
+@pytest.fixture(scope="module")
+def profile_startup():
+    spec = importlib.util.spec_from_file_location("profile_startup", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def startup_env(tmp_path):
+    env = os.environ.copy()
+    env.update(
+        BEARER_TOKEN="test-token-123",
+        ALLOWED_DIRS_RAW="/tmp",
+        LOG_DIR=str(tmp_path),
+        LOG_LEVEL="WARNING",
+    )
+    return env
+
+
+def test_create_app_within_startup_budget(profile_startup, startup_env):
+    (phases,) = profile_startup.measure_phases(1, startup_env)
+    assert set(phases) == {"import_mcp_sdk", "import_server", "create_app", "total"}
+    assert phases["total"] < profile_startup.STARTUP_BUDGET_SECONDS
+
@@ -0,0 +1,113 @@
+"""Tests for OAuth state persistence, sweeping and client limits."""
+
+import time
+
+import pytest
+from pydantic import AnyUrl
+
+from mcp.server.auth.provider import AuthorizationParams, RegistrationError
+from mcp.shared.auth import OAuthClientInformationFull
+
+from mcp_bridge.oauth_provider import InMemoryOAuthProvider
+from mcp_bridge.token_store import ExpiryHeap, SQLiteTokenStore
+
+
+async def _register_client(provider: InMemoryOAuthProvider) -> OAuthClientInformationFull:
+    client_info = OAuthClientInformationFull(
+        client_id="placeholder",
+        redirect_uris=[AnyUrl("http://localhost/callback")],
+        grant_types=["authorization_code", "refresh_token"],
+        response_types=["code"],
+        token_endpoint_auth_method="client_secret_post",
+    )
+    await provider.register_client(client_info)
+    return client_info
+
+
+async def _issue_token(provider: InMemoryOAuthProvider, client: OAuthClientInformationFull):
+    params = AuthorizationParams(
+        client_id=client.client_id,
+        redirect_uri=AnyUrl("http://localhost/callback"),
+        redirect_uri_provided_explicitly=True,
+        state="s",
+        scopes=["mcp:tools"],
+        code_challenge="c",
+        code_challenge_method="S256",
+    )
+    redirect_url = await provider.authorize(client, params)
+    code = redirect_url.split("code=")[1].split("&")[0]
+    auth_code = await provider.load_authorization_code(client, code)
+    return await provider.exchange_authorization_code(client, auth_code)
+
+
+def test_expiry_heap_pops_in_order():
+    heap = ExpiryHeap()
+    heap.push(30.0, "access", "c")
+    heap.push(10.0, "access", "a")
+    heap.push(20.0, "code", "b")
+    assert [key for _, _, key in heap.pop_expired(25.0)] == ["a", "b"]
+    assert len(heap) == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_restores_state(tmp_path):
+    db = tmp_path / "oauth.db"
+    provider = InMemoryOAuthProvider(store=SQLiteTokenStore(db))
+    client = await _register_client(provider)
+    token = await _issue_token(provider, client)
+    provider.close()
+
+    restored = InMemoryOAuthProvider(store=SQLiteTokenStore(db))
+    assert await restored.get_client(client.client_id) is not None
+    at = await restored.load_access_token(token.access_token)
+    assert at is not None and at.client_id == client.client_id
+    assert await restored.load_refresh_token(client, token.refresh_token) is not None
+    restored.close()
+
+
+@pytest.mark.asyncio
+async def test_sweep_removes_expired_tokens(tmp_path):
+    db = tmp_path / "oauth.db"
+    provider = InMemoryOAuthProvider(store=SQLiteTokenStore(db))
+    client = await _register_client(provider)
+    token = await _issue_token(provider, client)
+
+    removed = provider.sweep(now=time.time() + 3600 * 24 * 365)
+    assert removed == 2  # access + refresh token
+    assert not provider._access_tokens
+    assert not provider._refresh_tokens
+    provider.close()
+
+    restored = InMemoryOAuthProvider(store=SQLiteTokenStore(db))
+    assert await restored.load_access_token(token.access_token) is None
+    restored.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_expires():
+    provider = InMemoryOAuthProvider(refresh_token_ttl=-1)
+    client = await _register_client(provider)
+    token = await _issue_token(provider, client)
+    assert await provider.load_refresh_token(client, token.refresh_token) is None
+
+
+@pytest.mark.asyncio
+async def test_client_cap_evicts_idle_clients():
+    provider = InMemoryOAuthProvider(max_clients=2)
+    active = await _register_client(provider)
+    await _issue_token(provider, active)
+    idle = await _register_client(provider)
+
+    newest = await _register_client(provider)
+    assert await provider.get_client(idle.client_id) is None
+    assert await provider.get_client(active.client_id) is not None
+    assert await provider.get_client(newest.client_id) is not None
+
+
+@pytest.mark.asyncio
+async def test_client_cap_rejects_when_all_active():
+    provider = InMemoryOAuthProvider(max_clients=1)
+    client = await _register_client(provider)
+    await _issue_token(provider, client)
+    with pytest.raises(RegistrationError):
+        await _register_client(provider)
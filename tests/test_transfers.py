@@ -0,0 +1,190 @@
+"""Tests for chunked binary file_download / file_upload."""
+
+import base64
+import hashlib
+import os
+import re
+
+import pytest
+
+from mcp_bridge.transfers import HashCache, _hash_fd, partial_path, read_chunk, write_chunk
+
+BLOB = bytes(range(256)) * 1000 + b"\x00\xff tail"
+
+
+@pytest.fixture
+def mcp(tmp_path):
+    from mcp.server.fastmcp import FastMCP
+
+    from mcp_bridge.config import Settings
+    from mcp_bridge.rate_limiter import RateLimiter
+    from mcp_bridge.tools.file_ops import register
+
+    server = FastMCP("test")
+    settings = Settings(
+        bearer_token="t", allowed_dirs_raw=str(tmp_path), transfer_max_chunk=100_000
+    )
+    register(server, settings, RateLimiter(max_per_minute=1000))
+    return server
+
+
+async def call(mcp, tool, **args):
+    result = await mcp.call_tool(tool, args)
+    return "".join(c.text for c in result[0])
+
+
+async def test_download_in_chunks_reassembles_binary_file(mcp, tmp_path):
+    target = tmp_path / "model.bin"
+    target.write_bytes(BLOB)
+    received = b""
+    offset = 0
+    while True:
+        out = await call(mcp, "file_download", path=str(target), offset=offset, length=10**9)
+        data, footer = out.rsplit("\n", 1)
+        chunk = base64.b64decode(data)
+        chunk_sha = re.search(r"chunk sha256 (\w+)", footer).group(1)
+        file_sha = re.search(r"file sha256 (\w+)", footer).group(1)
+        assert hashlib.sha256(chunk).hexdigest() == chunk_sha
+        received += chunk
+        if "end of file" in footer:
+            break
+        offset = int(re.search(r"next offset (\d+)", footer).group(1))
+    assert offset == 200_000  # capped at transfer_max_chunk
+    assert received == BLOB
+    assert file_sha == hashlib.sha256(BLOB).hexdigest()
+
+
+async def test_download_past_the_end_skips_hashing(mcp, tmp_path, monkeypatch):
+    target = tmp_path / "model.bin"
+    target.write_bytes(BLOB)
+    hashed = []
+    monkeypatch.setattr(HashCache, "sha256", lambda self, path: hashed.append(path))
+
+    out = await call(mcp, "file_download", path=str(target), offset=len(BLOB) + 1)
+    assert out == f"ERROR: offset {len(BLOB) + 1} is past the end of the file ({len(BLOB)} bytes)"
+    assert hashed == []
+
+
+async def test_upload_resumes_and_checks_the_whole_file(mcp, tmp_path):
+    target = tmp_path / "out" / "model.bin"
+    first, second = BLOB[:70_000], BLOB[70_000:140_000]
+
+    out = await call(mcp, "file_upload", path=str(target), data=base64.b64encode(first).decode())
+    assert out.endswith("next offset 70000")
+    # a lost response: the client asks where to resume
+    assert (await call(mcp, "file_upload", path=str(target))).endswith("next offset 70000")
+
+    out = await call(
+        mcp, "file_upload", path=str(target), data=base64.b64encode(second).decode(),
+        offset=70_000, chunk_sha256="0" * 64,
+    )
+    assert out.startswith("ERROR: chunk sha256 mismatch")
+    out = await call(
+        mcp, "file_upload", path=str(target),
+        data=base64.b64encode(BLOB[140_000:150_000]).decode(), offset=140_000,
+    )
+    assert out.startswith("ERROR: offset 140000 is past the 70000 bytes received")
+
+    rest = BLOB[70_000:]
+    for start in range(0, len(rest), 100_000):
+        piece = rest[start : start + 100_000]
+        out = await call(
+            mcp, "file_upload", path=str(target), data=base64.b64encode(piece).decode(),
+            offset=70_000 + start, chunk_sha256=hashlib.sha256(piece).hexdigest(),
+        )
+        assert out.startswith("OK")
+
+    out = await call(mcp, "file_upload", path=str(target), complete=True, sha256="0" * 64)
+    assert out.startswith("ERROR: sha256 mismatch")
+    out = await call(
+        mcp, "file_upload", path=str(target), complete=True,
+        sha256=hashlib.sha256(BLOB).hexdigest(),
+    )
+    assert out.startswith(f"OK: Written {len(BLOB)} bytes")
+    assert target.read_bytes() == BLOB
+    assert not partial_path(target).exists()
+
+
+async def test_upload_rejects_bad_input(mcp, tmp_path):
+    assert (await call(mcp, "file_upload", path=str(tmp_path / "x"), data="@@")).startswith(
+        "ERROR: data is not valid base64"
+    )
+    out = await call(mcp, "file_upload", path=str(tmp_path / "x"), complete=True)
+    assert out.startswith("ERROR: No upload in progress")
+
+
+def test_rewriting_a_chunk_drops_what_followed(tmp_path):
+    target = tmp_path / "f"
+    assert write_chunk(target, 0, b"aaaa") == 4
+    assert write_chunk(target, 4, b"bbbb") == 8
+    assert write_chunk(target, 2, b"cc") == 4
+    assert partial_path(target).read_bytes() == b"aacc"
+
+
+def test_reads_survive_a_file_shrinking_under_them(tmp_path):
+    target = tmp_path / "f"
+    big = BLOB * 12  # over one hash buffer
+    target.write_bytes(big)
+    with open(target, "rb") as f:
+        assert _hash_fd(f.fileno(), len(big)) == hashlib.sha256(big).hexdigest()
+        os.truncate(target, 1000)  # what used to be a SIGBUS with mmap
+        assert _hash_fd(f.fileno(), len(big)) == hashlib.sha256(big[:1000]).hexdigest()
+    data, _, size = read_chunk(target, 900, 500)
+    assert (base64.b64decode(data), size) == (big[900:1000], 1000)
+
+
+def test_hash_cache_follows_file_changes(tmp_path):
+    target = tmp_path / "f"
+    target.write_bytes(b"one")
+    os.utime(target, ns=(1, 1))
+    hashes = HashCache(max_entries=1)
+    assert hashes.sha256(target) == hashlib.sha256(b"one").hexdigest()
+    assert len(hashes) == 1
+    target.write_bytes(b"two!")
+    os.utime(target, ns=(2, 2))
+    assert hashes.sha256(target) == hashlib.sha256(b"two!").hexdigest()
+    other = tmp_path / "empty"
+    other.write_bytes(b"")
+    os.utime(other, ns=(1, 1))
+    assert hashes.sha256(other) == hashlib.sha256(b"").hexdigest()
+    assert len(hashes) == 1
+
+
+def test_hash_cache_skips_racily_fresh_files(tmp_path):
+    target = tmp_path / "f"
+    target.write_bytes(b"one")
+    hashes = HashCache()
+    st = target.stat()
+    assert hashes.sha256(target) == hashlib.sha256(b"one").hexdigest()
+    assert len(hashes) == 0
+    # a same-size rewrite within the same mtime tick
+    target.write_bytes(b"two")
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert hashes.sha256(target) == hashlib.sha256(b"two").hexdigest()
+    hashes.put(target, target.stat(), "stale", hashed_at=st.st_mtime + 1)
+    assert len(hashes) == 0
+
+
+async def test_file_read_etag_and_if_none_match(mcp, tmp_path):
+    target = tmp_path / "status.txt"
+    target.write_text("building\n")
+    assert await call(mcp, "file_read", path=str(target)) == "building\n"
+    out = await call(mcp, "file_read", path=str(target), etag=True)
+    content, footer = out.rsplit("\n", 1)
+    assert content == "building\n"
+    etag = re.fullmatch(r"\[etag (\w+)\]", footer).group(1)
+    assert etag == hashlib.sha256(b"building\n").hexdigest()
+
+    out = await call(mcp, "file_read", path=str(target), if_none_match=etag)
+    assert out == f"NOT MODIFIED: {target} [etag {etag}]"
+
+    target.write_text("done\n")
+    out = await call(mcp, "file_read", path=str(target), if_none_match=etag)
+    new_etag = hashlib.sha256(b"done\n").hexdigest()
+    assert out == f"done\n\n[etag {new_etag}]"
+
+    # Ranges carry the whole file's etag
+    target.write_text("one\ntwo\n")
+    out = await call(mcp, "file_read", path=str(target), line_start=2, etag=True)
+    whole = hashlib.sha256(b"one\ntwo\n").hexdigest()
+    assert out == f"two\n\n[etag {whole}]"